@@ -0,0 +1,58 @@
+"""
+Build benchmark databases of a configurable size with scripts/generate_db.py.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+
+from scripts import generate_db
+from travel_planner.persistence.schema import get_schema_ddl
+
+# Generated items end by this minute, leaving the tail of every day free
+# so benchmarks can insert non-overlapping items.
+LAST_GENERATED_MIN = 1380
+
+
+def dataset_path(directory: str, trips: int, days: int, items: int, seed: int) -> str:
+    # Keyed on the schema and the generator too, so neither change reuses a stale database.
+    digest = hashlib.sha1("".join(get_schema_ddl()).encode("utf-8"))
+    with open(generate_db.__file__, "rb") as fh:
+        digest.update(fh.read())
+    return os.path.join(directory, f"bench_t{trips}_d{days}_i{items}_s{seed}_{digest.hexdigest()[:10]}.db")
+
+
+def build_db(db_path: str, *, trips: int, days: int, items: int, seed: int = 1) -> None:
+    """
+    Generate trips x days x items rows with the synthetic database generator.
+
+    Every item is scheduled when it fits before LAST_GENERATED_MIN, and the
+    change log records each row so feed benchmarks have history to page through.
+    """
+    generate_db.generate(
+        db_path,
+        trips=trips,
+        days=days,
+        items=items,
+        seed=seed,
+        shards=1,
+        scheduled_ratio=1.0,
+        last_min=LAST_GENERATED_MIN,
+        change_log=True,
+    )
+
+
+def ensure_db(directory: str, *, trips: int, days: int, items: int, seed: int = 1) -> str:
+    """
+    Reuse a previously generated database of the same shape, or build it.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = dataset_path(directory, trips, days, items, seed)
+    if not os.path.exists(path):
+        tmp = path + ".tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        build_db(tmp, trips=trips, days=days, items=items, seed=seed)
+        os.replace(tmp, path)
+    return path
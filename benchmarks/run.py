@@ -0,0 +1,240 @@
+"""
+Benchmark runner.
+
+    python -m benchmarks.run --trips 50 --days 10 --items 20
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.25
+
+Times the core repository, service, export and CLI operations against a
+generated database, writes the results as JSON and, when a baseline exists,
+exits with status 1 if any case got slower than baseline * (1 + threshold).
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.dataset import LAST_GENERATED_MIN, ensure_db
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.item_repository import list_items_for_day
+from travel_planner.services import export_service, item_service
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+DEFAULT_RESULTS = os.path.join(REPO_ROOT, "benchmarks", "results", "latest.json")
+
+
+def _measure(fn: Callable[[int], None], *, repeat: int, number: int) -> dict:
+    """
+    Call fn(i) `number` times per round for `repeat` rounds; report per-call seconds.
+    """
+    rounds = []
+    i = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn(i)
+            i += 1
+        rounds.append((time.perf_counter() - t0) / number)
+
+    return {
+        "median_s": statistics.median(rounds),
+        "min_s": min(rounds),
+        "max_s": max(rounds),
+        "calls": repeat * number,
+    }
+
+
+def run_cases(db_path: str, *, trips: int, days: int, repeat: int, number: int) -> dict[str, dict]:
+    conn = connect(db_path)
+    total_days = trips * days
+    results: dict[str, dict] = {}
+
+    def day_for(i: int) -> int:
+        return (i % total_days) + 1
+
+    def trip_for(i: int) -> int:
+        return (i % trips) + 1
+
+    def last_item(day_id: int) -> dict:
+        return max(
+            (it for it in list_items_for_day(conn, day_id) if it["start_min"] is not None),
+            key=lambda it: it["start_min"],
+        )
+
+    # Conflicting with the latest item forces a scan of the whole day before rejecting.
+    conflicts = {d: last_item(d) for d in range(1, min(total_days, repeat * number) + 1)}
+
+    def create_rejected(i: int) -> None:
+        day_id = day_for(i % len(conflicts))
+        other = conflicts[day_id]
+        try:
+            item_service.create_item_scheduled(
+                conn, day_id, "Bench", "activity", other["start_min"], other["end_min"]
+            )
+        except ValidationError:
+            return
+        raise AssertionError("expected an overlap rejection")
+
+    # Each accepted insert goes to a different day's free tail slot.
+    accepted_budget = min(total_days, repeat * number)
+
+    def create_accepted(i: int) -> None:
+        item_service.create_item_scheduled(
+            conn, day_for(i % accepted_budget), "Bench", "activity", LAST_GENERATED_MIN + 1, 1440
+        )
+
+    cases: list[tuple[str, Callable[[int], None]]] = [
+        ("create_item_scheduled_rejected", create_rejected),
+        ("list_items_for_day", lambda i: list_items_for_day(conn, day_for(i))),
+        ("check_overlaps_for_day", lambda i: item_service.check_overlaps_for_day(conn, day_for(i))),
+        (
+            "check_tight_connections_for_day",
+            lambda i: item_service.check_tight_connections_for_day(conn, day_for(i)),
+        ),
+        ("export_trip", lambda i: json.dumps(export_service.export_trip(conn, trip_for(i)))),
+        (
+            "export_changes_last_1000",
+            lambda i: export_service.write_changes_ndjson(
+                conn,
+                max(0, conn.execute("SELECT MAX(seq) FROM change_log;").fetchone()[0] - 1000),
+                io.StringIO(),
+            ),
+        ),
+    ]
+
+    for name, fn in cases:
+        results[name] = _measure(fn, repeat=repeat, number=number)
+
+    # Runs last: it adds rows the other cases would otherwise see.
+    if accepted_budget >= repeat * number:
+        results["create_item_scheduled_accepted"] = _measure(create_accepted, repeat=repeat, number=number)
+
+    conn.close()
+    return results
+
+
+def run_cli_cold_start(db_path: str, *, repeat: int) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    cmd = [sys.executable, "-m", "travel_planner.cli.main", "--db", db_path, "trip", "list"]
+
+    def once(_: int) -> None:
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+
+    return _measure(once, repeat=repeat, number=1)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[tuple[str, float, float, float]]:
+    """
+    Return (case, baseline_s, current_s, ratio) for every case slower than allowed.
+    """
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        current = results["results"].get(name)
+        if current is None or base["median_s"] <= 0:
+            continue
+        ratio = current["median_s"] / base["median_s"]
+        if ratio > 1.0 + threshold:
+            regressions.append((name, base["median_s"], current["median_s"], ratio))
+    return regressions
+
+
+def _print_results(results: dict, baseline: dict | None) -> None:
+    base_results = (baseline or {}).get("results", {})
+    print(f"{'case':<36} {'median':>12} {'min':>12} {'vs baseline':>12}")
+    for name, r in results["results"].items():
+        base = base_results.get(name)
+        ratio = f"{r['median_s'] / base['median_s']:.2f}x" if base and base["median_s"] > 0 else "-"
+        print(f"{name:<36} {r['median_s'] * 1e3:>10.3f}ms {r['min_s'] * 1e3:>10.3f}ms {ratio:>12}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.run")
+    parser.add_argument("--trips", type=int, default=50)
+    parser.add_argument("--days", type=int, default=10, help="Days per trip")
+    parser.add_argument("--items", type=int, default=20, help="Items per day")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per case")
+    parser.add_argument("--number", type=int, default=20, help="Calls per round")
+    parser.add_argument("--cli-repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "travel_planner_bench"))
+    parser.add_argument("--out", default=DEFAULT_RESULTS, help="Where to write the JSON results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    source = ensure_db(args.data_dir, trips=args.trips, days=args.days, items=args.items, seed=args.seed)
+
+    # Cases write to the database, so every run works on a fresh copy.
+    with tempfile.TemporaryDirectory() as tmp:
+        work_db = os.path.join(tmp, "bench.db")
+        shutil.copyfile(source, work_db)
+
+        timings = run_cases(work_db, trips=args.trips, days=args.days, repeat=args.repeat, number=args.number)
+        timings["cli_cold_start"] = run_cli_cold_start(work_db, repeat=args.cli_repeat)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "trips": args.trips,
+            "days_per_trip": args.days,
+            "items_per_day": args.items,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "number": args.number,
+        },
+        "results": timings,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    _print_results(results, baseline)
+    print(f"Results written to {args.out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        return 0
+
+    if baseline.get("meta", {}).get("items_per_day") != args.items or baseline.get("meta", {}).get("trips") != args.trips:
+        print("Warning: baseline was recorded with a different dataset shape.", file=sys.stderr)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, base_s, cur_s, ratio in regressions:
+        print(
+            f"REGRESSION {name}: {base_s * 1e3:.3f}ms -> {cur_s * 1e3:.3f}ms ({ratio:.2f}x)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,3 @@
+"""
+Command-line tools for generating and load-testing travel_planner databases.
+"""
@@ -0,0 +1,382 @@
+"""
+Deterministic large-scale synthetic database generator.
+
+    python scripts/generate_db.py --out big.db --trips 10000 --days 10 --items 100 --seed 7 --workers 4
+
+Every trip is generated from its own RNG stream derived from (seed, trip index)
+and gets ids computed from its position, so the output does not depend on how
+the work is sharded. The same seed, shape and --shards always produce a
+byte-identical file, whatever --workers is.
+
+Rows are written with executemany in large transactions into --shards shard
+files whose tables have no indexes or triggers. Each shard covers a contiguous
+range of trips; with --workers > 1 the shards are filled by separate processes. The
+shards are then merged table by table with ATTACH + INSERT ... SELECT, and
+indexes and triggers are built once at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Iterator
+
+from travel_planner.domain.timezones import utc_minutes
+from travel_planner.persistence.schema import get_table_ddl, init_schema
+
+CATEGORIES = ["activity", "transport", "food", "lodging", "logistics", "shopping"]
+CATEGORY_CUM_WEIGHTS = list(itertools.accumulate([30, 20, 25, 8, 10, 7]))
+
+TITLES = {
+    "activity": ["Museum Visit", "City Walking Tour", "Hiking Trail", "Boat Cruise", "Concert"],
+    "transport": ["Flight", "Train Ride", "Ferry", "Car Rental Pickup", "Airport Transfer"],
+    "food": ["Breakfast", "Lunch", "Dinner Reservation", "Coffee Break", "Food Market"],
+    "lodging": ["Hotel Check-in", "Hotel Check-out", "Hostel Check-in"],
+    "logistics": ["Pack Bags", "Currency Exchange", "Pick up Tickets"],
+    "shopping": ["Market Visit", "Souvenir Shopping", "Outlet Mall"],
+}
+
+TAGS = ["booked", "paid", "optional", "outdoor", "indoor", "kids", "rain-plan", "must-see", "group", "free"]
+# Zipf-like popularity: a few tags dominate.
+TAG_CUM_WEIGHTS = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(TAGS))))
+TAG_COUNTS = [0, 1, 2, 3]
+TAG_COUNT_CUM_WEIGHTS = list(itertools.accumulate([40, 35, 18, 7]))
+
+CURRENCIES = ["USD", "EUR", "JPY", "GBP", "CAD"]
+
+CITIES = [
+    ("Rome", 41.9028, 12.4964),
+    ("Tokyo", 35.6762, 139.6503),
+    ("Reykjavik", 64.1466, -21.9426),
+    ("Seattle", 47.6062, -122.3321),
+    ("Paris", 48.8566, 2.3522),
+    ("Phoenix", 33.4484, -112.0740),
+    ("Banff", 51.1784, -115.5708),
+    ("Athens", 37.9838, 23.7275),
+]
+
+BASE_DATE = date(2025, 1, 1)
+_TRIP_TABLES = ("trips", "days", "items")
+# Fixed so --change-log output stays byte-identical between runs.
+_LOG_TS = "2025-01-01T00:00:00.000Z"
+
+
+def _trip_rng(seed: int, trip_index: int) -> random.Random:
+    # String seeds are hashed with SHA-512, so streams are stable across runs and platforms.
+    return random.Random(f"{seed}:{trip_index}")
+
+
+def _timestamp(trip_index: int, seq: int) -> str:
+    total = trip_index * 97 + seq
+    return f"2025-01-01T{(total // 3600) % 24:02d}:{(total // 60) % 60:02d}:{total % 60:02d}+00:00"
+
+
+def generate_trip(
+    seed: int,
+    trip_index: int,
+    *,
+    days: int,
+    items: int,
+    scheduled_ratio: float,
+    cost_ratio: float,
+    overlap_rate: float,
+    last_min: int = 1440,
+) -> tuple[tuple, list[tuple], list[tuple]]:
+    """
+    Build the rows of one trip. Ids are derived from trip_index alone.
+
+    Scheduled items end by last_min; items that would not fit stay unscheduled.
+    """
+    rng = _trip_rng(seed, trip_index)
+    trip_id = trip_index + 1
+    city, city_lat, city_lon = rng.choice(CITIES)
+    trip_row = (trip_id, f"{city} trip #{trip_id}")
+
+    start = BASE_DATE + timedelta(days=rng.randrange(0, 730))
+    day_rows = []
+    item_rows = []
+
+    for d in range(days):
+        day_index = trip_index * days + d
+        day_id = day_index + 1
+        day_date = (start + timedelta(days=d)).isoformat()
+        day_rows.append((day_id, trip_id, day_date))
+
+        # Days start around 08:00 (sd 1h); items follow with exponential gaps.
+        cursor = int(min(max(rng.gauss(480, 60), 300), 720))
+        for i in range(items):
+            item_id = day_index * items + i + 1
+            category = rng.choices(CATEGORIES, cum_weights=CATEGORY_CUM_WEIGHTS)[0]
+            title = rng.choice(TITLES[category])
+
+            start_min = end_min = start_utc = end_utc = None
+            if rng.random() < scheduled_ratio:
+                duration = int(min(max(rng.lognormvariate(4.0, 0.6), 10), 360))
+                if rng.random() < overlap_rate:
+                    begin = max(0, cursor - rng.randint(5, 30))
+                else:
+                    begin = cursor + int(rng.expovariate(1 / 20))
+                if begin + duration <= last_min:
+                    start_min, end_min = begin, begin + duration
+                    cursor = max(cursor, end_min)
+                    # Generated items float (no timezone); the instants are what overlap checks compare.
+                    start_utc = utc_minutes(day_date, start_min, None)
+                    end_utc = utc_minutes(day_date, end_min, None)
+
+            est = actual = currency = None
+            if rng.random() < cost_ratio:
+                est = round(rng.lognormvariate(3.5, 1.0), 2)
+                currency = rng.choice(CURRENCIES)
+                if rng.random() < 0.5:
+                    actual = round(est * rng.uniform(0.8, 1.3), 2)
+
+            tag_count = rng.choices(TAG_COUNTS, cum_weights=TAG_COUNT_CUM_WEIGHTS)[0]
+            tags = None
+            if tag_count:
+                tags = ",".join(sorted(set(rng.choices(TAGS, cum_weights=TAG_CUM_WEIGHTS, k=tag_count))))
+
+            lat = round(city_lat + rng.gauss(0, 0.05), 6)
+            lon = round(city_lon + rng.gauss(0, 0.05), 6)
+
+            ts = _timestamp(trip_index, i)
+            item_rows.append(
+                (
+                    item_id,
+                    day_id,
+                    title,
+                    category,
+                    start_min,
+                    end_min,
+                    start_utc,
+                    end_utc,
+                    1 if rng.random() < 0.05 else 0,
+                    city,
+                    lat,
+                    lon,
+                    est,
+                    actual,
+                    currency,
+                    tags,
+                    ts,
+                    ts,
+                )
+            )
+
+    return trip_row, day_rows, item_rows
+
+
+_INSERT_ITEM = """
+    INSERT INTO items (
+        id, day_id, title, category, start_min, end_min, start_utc, end_utc, pinned,
+        location_name, lat, lon, estimated_cost, actual_cost, currency,
+        tags, created_at, updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+"""
+
+
+def _open_bulk(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, isolation_level=None)
+    # The file is scratch until generation finishes; durability buys nothing here.
+    conn.execute("PRAGMA journal_mode = OFF;")
+    conn.execute("PRAGMA synchronous = OFF;")
+    for ddl in get_table_ddl():
+        conn.execute(ddl)
+    return conn
+
+
+def _trip_batches(
+    seed: int,
+    first_trip: int,
+    last_trip: int,
+    *,
+    batch_rows: int,
+    **shape,
+) -> Iterator[tuple[list, list, list]]:
+    trips, days, items = [], [], []
+    for t in range(first_trip, last_trip):
+        trip_row, day_rows, item_rows = generate_trip(seed, t, **shape)
+        trips.append(trip_row)
+        days.extend(day_rows)
+        items.extend(item_rows)
+        if len(items) + len(days) >= batch_rows:
+            yield trips, days, items
+            trips, days, items = [], [], []
+    if trips:
+        yield trips, days, items
+
+
+def write_shard(
+    path: str,
+    seed: int,
+    first_trip: int,
+    last_trip: int,
+    batch_rows: int,
+    shape: dict,
+) -> int:
+    """
+    Generate trips [first_trip, last_trip) into path. Returns rows written.
+    """
+    conn = _open_bulk(path)
+    rows = 0
+    conn.execute("BEGIN;")
+    for trips, days, items in _trip_batches(seed, first_trip, last_trip, batch_rows=batch_rows, **shape):
+        conn.executemany("INSERT INTO trips (id, name) VALUES (?, ?);", trips)
+        conn.executemany("INSERT INTO days (id, trip_id, date) VALUES (?, ?, ?);", days)
+        conn.executemany(_INSERT_ITEM, items)
+        rows += len(trips) + len(days) + len(items)
+    conn.execute("COMMIT;")
+    conn.close()
+    return rows
+
+
+def _shard_ranges(trips: int, shards: int) -> list[tuple[int, int]]:
+    per = math.ceil(trips / max(1, shards))
+    return [(lo, min(lo + per, trips)) for lo in range(0, trips, per)]
+
+
+def generate(
+    out_path: str,
+    *,
+    trips: int,
+    days: int,
+    items: int,
+    seed: int,
+    workers: int = 1,
+    shards: int = 8,
+    batch_rows: int = 200_000,
+    scheduled_ratio: float = 0.85,
+    cost_ratio: float = 0.6,
+    overlap_rate: float = 0.02,
+    last_min: int = 1440,
+    change_log: bool = False,
+) -> int:
+    shape = {
+        "days": days,
+        "items": items,
+        "scheduled_ratio": scheduled_ratio,
+        "cost_ratio": cost_ratio,
+        "overlap_rate": overlap_rate,
+        "last_min": last_min,
+    }
+
+    shard_dir = tempfile.mkdtemp(prefix="tp_shards_", dir=os.path.dirname(os.path.abspath(out_path)))
+    ranges = _shard_ranges(trips, shards)
+    paths = [os.path.join(shard_dir, f"shard_{i:04d}.db") for i in range(len(ranges))]
+
+    if workers <= 1:
+        rows = sum(
+            write_shard(path, seed, lo, hi, batch_rows, shape)
+            for path, (lo, hi) in zip(paths, ranges)
+        )
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(write_shard, path, seed, lo, hi, batch_rows, shape)
+                for path, (lo, hi) in zip(paths, ranges)
+            ]
+            rows = sum(f.result() for f in futures)
+
+    # Merge table by table, shards in trip order. The shard layout depends only
+    # on --shards (never on --workers), so the merged file, including its
+    # header's change counter, is the same however many processes ran.
+    conn = _open_bulk(out_path)
+    for table in _TRIP_TABLES:
+        for path in paths:
+            conn.execute("ATTACH DATABASE ? AS shard;", (path,))
+            conn.execute("BEGIN;")
+            # table_info omits generated columns, which cannot be inserted into.
+            cols = ", ".join(r[1] for r in conn.execute(f"PRAGMA main.table_info({table});"))
+            conn.execute(f"INSERT INTO main.{table} ({cols}) SELECT {cols} FROM shard.{table} ORDER BY id;")
+            conn.execute("COMMIT;")
+            conn.execute("DETACH DATABASE shard;")
+    if change_log:
+        # The logging triggers do not exist yet; record every row as its insert would have.
+        conn.execute("BEGIN;")
+        for table, entity in (("trips", "trip"), ("days", "day"), ("items", "item")):
+            conn.execute(
+                f"INSERT INTO change_log (entity, entity_id, op, changed_at) "
+                f"SELECT '{entity}', id, 'insert', ? FROM {table} ORDER BY id;",
+                (_LOG_TS,),
+            )
+        conn.execute("COMMIT;")
+    conn.close()
+    for path in paths:
+        os.remove(path)
+    os.rmdir(shard_dir)
+
+    # Indexes and triggers are built once, after the data is in place.
+    conn = sqlite3.connect(out_path)
+    conn.execute("PRAGMA journal_mode = DELETE;")
+    init_schema(conn)
+    conn.execute("ANALYZE;")
+    conn.commit()
+    conn.close()
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic travel_planner database.")
+    parser.add_argument("--out", required=True, help="Output database path (must not exist)")
+    parser.add_argument("--trips", type=int, required=True)
+    parser.add_argument("--days", type=int, default=7, help="Days per trip")
+    parser.add_argument("--items", type=int, default=10, help="Items per day")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1, help="Generate shards in this many processes")
+    parser.add_argument("--shards", type=int, default=8, help="Shard files to split trips into (part of the output identity)")
+    parser.add_argument("--batch-rows", type=int, default=200_000, help="Rows buffered per executemany batch")
+    parser.add_argument("--scheduled-ratio", type=float, default=0.85, help="Share of items with start/end times")
+    parser.add_argument("--cost-ratio", type=float, default=0.6, help="Share of items with a cost")
+    parser.add_argument("--overlap-rate", type=float, default=0.02, help="Chance an item starts before the previous ends")
+    parser.add_argument("--last-min", type=int, default=1440, help="Scheduled items end by this minute of the day")
+    parser.add_argument("--change-log", action="store_true", help="Record every generated row in the change log")
+    parser.add_argument("--force", action="store_true", help="Overwrite --out if it exists")
+    args = parser.parse_args()
+
+    if args.trips <= 0 or args.days <= 0 or args.items < 0:
+        print("--trips and --days must be positive, --items >= 0.", file=sys.stderr)
+        return 2
+
+    if os.path.exists(args.out):
+        if not args.force:
+            print(f"{args.out} already exists (use --force to overwrite).", file=sys.stderr)
+            return 2
+        os.remove(args.out)
+
+    t0 = time.perf_counter()
+    rows = generate(
+        args.out,
+        trips=args.trips,
+        days=args.days,
+        items=args.items,
+        seed=args.seed,
+        workers=args.workers,
+        shards=args.shards,
+        batch_rows=args.batch_rows,
+        scheduled_ratio=args.scheduled_ratio,
+        cost_ratio=args.cost_ratio,
+        overlap_rate=args.overlap_rate,
+        last_min=args.last_min,
+        change_log=args.change_log,
+    )
+    elapsed = time.perf_counter() - t0
+
+    print(
+        f"Wrote {rows:,} rows ({args.trips:,} trips, {args.trips * args.days:,} days, "
+        f"{args.trips * args.days * args.items:,} items) in {elapsed:.2f}s "
+        f"= {rows / elapsed:,.0f} rows/sec"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
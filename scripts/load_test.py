@@ -0,0 +1,203 @@
+"""
+Load test for the HTTP/JSON API.
+
+Seeds a local database, starts the API server in-process (or targets --url),
+then hammers a mix of read endpoints from several client threads and reports
+requests/sec with latency percentiles.
+
+    python scripts/load_test.py --trips 20 --days 10 --items 12 --threads 8 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+from travel_planner.api.server import make_server
+from travel_planner.persistence import item_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+
+
+def seed_db(db_path: str, trips: int, days: int, items: int, seed: int) -> None:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).isoformat()
+    conn = connect(db_path)
+    init_schema(conn)
+
+    start = date(2026, 1, 1)
+    for t in range(trips):
+        trip_id = conn.execute("INSERT INTO trips (name) VALUES (?);", (f"Trip {t + 1}",)).lastrowid
+        for d in range(days):
+            day_id = conn.execute(
+                "INSERT INTO days (trip_id, date) VALUES (?, ?);",
+                (trip_id, (start + timedelta(days=d)).isoformat()),
+            ).lastrowid
+            rows = []
+            for i in range(items):
+                begin = rng.randrange(0, 1380)
+                rows.append(
+                    (day_id, f"Item {i + 1}", "activity", begin, begin + rng.randint(15, 60), now, now)
+                )
+            conn.executemany(
+                """
+                INSERT INTO items (day_id, title, category, start_min, end_min, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?);
+                """,
+                rows,
+            )
+    item_repository.refresh_utc_instants(conn)
+    conn.commit()
+    conn.close()
+
+
+def _fetch_targets(host: str, port: int) -> list[str]:
+    client = http.client.HTTPConnection(host, port, timeout=30)
+    client.request("GET", "/trips")
+    trips = json.loads(client.getresponse().read())
+
+    paths = ["/trips"]
+    for trip in trips[:50]:
+        paths.append(f"/trips/{trip['id']}")
+        client.request("GET", f"/trips/{trip['id']}/days")
+        days = json.loads(client.getresponse().read())
+        paths.append(f"/trips/{trip['id']}/days")
+        for day in days[:5]:
+            paths.append(f"/days/{day['id']}/items")
+            paths.append(f"/days/{day['id']}/check")
+    client.close()
+    return paths
+
+
+def _worker(
+    host: str,
+    port: int,
+    paths: list[str],
+    deadline: float,
+    revalidate: bool,
+    seed: int,
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    rng = random.Random(seed)
+    client = http.client.HTTPConnection(host, port, timeout=30)
+    etags: dict[str, str] = {}
+
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        headers = {}
+        if revalidate and path in etags:
+            headers["If-None-Match"] = etags[path]
+
+        t0 = time.perf_counter()
+        try:
+            client.request("GET", path, headers=headers)
+            resp = client.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            client.close()
+            client = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - t0)
+
+        if resp.status >= 400:
+            errors.append(resp.status)
+        etag = resp.getheader("ETag")
+        if etag:
+            etags[path] = etag
+
+    client.close()
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def run_load(host: str, port: int, *, threads: int, seconds: float, revalidate: bool) -> dict:
+    paths = _fetch_targets(host, port)
+    deadline = time.perf_counter() + seconds
+    per_thread: list[list[float]] = [[] for _ in range(threads)]
+    errors: list[int] = []
+
+    workers = [
+        threading.Thread(
+            target=_worker,
+            args=(host, port, paths, deadline, revalidate, i, per_thread[i], errors),
+        )
+        for i in range(threads)
+    ]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(x for lst in per_thread for x in lst)
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the travel_planner HTTP API.")
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--db", dest="db_path", help="Database to serve (default: fresh temp db)")
+    parser.add_argument("--trips", type=int, default=20)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--items", type=int, default=12)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match with cached ETags")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server = None
+    tmp_dir = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    else:
+        db_path = args.db_path
+        if db_path is None:
+            tmp_dir = tempfile.TemporaryDirectory()
+            db_path = os.path.join(tmp_dir.name, "load_test.db")
+            seed_db(db_path, args.trips, args.days, args.items, args.seed)
+        server = make_server(db_path, port=0, pool_size=args.pool_size, quiet=True)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        result = run_load(host, port, threads=args.threads, seconds=args.seconds, revalidate=args.revalidate)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+"""
+Write throughput: per-call commits versus a group-commit WriteQueue.
+
+Several threads each patch items as fast as they can, first every thread on
+its own connection committing each write, then all of them through one
+WriteQueue, and the script reports writes/sec for both.
+
+    python scripts/write_load.py --threads 8 --ops 200
+    python scripts/write_load.py --threads 8 --ops 200 --wal
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable
+
+from travel_planner.observability import metrics
+from travel_planner.persistence import item_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.persistence.write_queue import WriteQueue
+
+
+def seed_db(db_path: str, items: int, *, wal: bool) -> None:
+    conn = connect(db_path)
+    if wal:
+        conn.execute("PRAGMA journal_mode = WAL;")
+    init_schema(conn)
+    trip_id = conn.execute("INSERT INTO trips (name) VALUES ('Load');").lastrowid
+    day_id = conn.execute("INSERT INTO days (trip_id, date) VALUES (?, '2026-01-01');", (trip_id,)).lastrowid
+    for i in range(items):
+        item_repository.create_item_min(conn, day_id, f"Item {i + 1}", "activity")
+    conn.close()
+
+
+def _run_threads(threads: int, worker: Callable[[int], None]) -> float:
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - started
+
+
+def run_per_call(db_path: str, *, threads: int, ops: int, items: int) -> dict:
+    def worker(n: int) -> None:
+        conn = connect(db_path, check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout = 60000;")
+        for i in range(ops):
+            item_repository.update_item_fields(conn, (n * ops + i) % items + 1, notes=f"per-call {n}/{i}")
+        conn.close()
+
+    return _result(threads * ops, _run_threads(threads, worker))
+
+
+def run_group_commit(db_path: str, *, threads: int, ops: int, items: int, max_batch: int, max_delay: float) -> dict:
+    registry = metrics.enable_metrics()
+    batches_before = registry.value(metrics.WRITE_QUEUE_BATCHES)
+
+    with WriteQueue(db_path, max_batch=max_batch, max_delay=max_delay) as queue:
+        def worker(n: int) -> None:
+            for i in range(ops):
+                queue.submit(
+                    item_repository.update_item_fields, (n * ops + i) % items + 1, notes=f"grouped {n}/{i}"
+                ).result()
+
+        elapsed = _run_threads(threads, worker)
+
+    result = _result(threads * ops, elapsed)
+    batches = registry.value(metrics.WRITE_QUEUE_BATCHES) - batches_before
+    metrics.disable_metrics()
+    result["commits"] = int(batches)
+    result["avg_batch"] = round(threads * ops / batches, 1) if batches else 0.0
+    return result
+
+
+def _result(writes: int, elapsed: float) -> dict:
+    return {
+        "writes": writes,
+        "seconds": round(elapsed, 3),
+        "writes_per_sec": round(writes / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare per-call commits with group commit.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200, help="Writes per thread")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-delay", type=float, default=0.002, help="Seconds the writer waits to fill a batch")
+    parser.add_argument("--wal", action="store_true", help="Run both modes in WAL journal mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        per_call_db = os.path.join(tmp_dir, "per_call.db")
+        grouped_db = os.path.join(tmp_dir, "grouped.db")
+        seed_db(per_call_db, args.items, wal=args.wal)
+        seed_db(grouped_db, args.items, wal=args.wal)
+
+        per_call = run_per_call(per_call_db, threads=args.threads, ops=args.ops, items=args.items)
+        grouped = run_group_commit(
+            grouped_db,
+            threads=args.threads,
+            ops=args.ops,
+            items=args.items,
+            max_batch=args.max_batch,
+            max_delay=args.max_delay,
+        )
+
+    speedup = grouped["writes_per_sec"] / per_call["writes_per_sec"] if per_call["writes_per_sec"] else 0.0
+    print(json.dumps({"per_call": per_call, "group_commit": grouped, "speedup": round(speedup, 2)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
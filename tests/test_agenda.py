@@ -0,0 +1,77 @@
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import agenda_service
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "agenda.db"))
+    init_schema(conn)
+    spring = trip_repository.create_trip(conn, "Spring")
+    summer = trip_repository.create_trip(conn, "Summer")
+    s1 = day_repository.create_day(conn, spring, "2026-03-01")
+    s2 = day_repository.create_day(conn, spring, "2026-03-02")
+    u1 = day_repository.create_day(conn, summer, "2026-03-01")
+    u2 = day_repository.create_day(conn, summer, "2026-04-01")
+
+    item_repository.create_item_scheduled(conn, s1, "Museum", "activity", 600, 720)
+    item_repository.create_item_min(conn, s1, "Postcards", "other")
+    item_repository.create_item_scheduled(conn, u1, "Breakfast", "food", 480, 540)
+    item_repository.create_item_scheduled(conn, u1, "Lunch", "food", 720, 780)
+    item_repository.create_item_scheduled(conn, s2, "Train", "transport", 420, 480)
+    item_repository.create_item_scheduled(conn, u2, "Flight", "transport", 360, 600)
+    yield conn
+    conn.close()
+
+
+def test_agenda_interleaves_trips_by_date_and_time(conn):
+    rows = list(agenda_service.iter_agenda(conn, "2026-03-01", "2026-03-31"))
+
+    assert [(r["date"], r["trip_name"], r["title"]) for r in rows] == [
+        ("2026-03-01", "Summer", "Breakfast"),
+        ("2026-03-01", "Spring", "Museum"),
+        ("2026-03-01", "Summer", "Lunch"),
+        ("2026-03-01", "Spring", "Postcards"),
+        ("2026-03-02", "Spring", "Train"),
+    ]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_pages_cover_the_range_without_gaps_or_repeats(conn, limit):
+    expected = [r["item_id"] for r in agenda_service.iter_agenda(conn, "2026-01-01", "2026-12-31")]
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = agenda_service.page_agenda(conn, "2026-01-01", "2026-12-31", after=cursor, limit=limit)
+        assert len(rows) <= limit
+        seen.extend(r["item_id"] for r in rows)
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert len(expected) == 6
+
+
+def test_agenda_validates_range_limit_and_cursor(conn):
+    with pytest.raises(ValidationError):
+        agenda_service.iter_agenda(conn, "2026-04-01", "2026-03-01")
+    with pytest.raises(ValidationError):
+        agenda_service.page_agenda(conn, "2026-03-01", "2026-04-01", limit=0)
+    with pytest.raises(ValidationError):
+        agenda_service.page_agenda(conn, "2026-03-01", "2026-04-01", after="not-a-cursor")
+
+
+def test_agenda_query_is_driven_by_the_day_num_index(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    list(agenda_service.iter_agenda(conn, "2026-03-01", "2026-03-31"))
+    conn.set_trace_callback(None)
+
+    details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + statements[-1])]
+    assert details[0].startswith("SEARCH d USING COVERING INDEX idx_days_day_num")
+    assert not any(d.startswith("SCAN") for d in details)
+    assert not any("TEMP B-TREE" in d and "RIGHT PART" not in d for d in details)
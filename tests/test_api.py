@@ -0,0 +1,171 @@
+import http.client
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from travel_planner.api import server as api
+from travel_planner.persistence import item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.services import recurring_service
+
+
+@pytest.fixture
+def client(tmp_path):
+    srv = api.make_server(str(tmp_path / "api.db"), port=0, pool_size=2, quiet=True)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    host, port = srv.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+
+    def request(method: str, path: str, body=None, headers=None):
+        data = body if isinstance(body, bytes) or body is None else json.dumps(body).encode("utf-8")
+        conn.request(method, path, body=data, headers=headers or {})
+        resp = conn.getresponse()
+        raw = resp.read()
+        return resp.status, resp, (json.loads(raw) if raw else None)
+
+    yield request
+    conn.close()
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def day(client):
+    assert client("POST", "/trips", {"name": "Lisbon"})[2] == {"id": 1}
+    assert client("POST", "/trips/1/days", {"date": "2026-05-01"})[2] == {"id": 1}
+    tram = {"title": "Tram", "category": "transport", "start_min": 600, "end_min": 660}
+    assert client("POST", "/days/1/items", tram)[2] == {"id": 1}
+    return 1
+
+
+def test_routes(client, day):
+    status, _, trips = client("GET", "/trips")
+    assert status == 200 and [t["name"] for t in trips] == ["Lisbon"]
+    assert client("PATCH", "/trips/1", {"name": "Porto"})[2]["name"] == "Porto"
+    assert client("GET", "/trips/1")[2]["name"] == "Porto"
+
+    assert [d["date"] for d in client("GET", "/trips/1/days")[2]] == ["2026-05-01"]
+    assert client("PATCH", "/days/1", {"date": "2026-05-02"})[2]["date"] == "2026-05-02"
+    assert client("GET", "/days/1")[2]["date"] == "2026-05-02"
+
+    status, _, created = client("POST", "/days/1/items", {"title": "Lunch", "category": "food"})
+    assert (status, created) == (201, {"id": 2})
+    item = client("PATCH", "/items/2", {"start_min": 690, "end_min": 750, "notes": "Time Out Market"})[2]
+    assert (item["start_min"], item["notes"]) == (690, "Time Out Market")
+    assert client("GET", "/items/2")[2]["title"] == "Lunch"
+    assert [it["id"] for it in client("GET", "/days/1/items")[2]] == [1, 2]
+
+    client("POST", "/days/1/items", {"title": "Postcards", "category": "shopping"})
+    client("POST", "/days/1/items", {"title": "Pack", "category": "logistics"})
+    assert client("POST", "/items/4/move", {"before": 3})[0] == 200
+
+    status, _, check = client("GET", "/days/1/check?buffer=60")
+    assert status == 200 and check["tight_connections"][0]["gap_min"] == 30
+    assert client("GET", "/trips/1/check")[2]["trip_id"] == 1
+
+    assert client("DELETE", "/items/2")[0] == 204
+    assert client("DELETE", "/days/1")[0] == 204
+    assert client("DELETE", "/trips/1")[0] == 204
+    assert client("GET", "/trips")[2] == []
+
+
+def test_error_statuses(client, day, monkeypatch):
+    assert client("GET", "/nowhere")[0] == 404
+    assert client("GET", "/trips/99")[2] == {"error": "trip not found."}
+    assert client("POST", "/trips/1")[0] == 405
+    assert client("POST", "/trips", b"{not json", {"Content-Type": "application/json"})[0] == 400
+    assert client("POST", "/trips", {})[2] == {"error": "name is required."}
+
+    bus = {"title": "Bus", "category": "transport", "start_min": 630, "end_min": 700}
+    status, _, body = client("POST", "/days/1/items", bus)
+    assert status == 400 and "overlaps" in body["error"]
+    assert client("POST", "/trips/1/days", {"date": "2026-05-01"})[0] == 400
+
+    read = client("GET", "/items/1")[2]["updated_at"]
+    assert client("PATCH", "/items/1", {"title": "Tram 28", "if_updated_at": read})[0] == 200
+    status, _, body = client("PATCH", "/items/1", {"title": "Tram 15", "if_updated_at": read})
+    assert status == 409 and "changed since it was read" in body["error"]
+
+    # The time change must not be written when a later field is invalid.
+    assert client("PATCH", "/items/1", {"start_min": 900, "end_min": 960, "pinned": "yes"})[0] == 400
+    assert client("GET", "/items/1")[2]["start_min"] == 600
+
+    def constraint(conn, item_id):
+        raise sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+
+    def locked(conn):
+        raise sqlite3.OperationalError("database is locked")
+
+    def broken(conn):
+        raise RuntimeError("bug")
+
+    monkeypatch.setattr(item_repository, "delete_item", constraint)
+    assert client("DELETE", "/items/1")[0] == 409
+    monkeypatch.setattr(trip_repository, "list_trips", locked)
+    assert client("GET", "/trips")[0] == 503
+    monkeypatch.setattr(trip_repository, "list_trips", broken)
+    status, _, body = client("GET", "/trips")
+    assert (status, body) == (500, {"error": "internal server error."})
+
+
+def test_malformed_content_length_is_rejected(client, day):
+    status, _, body = client("POST", "/trips", headers={"Content-Length": "ten"})
+    assert (status, body) == (400, {"error": "Content-Length must be an integer."})
+    # The connection is still usable afterwards.
+    assert client("GET", "/trips/1")[0] == 200
+
+
+def test_etag_revalidation(client, day):
+    status, resp, _ = client("GET", "/days/1/items")
+    etag = resp.getheader("ETag")
+    assert status == 200 and etag
+
+    status, resp, body = client("GET", "/days/1/items", headers={"If-None-Match": etag})
+    assert (status, body, resp.getheader("ETag")) == (304, None, etag)
+
+    client("PATCH", "/items/1", {"title": "Tram 28"})
+    status, resp, _ = client("GET", "/days/1/items", headers={"If-None-Match": etag})
+    assert status == 200 and resp.getheader("ETag") != etag
+
+
+def test_day_check_etag_follows_recurring_rules(client, day, tmp_path):
+    status, resp, body = client("GET", "/days/1/check")
+    etag = resp.getheader("ETag")
+    assert status == 200 and body["overlaps"] == []
+    assert client("GET", "/days/1/check", headers={"If-None-Match": etag})[0] == 304
+
+    # No stored item changes, but the day's schedule does.
+    conn = connect(str(tmp_path / "api.db"))
+    try:
+        recurring_service.add_recurring_item(conn, 1, "Coffee", "food", start_min=630, end_min=645)
+    finally:
+        conn.close()
+    status, resp, body = client("GET", "/days/1/check", headers={"If-None-Match": etag})
+    assert status == 200 and resp.getheader("ETag") != etag
+    assert len(body["overlaps"]) == 1
+
+
+def test_long_item_lists_are_streamed_in_chunks(client, day, monkeypatch):
+    monkeypatch.setattr(api, "STREAM_THRESHOLD", 3)
+    monkeypatch.setattr(api, "STREAM_BATCH_ROWS", 2)
+    for i in range(4):
+        client("POST", "/days/1/items", {"title": f"Stop {i}", "category": "activity"})
+
+    # Rows come from the cursor, never from a materialized list.
+    def materialized(conn, day_id):
+        raise AssertionError("listing was built in memory")
+
+    monkeypatch.setattr(item_repository, "list_items_for_day", materialized)
+
+    status, resp, items = client("GET", "/days/1/items")
+    assert status == 200
+    assert resp.getheader("Transfer-Encoding") == "chunked" and resp.getheader("Content-Length") is None
+    assert [it["id"] for it in items] == [1, 2, 3, 4, 5]
+
+    etag = resp.getheader("ETag")
+    assert client("GET", "/days/1/items", headers={"If-None-Match": etag})[0] == 304
+    client("DELETE", "/items/5")
+    status, _, items = client("GET", "/days/1/items", headers={"If-None-Match": etag})
+    assert status == 200 and len(items) == 4
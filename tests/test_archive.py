@@ -0,0 +1,134 @@
+import sqlite3
+
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import archive_repository, day_repository, item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import get_entity_table_ddl, init_schema
+from travel_planner.services import archive_service, export_service
+
+
+@pytest.fixture
+def db(tmp_path):
+    conn = connect(str(tmp_path / "hot.db"))
+    init_schema(conn)
+    old = trip_repository.create_trip(conn, "Old")
+    day_id = day_repository.create_day(conn, old, "2025-05-01")
+    item_repository.create_item_scheduled(conn, day_id, "Museum", "activity", 600, 660)
+    current = trip_repository.create_trip(conn, "Current")
+    day_repository.create_day(conn, current, "2026-11-01")
+    yield conn, str(tmp_path / "hot.archive.db"), old, current
+    conn.close()
+
+
+def _count(conn, schema, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {schema}.{table};").fetchone()[0]
+
+
+def test_archive_and_unarchive_round_trip_keeps_ids(db):
+    conn, archive_path, old, current = db
+    before_export = export_service.export_trip(conn, old)
+
+    counts = archive_service.archive_trips(conn, archive_path, before="2026-01-01")
+
+    assert counts == {"trips": 1, "days": 1, "items": 1}
+    assert [t["id"] for t in trip_repository.list_trips(conn)] == [current]
+    assert [t["id"] for t in archive_service.list_archived_trips(conn, archive_path)] == [old]
+    archived_export = export_service.export_trip(conn, old, schema=archive_repository.ARCHIVE_SCHEMA)
+    assert archived_export["days"] == before_export["days"]
+
+    archive_service.unarchive_trip(conn, archive_path, old)
+
+    assert _count(conn, "archive", "trips") == 0
+    assert export_service.export_trip(conn, old)["days"] == before_export["days"]
+
+
+def test_unarchive_refuses_id_conflicts(db):
+    conn, archive_path, old, _ = db
+    archive_service.archive_trips(conn, archive_path, before="2026-01-01")
+    # Reuse the archived id in the hot database.
+    conn.execute("INSERT INTO trips (id, name) VALUES (?, 'Clash');", (old,))
+    conn.commit()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        archive_service.unarchive_trip(conn, archive_path, old)
+
+    assert _count(conn, "archive", "trips") == 1
+    assert _count(conn, "archive", "items") == 1
+
+
+def test_unarchive_unknown_trip_is_a_validation_error(db):
+    conn, archive_path, _, _ = db
+    with pytest.raises(ValidationError):
+        archive_service.unarchive_trip(conn, archive_path, 999)
+    with pytest.raises(ValidationError):
+        archive_service.archive_trips(conn, archive_path, before="not-a-date")
+
+
+def test_new_trips_never_take_archived_ids(db):
+    conn, archive_path, old, current = db
+    last = trip_repository.create_trip(conn, "Last")
+    day_repository.create_day(conn, last, "2025-06-01")
+    archive_service.archive_trips(conn, archive_path, before="2026-01-01")
+
+    newer = trip_repository.create_trip(conn, "Newer")
+    day_repository.create_day(conn, newer, "2025-07-01")
+    assert newer > last
+    archive_service.archive_trips(conn, archive_path, before="2026-01-01")
+
+    for trip_id in (old, last, newer):
+        archive_service.unarchive_trip(conn, archive_path, trip_id)
+
+    assert [t["id"] for t in trip_repository.list_trips(conn)] == sorted([old, current, last, newer])
+    assert _count(conn, "archive", "trips") == 0
+
+
+def test_moves_raise_a_lagging_sequence_past_archived_ids(db):
+    conn, archive_path, _, _ = db
+    last = trip_repository.create_trip(conn, "Last")
+    day_repository.create_day(conn, last, "2025-06-01")
+    archive_service.archive_trips(conn, archive_path, before="2026-01-01")
+    # As in a database whose tables got AUTOINCREMENT after last was archived.
+    conn.execute("DELETE FROM sqlite_sequence WHERE name != 'change_log';")
+    conn.commit()
+
+    archive_service.archive_trips(conn, archive_path, before="2020-01-01")
+
+    assert trip_repository.create_trip(conn, "New") > last
+
+
+def test_migration_gives_id_tables_autoincrement(tmp_path):
+    conn = connect(str(tmp_path / "legacy.db"))
+    for ddl in get_entity_table_ddl():
+        conn.execute(ddl.replace(" AUTOINCREMENT", ""))
+    conn.execute("INSERT INTO trips (id, name) VALUES (7, 'Legacy');")
+    conn.execute("INSERT INTO days (id, trip_id, date) VALUES (3, 7, '2025-05-01');")
+    conn.execute(
+        "INSERT INTO items (id, day_id, title, category, start_min, end_min, created_at, updated_at) "
+        "VALUES (5, 3, 'Museum', 'activity', 600, 660, 'x', 'x');"
+    )
+    conn.commit()
+
+    init_schema(conn)
+
+    for table in ("trips", "days", "items", "recurring_items"):
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?;", (table,)).fetchone()[0]
+        assert "AUTOINCREMENT" in sql
+    assert item_repository.get_item(conn, 5)["start_utc"] is not None
+    assert trip_repository.create_trip(conn, "New") == 8
+    # Foreign keys and triggers still apply to the rebuilt tables.
+    trip_repository.delete_trip(conn, 7)
+    assert _count(conn, "main", "items") == 0
+    assert conn.execute("SELECT COUNT(*) FROM change_log WHERE entity = 'item';").fetchone()[0] > 0
+    conn.close()
+
+
+def test_archived_days_and_items_are_readable(db):
+    conn, archive_path, old, _ = db
+    archive_service.archive_trips(conn, archive_path, before="2026-01-01")
+
+    days = archive_service.list_archived_days(conn, archive_path, old)
+    assert [d["date"] for d in days] == ["2025-05-01"]
+    items = archive_service.list_archived_items(conn, archive_path, days[0]["id"])
+    assert [i["title"] for i in items] == ["Museum"]
@@ -0,0 +1,79 @@
+import gzip
+import sqlite3
+
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import backup_service
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "live.db"))
+    init_schema(conn)
+    for i in range(200):
+        trip_repository.create_trip(conn, f"Trip {i} " + "x" * 200)
+    yield conn
+    conn.close()
+
+
+def _trip_count(path):
+    copy = sqlite3.connect(path)
+    try:
+        return copy.execute("SELECT COUNT(*) FROM trips;").fetchone()[0]
+    finally:
+        copy.close()
+
+
+def test_backup_steps_let_other_writers_commit(conn, tmp_path):
+    writer = connect(str(tmp_path / "live.db"))
+    writer.execute("PRAGMA busy_timeout = 0;")
+    steps = []
+
+    def progress(remaining, total):
+        steps.append(remaining)
+        if len(steps) == 1:
+            # Between steps the source is unlocked, so this commit must not fail with SQLITE_BUSY.
+            trip_repository.create_trip(writer, "Written mid-backup")
+
+    out = tmp_path / "copy.db"
+    result = backup_service.backup_database(conn, str(out), pages=2, sleep=0, progress=progress)
+    writer.close()
+
+    assert len(steps) > 1
+    assert result["written"] and result["integrity"] == "ok"
+    # A change from another connection restarts the copy, so it is included.
+    assert _trip_count(str(out)) == 201
+
+
+def test_compressed_backup_round_trips(conn, tmp_path):
+    out = tmp_path / "copy.db.gz"
+    result = backup_service.backup_database(conn, str(out), compress=True)
+
+    restored = tmp_path / "restored.db"
+    restored.write_bytes(gzip.decompress(out.read_bytes()))
+    assert result["bytes"] == out.stat().st_size
+    assert _trip_count(str(restored)) == 200
+    assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith(".backup-")) == []
+
+
+def test_backup_rejects_bad_arguments(conn, tmp_path):
+    with pytest.raises(ValidationError):
+        backup_service.backup_database(conn, str(tmp_path / "live.db"))
+    with pytest.raises(ValidationError):
+        backup_service.backup_database(conn, str(tmp_path / "x.db"), pages=0)
+
+
+def test_compressed_backup_checks_room_for_the_uncompressed_copy(conn, tmp_path, monkeypatch):
+    size = conn.execute("PRAGMA page_count;").fetchone()[0] * conn.execute("PRAGMA page_size;").fetchone()[0]
+    usage = backup_service.shutil.disk_usage(str(tmp_path))
+    monkeypatch.setattr(backup_service.shutil, "disk_usage", lambda path: usage._replace(free=size + 1))
+
+    assert backup_service.backup_database(conn, str(tmp_path / "copy.db"))["written"]
+    with pytest.raises(ValidationError, match="free space"):
+        backup_service.backup_database(conn, str(tmp_path / "copy.db.gz"), compress=True)
+    assert not (tmp_path / "copy.db.gz").exists()
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".backup-")] == []
@@ -0,0 +1,35 @@
+import pytest
+
+from benchmarks.dataset import LAST_GENERATED_MIN, build_db
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import item_repository
+from travel_planner.persistence.db import connect
+from travel_planner.services import item_service
+
+
+def test_generated_items_are_seen_by_overlap_checks(tmp_path):
+    path = str(tmp_path / "bench.db")
+    build_db(path, trips=2, days=2, items=5, seed=3)
+
+    conn = connect(path)
+    try:
+        missing = conn.execute(
+            "SELECT COUNT(*) FROM items WHERE start_min IS NOT NULL AND start_utc IS NULL;"
+        ).fetchone()[0]
+        assert missing == 0
+
+        # Every day has a schedule, and the tail of each day is left free.
+        per_day = conn.execute(
+            "SELECT COUNT(DISTINCT day_id), MAX(end_min) FROM items WHERE start_min IS NOT NULL;"
+        ).fetchone()
+        assert per_day[0] == 4 and per_day[1] <= LAST_GENERATED_MIN
+        logged = conn.execute("SELECT COUNT(*) FROM change_log WHERE op = 'insert';").fetchone()[0]
+        assert logged == 2 + 4 + 20
+
+        other = [it for it in item_repository.list_items_for_day(conn, 1) if it["start_min"] is not None][-1]
+        with pytest.raises(ValidationError, match=f"id={other['id']}"):
+            item_service.create_item_scheduled(
+                conn, 1, "Bench", "activity", other["start_min"], other["end_min"]
+            )
+    finally:
+        conn.close()
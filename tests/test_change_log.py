@@ -0,0 +1,66 @@
+import io
+import json
+
+from travel_planner.persistence import day_repository, item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import export_service
+
+
+def _conn():
+    conn = connect(":memory:")
+    init_schema(conn)
+    return conn
+
+
+def test_changes_collapse_to_latest_op_per_row():
+    conn = _conn()
+    trip_id = trip_repository.create_trip(conn, "T")
+    day_id = day_repository.create_day(conn, trip_id, "2026-05-01")
+    item_id = item_repository.create_item_min(conn, day_id, "A", "food")
+    item_repository.update_item_fields(conn, item_id, title="B")
+
+    changes = list(export_service.iter_changes_since(conn, 0))
+
+    assert [(c["entity"], c["op"]) for c in changes] == [
+        ("trip", "insert"),
+        ("day", "insert"),
+        ("item", "update"),
+    ]
+    assert changes[-1]["row"]["title"] == "B"
+    assert [c["seq"] for c in changes] == sorted(c["seq"] for c in changes)
+
+
+def test_since_only_returns_later_changes_including_cascaded_deletes():
+    conn = _conn()
+    trip_id = trip_repository.create_trip(conn, "T")
+    day_id = day_repository.create_day(conn, trip_id, "2026-05-01")
+    item_id = item_repository.create_item_min(conn, day_id, "A", "food")
+    out = io.StringIO()
+    _, last_seq = export_service.write_changes_ndjson(conn, 0, out)
+
+    trip_repository.delete_trip(conn, trip_id)
+    out = io.StringIO()
+    count, _ = export_service.write_changes_ndjson(conn, last_seq, out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert count == 3
+    assert {(r["entity"], r["id"], r["op"]) for r in records} == {
+        ("trip", trip_id, "delete"),
+        ("day", day_id, "delete"),
+        ("item", item_id, "delete"),
+    }
+    assert all(r["row"] is None for r in records)
+
+
+def test_compaction_keeps_seq_monotonic():
+    conn = _conn()
+    trip_repository.create_trip(conn, "T1")
+    first = list(export_service.iter_changes_since(conn, 0))[-1]["seq"]
+
+    assert export_service.compact_change_log(conn, through_seq=first) == 1
+    trip_repository.create_trip(conn, "T2")
+
+    later = list(export_service.iter_changes_since(conn, 0))
+    assert len(later) == 1
+    assert later[0]["seq"] > first
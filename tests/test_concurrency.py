@@ -0,0 +1,145 @@
+import re
+import sqlite3
+
+import pytest
+
+from travel_planner.cli.main import main
+from travel_planner.domain.exceptions import ConflictError
+from travel_planner.domain.validators import ValidationError
+from travel_planner.observability import metrics
+from travel_planner.persistence import db, day_repository, item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import item_service, trip_service
+
+
+@pytest.fixture
+def registry():
+    reg = metrics.enable_metrics()
+    yield reg
+    metrics.disable_metrics()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "concurrency.db")
+    conn = connect(path)
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Oslo")
+    day_id = day_repository.create_day(conn, trip_id, "2026-02-01")
+    item_service.create_item_scheduled(conn, day_id, "Museum", "activity", 600, 660)
+    conn.close()
+    return path
+
+
+def test_stale_version_is_rejected(db_path):
+    conn = connect(db_path)
+    try:
+        read = item_repository.get_item(conn, 1)["updated_at"]
+        version = item_service.update_item_fields(conn, 1, title="Fram Museum", expected_updated_at=read)
+        assert version != read
+        assert item_service.set_item_time(conn, 1, 660, 720, expected_updated_at=version) != version
+
+        # A second writer still holding the first read loses.
+        with pytest.raises(ConflictError, match=re.escape(f"expected {read}")):
+            item_service.update_item_fields(conn, 1, title="Viking Ship Museum", expected_updated_at=read)
+        with pytest.raises(ConflictError):
+            item_service.clear_item_time(conn, 1, expected_updated_at=read)
+        item = item_repository.get_item(conn, 1)
+        assert (item["title"], item["start_min"]) == ("Fram Museum", 660)
+
+        # The repository reports the lost race instead of writing.
+        assert item_repository.update_item_time(conn, 1, 700, 760, expected_updated_at=read) is None
+        assert item_repository.get_item(conn, 1)["start_min"] == 660
+    finally:
+        conn.close()
+
+    assert main(["--db", db_path, "item", "update", "--item-id", "1", "--title", "X", "--if-updated-at", read]) == 5
+
+
+def test_combined_update_is_all_or_nothing(db_path, monkeypatch):
+    conn = connect(db_path)
+    other = connect(db_path)
+    read = item_repository.get_item(conn, 1)["updated_at"]
+    write = item_repository.update_item
+
+    def racing_write(conn, item_id, changes, **kwargs):
+        # Another client commits after our checks passed, just before our write.
+        write(other, item_id, {"notes": "edited elsewhere"})
+        return write(conn, item_id, changes, **kwargs)
+
+    monkeypatch.setattr(item_repository, "update_item", racing_write)
+    try:
+        with pytest.raises(ConflictError):
+            item_service.update_item(
+                conn,
+                1,
+                title="Fram Museum",
+                start_min=700,
+                end_min=760,
+                timezone="Europe/Oslo",
+                expected_updated_at=read,
+            )
+        monkeypatch.undo()
+
+        # A bad field anywhere in the request rejects all of it.
+        with pytest.raises(ValidationError):
+            item_service.update_item(conn, 1, start_min=700, end_min=760, title="  ")
+
+        item = item_repository.get_item(conn, 1)
+        assert (item["title"], item["start_min"], item["timezone"], item["notes"]) == (
+            "Museum", 600, None, "edited elsewhere"
+        )
+    finally:
+        other.close()
+        conn.close()
+
+
+def test_busy_write_is_retried_after_backoff(db_path, registry, monkeypatch):
+    conn = connect(db_path)
+    other = sqlite3.connect(db_path)
+    conn.execute("PRAGMA busy_timeout = 0;")
+    other.execute("BEGIN IMMEDIATE;")
+    delays = []
+
+    def release(delay):
+        delays.append(delay)
+        other.commit()
+
+    monkeypatch.setattr(db, "_sleep", release)
+    try:
+        trip_service.rename_trip(conn, 1, "Bergen")
+        assert trip_repository.get_trip(conn, 1)["name"] == "Bergen"
+    finally:
+        other.close()
+        conn.close()
+
+    assert len(delays) == 1 and 0.005 <= delays[0] <= 0.01
+    fn = "trip_service.rename_trip"
+    assert registry.value(metrics.DB_BUSY_RETRIES, function=fn) == 1
+    assert registry.value(metrics.SERVICE_CALLS, function=fn, outcome="ok") == 1
+
+
+def test_busy_retries_are_bounded(db_path, registry, monkeypatch):
+    conn = connect(db_path)
+    other = sqlite3.connect(db_path)
+    conn.execute("PRAGMA busy_timeout = 0;")
+    other.execute("BEGIN IMMEDIATE;")
+    delays = []
+    monkeypatch.setattr(db, "_sleep", delays.append)
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            item_service.update_item_fields(conn, 1, title="Never")
+        assert not conn.in_transaction
+    finally:
+        other.rollback()
+        other.close()
+        conn.close()
+
+    fn = "item_service.update_item_fields"
+    assert len(delays) == db.BUSY_RETRY_ATTEMPTS - 1
+    for attempt, delay in enumerate(delays):
+        ceiling = db.BUSY_RETRY_BASE_DELAY * 2**attempt
+        assert ceiling / 2 <= delay <= ceiling
+    assert registry.value(metrics.DB_BUSY_RETRIES, function=fn) == db.BUSY_RETRY_ATTEMPTS - 1
+    assert registry.value(metrics.DB_BUSY_EXHAUSTED, function=fn) == 1
@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, migrations, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import day_service
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "ranges.db"))
+    init_schema(conn)
+    spring = trip_repository.create_trip(conn, "Spring")
+    summer = trip_repository.create_trip(conn, "Summer")
+    for date in ("2026-02-28", "2026-03-01", "2026-04-15"):
+        day_repository.create_day(conn, spring, date)
+    for date in ("2026-03-01", "2026-05-31", "2026-06-01"):
+        day_repository.create_day(conn, summer, date)
+    yield conn
+    conn.close()
+
+
+def _pairs(days):
+    return [(d["trip_id"], d["date"]) for d in days]
+
+
+def test_range_across_trips_is_inclusive_and_ordered(conn):
+    days = day_service.list_days_in_range(conn, "2026-03-01", "2026-05-31")
+    assert _pairs(days) == [(1, "2026-03-01"), (2, "2026-03-01"), (1, "2026-04-15"), (2, "2026-05-31")]
+
+    one_trip = day_service.list_days_in_range(conn, "2026-01-01", "2026-12-31", trip_id=1)
+    assert _pairs(one_trip) == [(1, "2026-02-28"), (1, "2026-03-01"), (1, "2026-04-15")]
+
+
+def test_day_num_follows_date_updates(conn):
+    day_service.set_day_date(conn, 3, "2026-07-04")
+    day_service.shift_trip_days(conn, 2, 1)
+
+    days = day_service.list_days_in_range(conn, "2026-06-01", "2026-07-31")
+    assert _pairs(days) == [(2, "2026-06-01"), (2, "2026-06-02"), (1, "2026-07-04")]
+    with pytest.raises(ValidationError):
+        day_service.list_days_in_range(conn, "2026-07-31", "2026-06-01")
+
+
+def test_migration_adds_day_num_to_existing_database(tmp_path):
+    path = str(tmp_path / "old.db")
+    raw = sqlite3.connect(path)
+    raw.execute("CREATE TABLE trips (id INTEGER PRIMARY KEY, name TEXT NOT NULL);")
+    raw.execute(
+        "CREATE TABLE days (id INTEGER PRIMARY KEY, trip_id INTEGER NOT NULL, date TEXT NOT NULL, "
+        "UNIQUE (trip_id, date), FOREIGN KEY (trip_id) REFERENCES trips(id) ON DELETE CASCADE);"
+    )
+    raw.execute("INSERT INTO trips (id, name) VALUES (1, 'Old');")
+    raw.execute("INSERT INTO days (trip_id, date) VALUES (1, '2025-12-31'), (1, '2026-01-01');")
+    raw.execute("PRAGMA user_version = 0;")
+    raw.commit()
+    raw.close()
+
+    conn = connect(path)
+    init_schema(conn)
+
+    assert migrations.get_user_version(conn) == migrations.SCHEMA_VERSION
+    assert _pairs(day_service.list_days_in_range(conn, "2026-01-01", "2026-01-01")) == [(1, "2026-01-01")]
+    indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index';")}
+    assert {"idx_days_day_num", "idx_days_trip_day_num"} <= indexes
+    conn.close()
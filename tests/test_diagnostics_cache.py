@@ -0,0 +1,60 @@
+import pytest
+
+from travel_planner.persistence import day_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import diagnostics_service, item_service
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "diag.db"))
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Vienna")
+    for date in ("2026-03-01", "2026-03-02"):
+        day_id = day_repository.create_day(conn, trip_id, date)
+        item_service.create_item_scheduled(conn, day_id, "Opera", "activity", 1140, 1320)
+        item_service.create_item_scheduled(
+            conn, day_id, "Dinner", "food", 1260, 1350, reject_overlaps=False
+        )
+    yield conn
+    conn.close()
+
+
+def _overlaps(results):
+    return {r["day_id"]: [(o["item_a_id"], o["item_b_id"]) for o in r["overlaps"]] for r in results}
+
+
+def test_second_run_is_served_from_cache(conn):
+    first, stats = diagnostics_service.check_days(conn, trip_id=1)
+    assert (stats["hits"], stats["misses"]) == (0, 2)
+    assert _overlaps(first) == {1: [(1, 2)], 2: [(3, 4)]}
+
+    second, stats = diagnostics_service.check_days(conn, trip_id=1)
+    assert (stats["hits"], stats["misses"]) == (2, 0)
+    assert second == first
+
+    # Each buffer is cached separately.
+    _, stats = diagnostics_service.check_days(conn, trip_id=1, buffer_min=60)
+    assert stats["misses"] == 2
+
+
+def test_item_changes_bump_only_their_day(conn):
+    diagnostics_service.check_days(conn, trip_id=1)
+
+    item_service.set_item_time(conn, 2, 1320, 1380)
+    results, stats = diagnostics_service.check_days(conn, trip_id=1)
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert _overlaps(results) == {1: [], 2: [(3, 4)]}
+
+    # Pinning changes which item of a pair is reported first.
+    item_service.update_item_fields(conn, 4, pinned=True)
+    results, stats = diagnostics_service.check_days(conn, trip_id=1)
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert _overlaps(results)[2] == [(4, 3)]
+
+    # Fields the checks never look at keep the cache.
+    item_service.update_item_fields(conn, 3, title="Staatsoper", notes="Box 4")
+    _, stats = diagnostics_service.check_days(conn, trip_id=1)
+    assert stats["misses"] == 0
+
@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import item_service
+
+
+@pytest.fixture
+def day(tmp_path):
+    conn = connect(str(tmp_path / "move.db"))
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "T")
+    day_id = day_repository.create_day(conn, trip_id, "2026-07-01")
+    ids = [item_repository.create_item_min(conn, day_id, t, "misc") for t in "ABCD"]
+    yield conn, day_id, ids
+    conn.close()
+
+
+def _order(conn, day_id):
+    return [it["title"] for it in item_repository.list_items_for_day(conn, day_id)]
+
+
+def test_move_is_a_single_row_update(day):
+    conn, day_id, (a, b, c, d) = day
+    before = conn.execute("SELECT MAX(seq) FROM change_log;").fetchone()[0]
+
+    item_service.move_item(conn, d, before_id=b)
+
+    assert _order(conn, day_id) == ["A", "D", "B", "C"]
+    changed = conn.execute(
+        "SELECT entity_id FROM change_log WHERE seq > ? AND entity = 'item';", (before,)
+    ).fetchall()
+    assert changed == [(d,)]
+
+
+def test_exhausted_gap_triggers_rebalance(day):
+    conn, day_id, (a, b, c, d) = day
+
+    # Repeatedly inserting right after A halves the same gap until it runs out.
+    for _ in range(12):
+        item_service.move_item(conn, c, after_id=a)
+        item_service.move_item(conn, d, after_id=a)
+
+    assert _order(conn, day_id) == ["A", "D", "C", "B"]
+    positions = [r[0] for r in conn.execute(
+        "SELECT position FROM items WHERE day_id = ? ORDER BY position;", (day_id,)
+    )]
+    assert len(set(positions)) == 4
+
+
+def test_legacy_rows_without_position_are_respaced_first(day):
+    conn, day_id, (a, b, c, d) = day
+    conn.execute("UPDATE items SET position = NULL WHERE day_id = ?;", (day_id,))
+    conn.commit()
+
+    item_service.move_item(conn, a, after_id=d)
+
+    assert _order(conn, day_id) == ["B", "C", "D", "A"]
+
+
+def test_scheduled_items_cannot_be_moved(day):
+    conn, day_id, (a, b, c, d) = day
+    item_service.set_item_time(conn, a, 600, 660)
+
+    with pytest.raises(ValidationError):
+        item_service.move_item(conn, a, before_id=b)
+
+
+def test_respace_and_move_commit_together(day):
+    conn, day_id, (a, b, c, d) = day
+    conn.execute("UPDATE items SET position = NULL WHERE day_id = ?;", (day_id,))
+    # Respacing writes POSITION_GAP multiples; fail the midpoint write that follows it.
+    conn.execute(
+        "CREATE TEMP TRIGGER fail_move BEFORE UPDATE OF position ON items "
+        "WHEN NEW.position % 1024 != 0 BEGIN SELECT RAISE(ABORT, 'move failed'); END;"
+    )
+    conn.commit()
+
+    with pytest.raises(sqlite3.IntegrityError, match="move failed"):
+        item_service.move_item(conn, d, before_id=b)
+
+    assert not conn.in_transaction
+    positions = conn.execute("SELECT position FROM items WHERE day_id = ?;", (day_id,)).fetchall()
+    assert positions == [(None,)] * 4
+    assert _order(conn, day_id) == ["A", "B", "C", "D"]
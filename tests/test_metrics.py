@@ -0,0 +1,64 @@
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.observability import metrics
+from travel_planner.persistence.db import MeteredConnection, connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import day_service, item_service, trip_service
+
+
+@pytest.fixture
+def registry():
+    reg = metrics.enable_metrics()
+    yield reg
+    metrics.disable_metrics()
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = metrics.MetricsRegistry()
+    reg.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        reg.observe("latency_seconds", value, route="a")
+
+    text = reg.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="a"} 3' in text
+
+
+def test_services_and_connection_feed_registry(registry, tmp_path):
+    conn = connect(str(tmp_path / "metrics.db"))
+    assert isinstance(conn, MeteredConnection)
+    init_schema(conn)
+    commits_before = registry.value(metrics.DB_COMMITS)
+    try:
+        trip_id = trip_service.create_trip(conn, "Kyoto")
+        day_id = day_service.create_day(conn, trip_id, "2026-04-01")
+        item_service.create_item_scheduled(conn, day_id, "Temple", "activity", 540, 600)
+        with pytest.raises(ValidationError):
+            item_service.create_item_scheduled(conn, day_id, "Garden", "activity", 570, 630)
+    finally:
+        conn.close()
+
+    fn = "item_service.create_item_scheduled"
+    assert registry.value(metrics.SERVICE_CALLS, function=fn, outcome="ok") == 1
+    assert registry.value(metrics.SERVICE_CALLS, function=fn, outcome="validation_error") == 1
+    assert registry.value(metrics.SERVICE_DURATION, function=fn) == 2
+    assert registry.value(metrics.OVERLAP_REJECTIONS, operation="create") == 1
+    assert registry.value(metrics.DB_COMMITS) - commits_before == 3
+    assert registry.value(metrics.DB_ROWS_READ) >= 1
+
+    out = tmp_path / "metrics.prom"
+    registry.write_textfile(str(out))
+    assert 'travel_planner_overlap_rejections_total{operation="create"} 1' in out.read_text()
+
+
+def test_connect_uses_plain_connection_when_metrics_disabled(tmp_path):
+    conn = connect(str(tmp_path / "plain.db"))
+    try:
+        assert type(conn) is not MeteredConnection
+    finally:
+        conn.close()
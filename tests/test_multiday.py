@@ -0,0 +1,102 @@
+import pytest
+
+from travel_planner.domain.timezones import utc_minutes
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, migrations, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import export_service, item_service, recurring_service
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "multiday.db"))
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Road trip")
+    for date in ("2026-05-01", "2026-05-02", "2026-05-03"):
+        day_repository.create_day(conn, trip_id, date)
+    yield conn
+    conn.close()
+
+
+def test_overnight_item_keeps_its_full_span(conn):
+    hotel = item_service.create_item_scheduled(conn, 1, "Hotel", "lodging", 1200, 600, end_days=2)
+
+    item = item_repository.get_item(conn, hotel)
+    assert (item["start_min"], item["end_min"], item["span_end_min"]) == (1200, 1440, 2 * 1440 + 600)
+    midnight = utc_minutes("2026-05-01", 0, None)
+    assert [(it["id"], it["start"] - midnight, it["end"] - midnight) for it in item_repository.iter_trip_timeline(conn, 1)] == [
+        (hotel, 1200, 3480)
+    ]
+    assert export_service.export_trip(conn, 1)["days"][0]["items"][0]["span_end_min"] == 3480
+
+    # Ending exactly at the next midnight is an ordinary item.
+    late = item_service.create_item_scheduled(conn, 3, "Concert", "activity", 1380, 0, end_days=1)
+    assert item_repository.get_item(conn, late)["span_end_min"] is None
+
+    with pytest.raises(ValidationError):
+        item_service.create_item_scheduled(conn, 1, "Bad", "other", 1440, 60, end_days=1)
+    with pytest.raises(ValidationError):
+        item_service.create_item_scheduled(conn, 1, "Bad", "other", 60, 30, end_days=-1)
+
+
+def test_overlaps_across_midnight_are_rejected(conn):
+    hotel = item_service.create_item_scheduled(conn, 1, "Hotel", "lodging", 1200, 600, end_days=1)
+
+    # Day 2 morning falls inside the stay.
+    with pytest.raises(ValidationError, match=f"id={hotel}"):
+        item_service.create_item_scheduled(conn, 2, "Breakfast", "food", 480, 540)
+    # An earlier start on day 1 running past the hotel check-in.
+    with pytest.raises(ValidationError, match=f"id={hotel}"):
+        item_service.create_item_scheduled(conn, 1, "Dinner", "food", 1140, 1260)
+
+    lunch = item_service.create_item_scheduled(conn, 3, "Lunch", "food", 720, 780)
+    # A new overnight item reaching into a later day's items.
+    with pytest.raises(ValidationError, match=f"id={lunch}"):
+        item_service.create_item_scheduled(conn, 2, "Night bus", "transport", 1320, 750, end_days=1)
+    item_service.create_item_scheduled(conn, 2, "Night bus", "transport", 1320, 690, end_days=1)
+
+    breakfast = item_service.create_item_scheduled(conn, 2, "Breakfast", "food", 480, 540, reject_overlaps=False)
+    with pytest.raises(ValidationError, match=f"^scheduled item overlaps existing item id={hotel} "):
+        item_service.set_item_time(conn, breakfast, 540, 570)
+    item_service.set_item_time(conn, breakfast, 600, 660)
+
+
+def test_timeline_check_sees_the_whole_trip(conn):
+    hotel = item_service.create_item_scheduled(conn, 1, "Hotel", "lodging", 1200, 600, end_days=1)
+    breakfast = item_service.create_item_scheduled(conn, 2, "Breakfast", "food", 480, 540, reject_overlaps=False)
+    train = item_service.create_item_scheduled(conn, 2, "Train", "transport", 610, 700)
+    rule = recurring_service.add_recurring_item(conn, 1, "Walk", "activity", start_min=705, end_min=720)
+
+    # Per-day checks only see each day on its own.
+    assert item_service.check_overlaps_for_day(conn, 2) == []
+
+    result = item_service.check_trip_timeline(conn, 1, buffer_min=15)
+    assert result["overlaps"] == [{"item_a_id": hotel, "item_b_id": breakfast, "overlap_min": 60}]
+    assert [(t["prev_item_id"], t["next_item_id"], t["gap_min"]) for t in result["tight_connections"]] == [
+        (hotel, breakfast, -120),
+        (train, f"r{rule}", 5),
+    ]
+
+    with pytest.raises(ValidationError):
+        item_service.check_trip_timeline(conn, 1, buffer_min=-1)
+
+
+def test_migration_adds_span_end_min(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = connect(path)
+    init_schema(conn)
+    conn.execute("DROP INDEX idx_items_day_scheduled;")
+    conn.execute("DROP INDEX idx_items_day_utc;")
+    conn.execute("DROP INDEX idx_items_day_list_order;")
+    conn.execute("ALTER TABLE items DROP COLUMN span_end_min;")
+    conn.execute("PRAGMA user_version = 0;")
+    conn.commit()
+    conn.close()
+
+    conn = connect(path)
+    init_schema(conn)
+    assert migrations.get_user_version(conn) == migrations.SCHEMA_VERSION
+    assert "span_end_min" in {r[1] for r in conn.execute("PRAGMA table_info(items);")}
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_items_day_utc';").fetchone() is not None
+    conn.close()
@@ -0,0 +1,73 @@
+import io
+
+import pytest
+
+from travel_planner.observability.profiler import ProfiledConnection, Profiler
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import day_service, item_service, trip_service
+
+
+@pytest.fixture
+def profiled_conn(tmp_path):
+    conn = connect(str(tmp_path / "prof.db"), factory=ProfiledConnection)
+    init_schema(conn)
+    yield conn
+    conn.close()
+
+
+def test_profiler_counts_statements_and_service_calls(profiled_conn, tmp_path):
+    slow_log = tmp_path / "slow.log"
+    profiler = Profiler(slow_log_path=str(slow_log), slow_ms=0.0)
+    profiler.start()
+    profiler.attach(profiled_conn)
+    try:
+        trip_id = trip_service.create_trip(profiled_conn, "Lisbon")
+        day_id = day_service.create_day(profiled_conn, trip_id, "2026-06-01")
+        for start in (540, 600, 660):
+            item_service.create_item_scheduled(profiled_conn, day_id, "Stop", "activity", start, start + 30)
+    finally:
+        profiler.stop()
+
+    calls = {name: stat.count for name, stat in profiler.services.items()}
+    assert calls["trip_service.create_trip"] == 1
+    assert calls["item_service.create_item_scheduled"] == 3
+
+    summary = profiler.summary()
+    _, frequent = summary["most_frequent"][0]
+    assert frequent.count >= 3
+    # Triggers and implicit BEGINs are only visible through the trace callback.
+    assert summary["sqlite_statements"] > summary["statements"]
+
+    # slow_ms=0 logs every statement with its bound parameters expanded.
+    assert "'Lisbon'" in slow_log.read_text()
+
+    out = io.StringIO()
+    profiler.print_summary(out)
+    assert "item_service.create_item_scheduled" in out.getvalue()
+
+
+def test_profiled_decorator_is_inert_without_active_profiler(profiled_conn):
+    trip_id = trip_service.create_trip(profiled_conn, "Porto")
+    assert trip_id > 0
+
+
+def test_bulk_commands_do_not_grow_the_statement_tables(profiled_conn):
+    profiler = Profiler()
+    profiler.start()
+    profiler.attach(profiled_conn)
+    try:
+        trip_id = trip_service.create_trip(profiled_conn, "Rome")
+        day_id = day_service.create_day(profiled_conn, trip_id, "2026-06-01")
+        for n in range(50):
+            item_service.create_item_min(profiled_conn, day_id, f"Stop {n}", "activity")
+        tables = len(profiler.statements)
+        for n in range(50):
+            item_service.create_item_min(profiled_conn, day_id, f"Extra {n}", "activity")
+    finally:
+        profiler.stop()
+
+    assert len(profiler.statements) == tables
+    assert profiler.summary()["sqlite_statements"] > 100
+    for stat in profiler.statements.values():
+        assert stat.max <= stat.total
@@ -0,0 +1,266 @@
+import inspect
+import io
+import re
+
+import pytest
+
+from travel_planner.persistence import (
+    agenda_repository,
+    archive_repository,
+    change_log_repository,
+    day_repository,
+    diagnostics_repository,
+    item_repository,
+    migrations,
+    recurring_repository,
+    snapshot_repository,
+    stats_repository,
+    trip_repository,
+)
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import diagnostics_service, export_service, item_service
+
+REPOSITORIES = (
+    trip_repository,
+    day_repository,
+    item_repository,
+    diagnostics_repository,
+    change_log_repository,
+    archive_repository,
+    snapshot_repository,
+    agenda_repository,
+    stats_repository,
+    recurring_repository,
+)
+
+# Plans that are full scans or temp sorts by design. Keyed on a fragment of
+# the normalized SQL; every entry needs a reason.
+ALLOWED = {
+    "FROM trips ORDER BY id ASC": "list_trips returns every trip",
+    "LEFT JOIN day_diagnostics AS dd ON dd.day_id = d.id AND dd.buffer_min = 15 ORDER BY": (
+        "check --all visits every day, in index order"
+    ),
+    "WITH latest AS": "change feed groups and sorts only the changes in the requested seq window",
+    "FROM archive.trips AS t LEFT JOIN": "list_archived_trips returns every archived trip",
+    "main.sqlite_sequence": "one row per AUTOINCREMENT table, and SQLite gives it no index",
+    "FROM days AS d JOIN items AS i ON i.day_id = d.id JOIN trips AS t": (
+        "agenda sorts only one date's items at a time (the right part of the ORDER BY)"
+    ),
+    "WITH sched AS": "stats aggregate every scheduled item in scope, sorted per day for the overlap window",
+    "GROUP BY i.day_id, i.currency": "stats group every costed item in scope",
+    "GROUP BY i.category, i.currency": "stats group every item in scope",
+    "ORDER BY i.start_utc ASC, i.id ASC": "trip timeline sorts only the trip's scheduled items by UTC instant",
+}
+
+_VERBS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def _run_all_repository_calls(conn, archive_path):
+    """
+    Call every public repository function (plus the services that issue their own SQL).
+
+    Returns the set of repository functions that were called.
+    """
+    called = set()
+
+    def call(fn, *args, **kwargs):
+        called.add(fn)
+        result = fn(*args, **kwargs)
+        return list(result) if inspect.isgenerator(result) else result
+
+    trip_id = call(trip_repository.create_trip, conn, "Plans")
+    call(trip_repository.get_trip, conn, trip_id)
+    call(trip_repository.list_trips, conn)
+    call(trip_repository.rename_trip, conn, trip_id, "Plans 2")
+
+    day_id = call(day_repository.create_day, conn, trip_id, "2026-03-01")
+    other_day = call(day_repository.create_day, conn, trip_id, "2026-03-02")
+    call(day_repository.get_day, conn, day_id)
+    call(day_repository.list_days_for_trip, conn, trip_id)
+    call(day_repository.list_days_in_range, conn, "2026-02-01", "2026-03-31")
+    call(day_repository.list_days_in_range, conn, "2026-02-01", "2026-03-31", trip_id=trip_id)
+    call(day_repository.update_day_date, conn, other_day, "2026-03-03")
+    call(day_repository.shift_trip_days, conn, trip_id, 1)
+    call(day_repository.shift_trip_days, conn, trip_id, -1)
+
+    rule_id = call(
+        recurring_repository.create_rule, conn, trip_id, "Call", "other",
+        start_min=480, end_min=500, interval_days=2, from_date="2026-03-01",
+    )
+    call(recurring_repository.create_rule, conn, trip_id, "Breakfast", "food", start_min=420, end_min=450)
+    call(recurring_repository.add_skip, conn, rule_id, other_day)
+    call(recurring_repository.get_rule, conn, rule_id)
+    call(recurring_repository.list_rules_for_trip, conn, trip_id)
+    occurrences = call(recurring_repository.list_occurrences_for_day, conn, day_id)
+    call(recurring_repository.merge_occurrences, [], occurrences, key=lambda r: r["start_min"], fields=["id", "start_min"])
+    call(recurring_repository.occurrence_id, rule_id)
+
+    item_id = call(item_repository.create_item_scheduled, conn, day_id, "A", "activity", 60, 120)
+    loose_id = call(item_repository.create_item_min, conn, day_id, "B", "food")
+    call(item_repository.get_item, conn, item_id)
+    call(item_repository.list_items_for_day, conn, day_id)
+    call(item_repository.iter_items_for_day, conn, day_id)
+    call(item_repository.get_day_items_version, conn, day_id)
+    call(item_repository.list_scheduled_for_day, conn, day_id)
+    call(item_repository.find_overlapping_item, conn, day_id, 90, 150, exclude_item_id=item_id)
+    call(item_repository.find_overlapping_item, conn, day_id, 90, 1600, tz="Asia/Tokyo", exclude_item_id=item_id)
+    call(item_repository.iter_trip_timeline, conn, trip_id)
+    call(recurring_repository.list_trip_occurrences, conn, trip_id)
+    call(item_repository.update_item_fields, conn, item_id, title="A2", pinned=1)
+    call(item_repository.update_item_time, conn, item_id, 30, 50)
+    call(item_repository.update_item_timezone, conn, item_id, "Europe/Paris")
+    call(item_repository.update_item, conn, item_id, {"notes": "n", "start_min": 40}, expected_updated_at="x")
+    call(item_repository.refresh_utc_instants, conn, day_id=day_id)
+    call(item_repository.refresh_utc_instants, conn, trip_id=trip_id)
+    call(item_repository.clear_item_time, conn, loose_id)
+    call(item_repository.day_has_unpositioned_items, conn, day_id)
+    call(item_repository.get_adjacent_position, conn, day_id, 2048, direction="before", exclude_item_id=loose_id)
+    call(item_repository.get_adjacent_position, conn, day_id, 1024, direction="after")
+    call(item_repository.move_item_position, conn, loose_id, item_id, direction="before")
+    call(item_repository.rebalance_positions, conn, day_id)
+
+    call(diagnostics_repository.list_day_stamps, conn, 15, trip_id=trip_id)
+    call(diagnostics_repository.list_day_stamps, conn, 15)
+    call(diagnostics_repository.get_day_stamp, conn, day_id)
+    call(diagnostics_repository.save_day_diagnostics, conn, 15, [(day_id, 1, "[]", "[]")])
+
+    max_seq = call(change_log_repository.get_max_seq, conn)
+    call(change_log_repository.iter_changed_rows, conn, "item", 0, max_seq)
+
+    first = call(agenda_repository.iter_agenda, conn, "2026-03-01", "2026-03-31", limit=1)
+    call(agenda_repository.iter_agenda, conn, "2026-03-01", "2026-03-31", after=call(agenda_repository.agenda_key, first[0]))
+
+    call(stats_repository.get_change_mark, conn)
+    for scope in ({"trip_id": trip_id}, {}):
+        call(stats_repository.iter_day_stats, conn, **scope)
+        call(stats_repository.list_day_spend, conn, **scope)
+        call(stats_repository.list_category_stats, conn, **scope)
+
+    item_service.create_item_scheduled(conn, day_id, "C", "activity", 200, 260)
+    item_service.check_overlaps_for_day(conn, day_id)
+    diagnostics_service.check_days(conn, trip_id=trip_id)
+    export_service.export_trip(conn, trip_id)
+    export_service.write_changes_ndjson(conn, 0, io.StringIO())
+
+    call(trip_repository.clone_trip, conn, trip_id, "Plans copy", 7)
+
+    columns = [name for name, _ in call(snapshot_repository.get_item_columns, conn)]
+    batches = call(snapshot_repository.iter_item_rows_for_days, conn, [day_id, other_day], columns)
+    rule_columns = [name for name, _ in call(snapshot_repository.get_rule_columns, conn)]
+    rules = call(snapshot_repository.list_rule_rows, conn, trip_id, rule_columns)
+    call(snapshot_repository.list_skip_rows, conn, trip_id)
+    call(
+        snapshot_repository.insert_trip_rows, conn, "Copy", ["2026-03-01", "2026-03-03"], columns, batches,
+        rule_columns=rule_columns, rules=[row[1:] for row in rules], skips=[(0, 1)],
+    )
+
+    call(archive_repository.init_archive, archive_path)
+    call(archive_repository.attach_archive, conn, archive_path)
+    call(archive_repository.is_attached, conn)
+    call(archive_repository.archive_trips_before, conn, "2026-04-01")
+    call(archive_repository.list_archived_trips, conn)
+    export_service.export_trip(conn, trip_id, schema=archive_repository.ARCHIVE_SCHEMA)
+    call(archive_repository.unarchive_trip, conn, trip_id)
+    call(archive_repository.detach_archive, conn)
+
+    call(recurring_repository.remove_skip, conn, rule_id, other_day)
+    call(recurring_repository.delete_rule, conn, rule_id)
+    call(change_log_repository.compact, conn, through_seq=1)
+    call(item_repository.delete_item, conn, loose_id)
+    call(day_repository.delete_day, conn, other_day)
+    call(trip_repository.delete_trip, conn, trip_id)
+    return called
+
+
+@pytest.fixture
+def captured(tmp_path):
+    conn = connect(str(tmp_path / "plans.db"))
+    init_schema(conn)
+
+    statements: dict[str, None] = {}
+
+    def trace(sql):
+        key = " ".join(sql.split())
+        if key.split(" ", 1)[0].upper() in _VERBS:
+            statements.setdefault(key, None)
+
+    conn.set_trace_callback(trace)
+    archive_path = str(tmp_path / "plans.archive.db")
+    called = _run_all_repository_calls(conn, archive_path)
+    conn.set_trace_callback(None)
+    # EXPLAIN needs the archive schema (and the move's temp table) back in place.
+    archive_repository.attach_archive(conn, archive_path)
+
+    yield conn, list(statements), called
+    conn.close()
+
+
+def test_every_repository_function_is_exercised(captured):
+    _, _, called = captured
+    public = {
+        fn
+        for module in REPOSITORIES
+        for name, fn in inspect.getmembers(module, inspect.isfunction)
+        if fn.__module__ == module.__name__ and not name.startswith("_")
+    }
+    missing = sorted(fn.__qualname__ for fn in public - called)
+    assert not missing, f"add these to _run_all_repository_calls: {missing}"
+
+
+def test_repository_queries_avoid_full_scans_and_temp_sorts(captured):
+    conn, statements, _ = captured
+    assert statements
+
+    problems = []
+    for sql in statements:
+        if any(fragment in sql for fragment in ALLOWED):
+            continue
+        ctes = set(re.findall(r"\b(\w+) AS \(", sql))
+        for row in conn.execute("EXPLAIN QUERY PLAN " + sql):
+            detail = row[3]
+            scan = re.match(r"SCAN ([\w.]+)", detail)
+            # CTEs, temp batch tables and constant rows are the driving set, not a table scan.
+            if scan and scan.group(1) not in ctes and scan.group(1) != "CONSTANT" and not scan.group(1).startswith("temp."):
+                problems.append(f"{detail}\n    {sql}")
+            elif "TEMP B-TREE" in detail:
+                problems.append(f"{detail}\n    {sql}")
+
+    assert not problems, "\n".join(problems)
+
+
+def test_conflict_queries_are_index_only(captured):
+    conn, statements, _ = captured
+    conflict = [s for s in statements if s.startswith("SELECT id, start_min, end_min") and " FROM items " in s]
+    assert conflict
+    for sql in conflict:
+        details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        assert details == ["SEARCH items USING COVERING INDEX idx_items_day_scheduled (day_id=?)"]
+
+
+def test_day_listing_is_index_only(captured):
+    conn, statements, _ = captured
+    listing = [s for s in statements if s.startswith("SELECT id, day_id, title, category, start_min") and "FROM items" in s]
+    assert listing
+    for sql in listing:
+        details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        assert details == ["SEARCH items USING COVERING INDEX idx_items_day_list_order (day_id=?)"]
+
+
+def test_migration_drops_superseded_indexes(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = connect(path)
+    init_schema(conn)
+    conn.execute("PRAGMA user_version = 0;")
+    conn.execute("CREATE INDEX idx_items_day ON items (day_id);")
+    conn.execute("CREATE INDEX idx_items_day_time ON items (day_id, start_min, end_min);")
+    conn.commit()
+
+    init_schema(conn)
+
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index';")}
+    assert "idx_items_day" not in names
+    assert "idx_items_day_time" not in names
+    assert "idx_items_day_list_order" in names
+    assert migrations.get_user_version(conn) == migrations.SCHEMA_VERSION
+    conn.close()
@@ -0,0 +1,100 @@
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import (
+    archive_service,
+    day_service,
+    diagnostics_service,
+    export_service,
+    item_service,
+    recurring_service,
+    trip_service,
+)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "recurring.db"))
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Tour")
+    for date in ("2026-07-01", "2026-07-02", "2026-07-03", "2026-07-04"):
+        day_repository.create_day(conn, trip_id, date)
+    item_repository.create_item_scheduled(conn, 1, "Museum", "activity", 600, 720)
+    item_repository.create_item_min(conn, 1, "Postcards", "other")
+    yield conn
+    conn.close()
+
+
+def _titles(conn, day_id):
+    return [it["title"] for it in item_repository.list_items_for_day(conn, day_id)]
+
+
+def test_rules_expand_into_day_listings(conn):
+    breakfast = recurring_service.add_recurring_item(conn, 1, "Breakfast", "food", start_min=450, end_min=495)
+    recurring_service.add_recurring_item(
+        conn, 1, "Check-in call", "other", every_days=2, from_date="2026-07-01", until_date="2026-07-03"
+    )
+    recurring_service.set_occurrence_skipped(conn, breakfast, 3)
+
+    day1 = item_repository.list_items_for_day(conn, 1)
+    assert [it["title"] for it in day1] == ["Breakfast", "Museum", "Postcards", "Check-in call"]
+    assert day1[0]["id"] == f"r{breakfast}"
+    assert day1[0]["recurring_id"] == breakfast
+    assert _titles(conn, 2) == ["Breakfast"]
+    assert _titles(conn, 3) == ["Check-in call"]
+    assert _titles(conn, 4) == ["Breakfast"]
+    # Stored once, not per day.
+    assert conn.execute("SELECT COUNT(*) FROM items;").fetchone()[0] == 2
+
+    recurring_service.set_occurrence_skipped(conn, breakfast, 3, skipped=False)
+    assert _titles(conn, 3) == ["Breakfast", "Check-in call"]
+
+    exported = export_service.export_trip(conn, 1)
+    assert [it["title"] for it in exported["days"][0]["items"]] == ["Breakfast", "Museum", "Postcards", "Check-in call"]
+
+    with pytest.raises(ValidationError):
+        recurring_service.add_recurring_item(conn, 1, "Laundry", "other", every_days=3)
+
+
+def test_occurrences_take_part_in_overlap_detection(conn):
+    results, _ = diagnostics_service.check_days(conn, trip_id=1)
+    assert all(not r["overlaps"] for r in results)
+
+    rule = recurring_service.add_recurring_item(conn, 1, "Briefing", "other", start_min=690, end_min=750)
+
+    with pytest.raises(ValidationError, match=f"r{rule}"):
+        item_service.create_item_scheduled(conn, 2, "Walk", "activity", 700, 800)
+
+    # Adding the rule invalidated every cached day of the trip.
+    results, stats = diagnostics_service.check_days(conn, trip_id=1)
+    assert stats["hits"] == 0
+    assert results[0]["overlaps"] == [{"item_a_id": 1, "item_b_id": f"r{rule}", "overlap_min": 30}]
+
+    recurring_service.set_occurrence_skipped(conn, rule, 1)
+    results, stats = diagnostics_service.check_days(conn, trip_id=1)
+    assert stats["misses"] == 1
+    assert results[0]["overlaps"] == []
+
+
+def test_rules_follow_shift_clone_and_archive(conn, tmp_path):
+    rule = recurring_service.add_recurring_item(
+        conn, 1, "Call", "other", start_min=480, end_min=500, every_days=2, from_date="2026-07-02"
+    )
+    recurring_service.set_occurrence_skipped(conn, rule, 4)
+    before = [_titles(conn, d) for d in (1, 2, 3, 4)]
+
+    day_service.shift_trip_days(conn, 1, 10)
+    assert [_titles(conn, d) for d in (1, 2, 3, 4)] == before
+
+    clone = trip_service.clone_trip(conn, 1, "Tour again", shift_days=7)
+    clone_days = [d["id"] for d in day_repository.list_days_for_trip(conn, clone["trip_id"])]
+    assert [_titles(conn, d) for d in clone_days] == before
+
+    archive_path = str(tmp_path / "recurring.archive.db")
+    archive_service.archive_trips(conn, archive_path, before="2026-07-20")
+    assert recurring_service.list_recurring_items(conn, 1) == []
+    archive_service.unarchive_trip(conn, archive_path, 1)
+    assert [_titles(conn, d) for d in (1, 2, 3, 4)] == before
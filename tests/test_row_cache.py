@@ -0,0 +1,141 @@
+import sqlite3
+
+import pytest
+
+from travel_planner.persistence import day_repository, item_repository, row_cache, trip_repository
+from travel_planner.persistence.db import ConnectionPool, connect
+from travel_planner.persistence.schema import init_schema
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "cache.db")
+    conn = connect(path)
+    init_schema(conn)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def conn(db_path):
+    c = connect(db_path)
+    cache = row_cache.enable_cache(c, max_entries=4)
+    yield c, cache
+    row_cache.disable_cache(c)
+    c.close()
+
+
+def test_get_item_hits_cache_on_repeat_reads(conn):
+    c, cache = conn
+    trip_id = trip_repository.create_trip(c, "T")
+    day_id = day_repository.create_day(c, trip_id, "2026-05-01")
+    item_id = item_repository.create_item_min(c, day_id, "Museum", "activity")
+
+    first = item_repository.get_item(c, item_id)
+    second = item_repository.get_item(c, item_id)
+
+    assert first == second
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cached_rows_are_copies(conn):
+    c, _ = conn
+    trip_id = trip_repository.create_trip(c, "T")
+
+    trip_repository.get_trip(c, trip_id)["name"] = "mutated"
+
+    assert trip_repository.get_trip(c, trip_id)["name"] == "T"
+
+
+def test_writes_invalidate_only_the_written_row(conn):
+    c, cache = conn
+    trip_id = trip_repository.create_trip(c, "T")
+    day_id = day_repository.create_day(c, trip_id, "2026-05-01")
+    a = item_repository.create_item_min(c, day_id, "A", "food")
+    b = item_repository.create_item_min(c, day_id, "B", "food")
+    item_repository.get_item(c, a)
+    item_repository.get_item(c, b)
+
+    item_repository.update_item_fields(c, a, title="A2")
+
+    assert item_repository.get_item(c, a)["title"] == "A2"
+    assert cache.get(("item", b)) is not None
+
+
+def test_delete_trip_drops_cascaded_days_and_items(conn):
+    c, cache = conn
+    trip_id = trip_repository.create_trip(c, "T")
+    day_id = day_repository.create_day(c, trip_id, "2026-05-01")
+    item_id = item_repository.create_item_min(c, day_id, "A", "food")
+    day_repository.get_day(c, day_id)
+    item_repository.get_item(c, item_id)
+
+    trip_repository.delete_trip(c, trip_id)
+
+    assert len(cache) == 0
+    assert day_repository.get_day(c, day_id) is None
+    assert item_repository.get_item(c, item_id) is None
+
+
+def test_lru_evicts_oldest_entry(conn):
+    c, cache = conn
+    ids = [trip_repository.create_trip(c, f"T{i}") for i in range(5)]
+    for trip_id in ids:
+        trip_repository.get_trip(c, trip_id)
+
+    assert len(cache) == 4
+    assert cache.evictions == 1
+    assert cache.get(("trip", ids[0])) is None
+
+
+def test_write_from_another_connection_resets_cache(conn, db_path):
+    c, cache = conn
+    trip_id = trip_repository.create_trip(c, "T")
+    trip_repository.get_trip(c, trip_id)
+
+    other = sqlite3.connect(db_path)
+    other.execute("UPDATE trips SET name = 'Renamed' WHERE id = ?;", (trip_id,))
+    other.commit()
+    other.close()
+
+    # Noticed at the start of the next unit of work, not mid-way through this one.
+    assert trip_repository.get_trip(c, trip_id)["name"] == "T"
+    row_cache.expire(c)
+    assert trip_repository.get_trip(c, trip_id)["name"] == "Renamed"
+    assert cache.external_resets == 1
+
+
+def test_hits_do_not_check_data_version_each_time(conn):
+    c, cache = conn
+    trip_id = trip_repository.create_trip(c, "T")
+    trip_repository.get_trip(c, trip_id)
+
+    statements = []
+    c.set_trace_callback(statements.append)
+    for _ in range(3):
+        trip_repository.get_trip(c, trip_id)
+    row_cache.expire(c)
+    trip_repository.get_trip(c, trip_id)
+    c.set_trace_callback(None)
+
+    assert cache.hits == 4
+    assert statements == ["PRAGMA data_version;"]
+
+
+def test_pool_checkout_rechecks_data_version(db_path):
+    pool = ConnectionPool(db_path, max_size=1, on_connect=lambda c: row_cache.enable_cache(c))
+    try:
+        with pool.connection() as c:
+            trip_id = trip_repository.create_trip(c, "T")
+            trip_repository.get_trip(c, trip_id)
+
+        other = sqlite3.connect(db_path)
+        other.execute("UPDATE trips SET name = 'Renamed' WHERE id = ?;", (trip_id,))
+        other.commit()
+        other.close()
+
+        with pool.connection() as c:
+            assert trip_repository.get_trip(c, trip_id)["name"] == "Renamed"
+    finally:
+        pool.close()
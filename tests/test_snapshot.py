@@ -0,0 +1,119 @@
+import io
+import struct
+
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, recurring_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import snapshot_service
+from travel_planner.services.snapshot_format import FORMAT_VERSION, MAGIC, TABLE_DAYS, TABLE_ITEMS, SnapshotWriter
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "snap.db"))
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Lisbon")
+    for date in ("2026-06-01", "2026-06-02"):
+        day_id = day_repository.create_day(conn, trip_id, date)
+        for n in range(3):
+            item_id = item_repository.create_item_scheduled(conn, day_id, f"Stop {n}", "food", 60 * n, 60 * n + 30)
+            item_repository.update_item_fields(conn, item_id, tags="cafe,tram", notes="EUR")
+        conn.execute("UPDATE items SET estimated_cost = 12.5, lat = 38.7;")
+        conn.commit()
+        item_repository.create_item_min(conn, day_id, "Maybe: Sintra", "activity")
+    yield conn
+    conn.close()
+
+
+def _trip_rows(conn, trip_id):
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(items);") if r[1] not in ("id", "day_id")]
+    select = ", ".join(f"i.{c}" for c in cols)
+    return conn.execute(
+        f"""
+        SELECT d.date, {select} FROM items AS i JOIN days AS d ON d.id = i.day_id
+        WHERE d.trip_id = ? ORDER BY d.date, i.position, i.id;
+        """,
+        (trip_id,),
+    ).fetchall()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip_copies_every_column(conn, compress):
+    buf = io.BytesIO()
+    counts = snapshot_service.snapshot_trip(conn, 1, buf, compress=compress)
+    assert counts == {"days": 2, "items": 8}
+
+    buf.seek(0)
+    result = snapshot_service.restore_trip(conn, buf, name="Lisbon again")
+
+    assert result == {"trip_id": 2, "days": 2, "items": 8}
+    assert trip_repository.get_trip(conn, 2)["name"] == "Lisbon again"
+    assert _trip_rows(conn, 2) == _trip_rows(conn, 1)
+
+
+def test_repeated_strings_are_stored_once(conn):
+    buf = io.BytesIO()
+    snapshot_service.snapshot_trip(conn, 1, buf)
+    assert buf.getvalue().count(b"cafe,tram") == 1
+    assert buf.getvalue().count(b"food") == 1
+
+
+def test_bad_snapshots_insert_nothing(conn):
+    buf = io.BytesIO()
+    snapshot_service.snapshot_trip(conn, 1, buf)
+    data = buf.getvalue()
+
+    with pytest.raises(ValidationError, match="truncated"):
+        snapshot_service.restore_trip(conn, io.BytesIO(data[:-20]))
+    newer = struct.pack("<6sHH", MAGIC, FORMAT_VERSION + 1, 0) + data[10:]
+    with pytest.raises(ValidationError, match="newer"):
+        snapshot_service.restore_trip(conn, io.BytesIO(newer))
+
+    assert [t["id"] for t in trip_repository.list_trips(conn)] == [1]
+
+
+def test_round_trip_copies_recurring_rules_and_skips(conn):
+    rule_id = recurring_repository.create_rule(conn, 1, "Breakfast", "food", start_min=420, end_min=450)
+    recurring_repository.create_rule(conn, 1, "Call home", "other", interval_days=2, from_date="2026-06-01")
+    second_day = day_repository.list_days_for_trip(conn, 1)[1]["id"]
+    recurring_repository.add_skip(conn, rule_id, second_day)
+
+    buf = io.BytesIO()
+    snapshot_service.snapshot_trip(conn, 1, buf)
+    buf.seek(0)
+    trip_id = snapshot_service.restore_trip(conn, buf)["trip_id"]
+
+    def rules(trip):
+        return [
+            {k: v for k, v in r.items() if k not in ("id", "trip_id")}
+            for r in recurring_repository.list_rules_for_trip(conn, trip)
+        ]
+
+    def skipped(trip):
+        return [
+            (d["date"], [o["title"] for o in recurring_repository.list_occurrences_for_day(conn, d["id"])])
+            for d in day_repository.list_days_for_trip(conn, trip)
+        ]
+
+    assert rules(trip_id) == rules(1)
+    assert skipped(trip_id) == skipped(1) == [("2026-06-01", ["Breakfast", "Call home"]), ("2026-06-02", [])]
+
+
+def test_out_of_range_day_index_is_a_validation_error(conn):
+    buf = io.BytesIO()
+    writer = SnapshotWriter(buf)
+    writer.write_trip("Broken")
+    writer.declare_table(TABLE_DAYS, [("date", "s")])
+    writer.write_rows(TABLE_DAYS, [("2026-06-01",)])
+    writer.declare_table(TABLE_ITEMS, [("day_index", "i"), ("title", "s"), ("category", "s")])
+    writer.write_rows(TABLE_ITEMS, [(0, "Fine", "food"), (1, "Nowhere", "food")])
+    writer.close()
+    buf.seek(0)
+
+    with pytest.raises(ValidationError, match="day index out of range"):
+        snapshot_service.restore_trip(conn, buf)
+
+    assert [t["id"] for t in trip_repository.list_trips(conn)] == [1]
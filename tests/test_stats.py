@@ -0,0 +1,78 @@
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import stats_service
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "stats.db"))
+    init_schema(conn)
+    rome = trip_repository.create_trip(conn, "Rome")
+    oslo = trip_repository.create_trip(conn, "Oslo")
+    d1 = day_repository.create_day(conn, rome, "2026-05-01")
+    day_repository.create_day(conn, rome, "2026-05-02")
+    d3 = day_repository.create_day(conn, oslo, "2026-06-01")
+
+    museum = item_repository.create_item_scheduled(conn, d1, "Museum", "activity", 540, 660)
+    # Overlaps the museum by 30 minutes; busy time counts it once.
+    tour = item_repository.create_item_scheduled(conn, d1, "Tour", "activity", 630, 690)
+    dinner = item_repository.create_item_scheduled(conn, d1, "Dinner", "food", 1140, 1230)
+    item_repository.create_item_min(conn, d1, "Postcards", "other")
+    ferry = item_repository.create_item_scheduled(conn, d3, "Ferry", "transport", 480, 600)
+
+    costs = [(20.0, None, "EUR", museum), (None, 45.0, "EUR", dinner), (15.0, 12.5, "EUR", tour), (300.0, None, "NOK", ferry)]
+    conn.executemany(
+        "UPDATE items SET estimated_cost = ?, actual_cost = ?, currency = ? WHERE id = ?;", costs
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_trip_stats_per_day_and_category(conn):
+    stats = stats_service.trip_stats(conn, 1)
+
+    first, second = stats["days"]
+    assert (first["items"], first["scheduled"], first["scheduled_min"]) == (4, 3, 270)
+    assert (first["busy_min"], first["idle_min"]) == (240, 450)
+    assert first["spend"] == {"EUR": 77.5}
+    assert (second["items"], second["busy_min"], second["spend"]) == (0, 0, {})
+
+    assert stats["trip"]["days"] == 2
+    assert stats["trip"]["spend"] == {"EUR": 77.5}
+    by_cat = {c["category"]: c for c in stats["categories"]}
+    assert (by_cat["activity"]["items"], by_cat["activity"]["scheduled_min"]) == (2, 180)
+    assert by_cat["activity"]["spend"] == {"EUR": 32.5}
+    assert by_cat["other"]["spend"] == {}
+
+    with pytest.raises(ValidationError):
+        stats_service.trip_stats(conn, 99)
+
+
+def test_db_stats_totals_per_trip(conn):
+    stats = stats_service.db_stats(conn)
+
+    assert stats["totals"]["trips"] == 2
+    assert stats["totals"]["items"] == 5
+    assert stats["totals"]["spend"] == {"EUR": 77.5, "NOK": 300.0}
+    assert [(t["name"], t["busy_min"]) for t in stats["trips"]] == [("Rome", 240), ("Oslo", 120)]
+
+
+def test_cache_is_reused_until_data_changes(conn, tmp_path):
+    cache = str(tmp_path / "stats.json")
+
+    first = stats_service.db_stats(conn, cache_path=cache)
+    again = stats_service.db_stats(conn, cache_path=cache)
+    assert (first["cached"], again["cached"]) == (False, True)
+    assert again["totals"] == first["totals"]
+
+    item_repository.create_item_min(conn, 2, "Souvenirs", "other")
+    fresh = stats_service.db_stats(conn, cache_path=cache)
+    assert fresh["cached"] is False
+    assert fresh["totals"]["items"] == 6
+    # A different scope never reads the db-wide entry.
+    assert stats_service.trip_stats(conn, 1, cache_path=cache)["cached"] is False
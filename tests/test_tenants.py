@@ -0,0 +1,69 @@
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import trip_repository
+from travel_planner.persistence.tenants import TenantRouter
+from travel_planner.services import tenant_service, trip_service
+
+
+def test_tenants_get_separate_databases(tmp_path):
+    router = TenantRouter(str(tmp_path))
+    try:
+        with tenant_service.tenant_connection(router, "acme") as conn:
+            trip_service.create_trip(conn, "Acme offsite")
+        with tenant_service.tenant_connection(router, "globex") as conn:
+            assert trip_repository.list_trips(conn) == []
+        assert router.list_tenants() == ["acme", "globex"]
+
+        with pytest.raises(ValidationError):
+            with tenant_service.tenant_connection(router, "../etc"):
+                pass
+    finally:
+        router.close()
+
+
+def test_lru_bound_and_idle_eviction(tmp_path):
+    router = TenantRouter(str(tmp_path), max_open=2, idle_timeout=60.0)
+    try:
+        for tenant_id in ("a", "b", "a", "c"):
+            with router.connection(tenant_id):
+                pass
+        # "b" was least recently used when "c" pushed the LRU over its bound.
+        assert router.open_tenants() == ["a", "c"]
+
+        router.idle_timeout = 0.0
+        assert router.evict_idle() == 2
+        assert router.open_tenants() == []
+    finally:
+        router.close()
+
+
+def test_writer_in_one_tenant_does_not_block_another(tmp_path):
+    router = TenantRouter(str(tmp_path), pool_size=2)
+    try:
+        with router.connection("a") as writer_a, router.connection("b") as writer_b:
+            writer_a.execute("PRAGMA busy_timeout = 0;")
+            writer_b.execute("PRAGMA busy_timeout = 0;")
+            writer_a.execute("BEGIN IMMEDIATE;")
+            trip_repository.create_trip(writer_b, "Unblocked")
+            writer_a.rollback()
+            assert [t["name"] for t in trip_repository.list_trips(writer_b)] == ["Unblocked"]
+    finally:
+        router.close()
+
+
+def test_maintain_runs_every_tenant_in_parallel(tmp_path):
+    router = TenantRouter(str(tmp_path), max_open=8)
+    try:
+        for tenant_id in ("t1", "t2", "t3"):
+            with router.connection(tenant_id) as conn:
+                trip_service.create_trip(conn, tenant_id)
+        (tmp_path / "broken.db").write_bytes(b"not a database" * 100)
+
+        results = {r["tenant"]: r for r in tenant_service.maintain_tenants(router, workers=3)}
+
+        assert set(results) == {"broken", "t1", "t2", "t3"}
+        assert all(results[t]["ok"] and results[t]["integrity"] == "ok" for t in ("t1", "t2", "t3"))
+        assert not results["broken"]["ok"]
+    finally:
+        router.close()
@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from travel_planner.domain import timezones
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, migrations, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import agenda_service, day_service, item_service, trip_service
+
+TOKYO = "Asia/Tokyo"
+LA = "America/Los_Angeles"
+
+
+def _epoch_min(*args) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp()) // 60
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "tz.db"))
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Pacific")
+    day_repository.create_day(conn, trip_id, "2026-01-10")
+    day_repository.create_day(conn, trip_id, "2026-01-11")
+    yield conn
+    conn.close()
+
+
+def test_utc_minutes_follows_offsets_and_dst():
+    assert timezones.utc_minutes("2026-01-10", 17 * 60, TOKYO) == _epoch_min(2026, 1, 10, 8, 0)
+    assert timezones.utc_minutes("2026-01-10", 17 * 60, None) == _epoch_min(2026, 1, 10, 17, 0)
+    # Runs past midnight into the next local day.
+    assert timezones.utc_minutes("2026-01-10", 1440 + 120, TOKYO) == _epoch_min(2026, 1, 10, 17, 0)
+    # Los Angeles springs forward at 02:00 on 2026-03-08.
+    assert timezones.utc_minutes("2026-03-08", 60, LA) == _epoch_min(2026, 3, 8, 9, 0)
+    assert timezones.utc_minutes("2026-03-08", 180, LA) == _epoch_min(2026, 3, 8, 10, 0)
+
+    before = timezones.offset_cache_info().hits
+    timezones.utc_minutes("2026-01-10", 600, TOKYO)
+    assert timezones.offset_cache_info().hits == before + 1
+
+    with pytest.raises(ValidationError):
+        timezones.validate_timezone("Mars/Olympus_Mons")
+
+
+def test_overlaps_and_gaps_compare_utc_instants(conn):
+    # Leaves Tokyo 17:00, lands 02:00 Tokyo time (09:00 the same day in Los Angeles).
+    flight = item_service.create_item_scheduled(
+        conn, 1, "Flight", "transport", 17 * 60, 120, end_days=1, timezone=TOKYO
+    )
+    assert item_repository.get_item(conn, flight)["start_utc"] == _epoch_min(2026, 1, 10, 8, 0)
+
+    # 08:30 in Los Angeles is still in the air, though 08:30 < 17:00 in naive minutes.
+    with pytest.raises(ValidationError, match=f"id={flight}"):
+        item_service.create_item_scheduled(conn, 1, "Breakfast", "food", 510, 570, timezone=LA)
+    checkin = item_service.create_item_scheduled(conn, 1, "Check-in", "lodging", 600, 660, timezone=LA)
+    with pytest.raises(ValidationError, match=f"^scheduled item overlaps existing item id={flight} "):
+        item_service.set_item_time(conn, checkin, 510, 570)
+
+    result = item_service.check_trip_timeline(conn, 1, buffer_min=90)
+    assert result["overlaps"] == []
+    assert [(t["prev_item_id"], t["next_item_id"], t["gap_min"]) for t in result["tight_connections"]] == [
+        (flight, checkin, 60)
+    ]
+
+    breakfast = item_service.create_item_scheduled(
+        conn, 1, "Breakfast", "food", 510, 570, timezone=LA, reject_overlaps=False
+    )
+    assert item_service.check_overlaps_for_day(conn, 1) == [
+        {"item_a_id": breakfast, "item_b_id": flight, "overlap_min": 30}
+    ]
+
+    # As floating time, 08:30 is taken as 08:30 UTC: still during the flight.
+    with pytest.raises(ValidationError):
+        item_service.set_item_timezone(conn, breakfast, None)
+    item_service.set_item_timezone(conn, breakfast, None, reject_overlaps=False)
+    assert item_repository.get_item(conn, breakfast)["start_utc"] == _epoch_min(2026, 1, 10, 8, 30)
+
+
+def test_instants_are_refreshed_when_days_move(conn):
+    checkin = item_service.create_item_scheduled(conn, 1, "Check-in", "lodging", 600, 660, timezone=LA)
+
+    # July is daylight time in Los Angeles: 10:00 local is 17:00 UTC, not 18:00.
+    clone = trip_service.clone_trip(conn, 1, "Summer", start_date="2026-07-10")
+    first_day = day_repository.list_days_for_trip(conn, clone["trip_id"])[0]["id"]
+    cloned = item_repository.list_items_for_day(conn, first_day)[0]["id"]
+    assert item_repository.get_item(conn, cloned)["start_utc"] == _epoch_min(2026, 7, 10, 17, 0)
+
+    day_service.set_day_date(conn, 1, "2026-07-10")
+    assert item_repository.get_item(conn, checkin)["start_utc"] == _epoch_min(2026, 7, 10, 17, 0)
+
+    day_service.shift_trip_days(conn, 1, 1)
+    assert item_repository.get_item(conn, checkin)["start_utc"] == _epoch_min(2026, 7, 11, 17, 0)
+
+
+def test_agenda_orders_a_date_by_utc_start(conn):
+    item_service.create_item_scheduled(conn, 1, "Flight", "transport", 17 * 60, 19 * 60, timezone=TOKYO)
+    item_service.create_item_scheduled(conn, 1, "Check-in", "lodging", 600, 660, timezone=LA)
+    other = trip_repository.create_trip(conn, "Home")
+    day_id = day_repository.create_day(conn, other, "2026-01-10")
+    item_service.create_item_scheduled(conn, day_id, "Museum", "activity", 300, 360)
+
+    rows = list(agenda_service.iter_agenda(conn, "2026-01-10", "2026-01-10"))
+    # 05:00 UTC (floating), 08:00 UTC (Tokyo 17:00), 18:00 UTC (Los Angeles 10:00).
+    assert [r["title"] for r in rows] == ["Museum", "Flight", "Check-in"]
+
+
+def test_migration_backfills_instants(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = connect(path)
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Old")
+    day_id = day_repository.create_day(conn, trip_id, "2026-01-10")
+    conn.execute(
+        "INSERT INTO items (day_id, title, category, start_min, end_min, timezone, created_at, updated_at) "
+        "VALUES (?, 'Flight', 'transport', 1020, 1140, ?, '', '');",
+        (day_id, TOKYO),
+    )
+    conn.execute("DROP INDEX idx_items_day_scheduled;")
+    conn.execute("DROP INDEX idx_items_day_utc;")
+    conn.execute("ALTER TABLE items DROP COLUMN start_utc;")
+    conn.execute("ALTER TABLE items DROP COLUMN end_utc;")
+    conn.execute("PRAGMA user_version = 0;")
+    conn.commit()
+    conn.close()
+
+    conn = connect(path)
+    init_schema(conn)
+    assert migrations.get_user_version(conn) == migrations.SCHEMA_VERSION
+    row = conn.execute("SELECT start_utc, end_utc FROM items;").fetchone()
+    assert row == (_epoch_min(2026, 1, 10, 8, 0), _epoch_min(2026, 1, 10, 10, 0))
+    conn.close()
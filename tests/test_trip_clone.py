@@ -0,0 +1,83 @@
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, recurring_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import trip_service
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "clone.db"))
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Rome 2026")
+    for date in ("2026-05-30", "2026-05-31", "2026-06-01"):
+        day_id = day_repository.create_day(conn, trip_id, date)
+        item_repository.create_item_scheduled(conn, day_id, f"Tour {date}", "activity", 540, 600)
+        item_id = item_repository.create_item_min(conn, day_id, "Gelato", "food")
+        item_repository.update_item_fields(conn, item_id, notes="pistachio", pinned=1)
+    yield conn
+    conn.close()
+
+
+def _itinerary(conn, trip_id):
+    return [
+        (
+            day["date"],
+            [
+                (it["title"], it["start_min"], it["notes"], it["pinned"])
+                for it in item_repository.list_items_for_day(conn, day["id"])
+            ],
+        )
+        for day in day_repository.list_days_for_trip(conn, trip_id)
+    ]
+
+
+def test_clone_shifts_dates_across_month_end(conn):
+    result = trip_service.clone_trip(conn, 1, "Rome 2027", shift_days=365)
+
+    assert result == {"trip_id": 2, "days": 3, "items": 6, "shift_days": 365}
+    original = _itinerary(conn, 1)
+    copy = _itinerary(conn, 2)
+    assert [d for d, _ in copy] == ["2027-05-30", "2027-05-31", "2027-06-01"]
+    assert [items for _, items in copy] == [items for _, items in original]
+
+
+def test_clone_to_start_date_and_change_feed(conn):
+    seq_before = conn.execute("SELECT MAX(seq) FROM change_log;").fetchone()[0]
+
+    result = trip_service.clone_trip(conn, 1, "Rome again", start_date="2026-12-31")
+
+    assert result["shift_days"] == 215
+    assert [d["date"] for d in day_repository.list_days_for_trip(conn, result["trip_id"])] == [
+        "2026-12-31",
+        "2027-01-01",
+        "2027-01-02",
+    ]
+    logged = conn.execute(
+        "SELECT entity, COUNT(*) FROM change_log WHERE seq > ? GROUP BY entity ORDER BY entity;",
+        (seq_before,),
+    ).fetchall()
+    assert logged == [("day", 3), ("item", 6), ("trip", 1)]
+
+
+def test_clone_validates_input(conn):
+    with pytest.raises(ValidationError):
+        trip_service.clone_trip(conn, 99, "Nope")
+    with pytest.raises(ValidationError):
+        trip_service.clone_trip(conn, 1, "Both", shift_days=1, start_date="2027-01-01")
+    assert [t["id"] for t in trip_repository.list_trips(conn)] == [1]
+
+
+def test_clone_rejects_shifts_past_the_date_range(conn):
+    with pytest.raises(ValidationError, match="date range"):
+        trip_service.clone_trip(conn, 1, "Far future", shift_days=3_000_000)
+    # The days fit; the rule's window end would not.
+    recurring_repository.create_rule(conn, 1, "Walk", "activity", until_date="9999-12-30")
+    with pytest.raises(ValidationError, match="date range"):
+        trip_service.clone_trip(conn, 1, "Next week", shift_days=7)
+    with pytest.raises(ValidationError, match="date range"):
+        trip_service.clone_trip(conn, 1, "Long ago", shift_days=-800_000)
+
+    assert [t["id"] for t in trip_repository.list_trips(conn)] == [1]
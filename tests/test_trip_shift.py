@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+import pytest
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import day_repository, item_repository, row_cache, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.services import day_service
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "shift.db"))
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Week")
+    for n in range(1, 8):
+        day_id = day_repository.create_day(conn, trip_id, f"2026-08-0{n}")
+        item_repository.create_item_min(conn, day_id, f"Day {n}", "misc")
+    yield conn
+    conn.close()
+
+
+def _dates(conn, trip_id=1):
+    return [d["date"] for d in day_repository.list_days_for_trip(conn, trip_id)]
+
+
+def _items_by_day(conn, trip_id=1):
+    return [item_repository.list_items_for_day(conn, d["id"]) for d in day_repository.list_days_for_trip(conn, trip_id)]
+
+
+@pytest.mark.parametrize("shift", [1, 3, -2, 365])
+def test_shift_overlapping_its_own_range(conn, shift):
+    before = _dates(conn)
+    items_before = _items_by_day(conn)
+
+    assert day_service.shift_trip_days(conn, 1, shift) == 7
+    expected = [(date.fromisoformat(d) + timedelta(days=shift)).isoformat() for d in before]
+    assert _dates(conn) == expected
+    # Day ids are unchanged, so every item stays on its day.
+    assert _items_by_day(conn) == items_before
+
+
+def test_shift_refreshes_cached_days(conn):
+    row_cache.enable_cache(conn)
+    try:
+        assert day_repository.get_day(conn, 1)["date"] == "2026-08-01"
+        day_service.shift_trip_days(conn, 1, 7)
+        assert day_repository.get_day(conn, 1)["date"] == "2026-08-08"
+    finally:
+        row_cache.disable_cache(conn)
+
+
+def test_failed_shift_leaves_trip_untouched(conn):
+    with pytest.raises(ValidationError):
+        day_service.shift_trip_days(conn, 1, 3_000_000)
+    assert _dates(conn) == [f"2026-08-0{n}" for n in range(1, 8)]
+    with pytest.raises(ValidationError):
+        day_service.shift_trip_days(conn, 42, 1)
@@ -1,10 +1,16 @@
+from array import array
+from fractions import Fraction
+
 import pytest
 
 from travel_planner.domain.validators import (
     ValidationError,
     validate_cost,
+    validate_costs,
     validate_date_string,
+    validate_date_strings,
     validate_time_range,
+    validate_time_ranges,
 )
 
 def test_validate_time_range_allows_both_none():
@@ -95,4 +101,63 @@ def test_validate_date_string_rejects_wrong_format():
 def test_validate_date_string_rejects_invalid_calendar_dates():
     for bad in ["2026-02-29", "2026-13-01", "2026-00-10", "2026-04-31", "2026-01-00"]:
         with pytest.raises(ValidationError):
-            validate_date_string(bad)
\ No newline at end of file
+            validate_date_string(bad)
+
+
+def _scalar_error(fn, *args):
+    try:
+        fn(*args)
+    except ValidationError as e:
+        return str(e)
+    return None
+
+
+def test_batch_validators_match_scalar_messages_row_by_row():
+    starts = [None, 60, 60, 60.5, -1, 100, 0, True]
+    ends = [None, None, 120, 120, 10, 100, 1440, 5]
+    costs = [None, 0, 12.5, -1, "9", 2_000_000, float("inf"), 7]
+    dates = ["2026-05-23", "2026-02-29", "2026/05/23", 20260523, "2000-02-29", "2026-02-29", "abc", "2026-01-01"]
+
+    cases = [
+        (validate_time_ranges(starts, ends), [_scalar_error(validate_time_range, s, e) for s, e in zip(starts, ends)]),
+        (validate_costs(costs), [_scalar_error(validate_cost, c) for c in costs]),
+        (validate_date_strings(dates), [_scalar_error(validate_date_string, d) for d in dates]),
+    ]
+    for result, expected in cases:
+        assert result.mask == [e is not None for e in expected]
+        assert result.errors == {i: e for i, e in enumerate(expected) if e is not None}
+        assert not result.ok
+
+
+def test_batch_validators_accept_arrays_and_report_ok():
+    result = validate_time_ranges(array("q", [0, 60, 600]), array("q", [30, 120, 1440]))
+    assert result.ok
+    assert result.mask == [False, False, False]
+    result.raise_first()
+
+    assert validate_costs(array("d", [0.0, 19.99])).ok
+    with pytest.raises(ValidationError, match="row 1: cost must not be negative"):
+        validate_costs(array("d", [1.0, -2.0, -3.0])).raise_first()
+    with pytest.raises(ValidationError):
+        validate_time_ranges([0, 1], [5])
+
+
+class _IndexOnly:
+    # Stands in for numpy.int64: integer-like through __index__, not an int subclass.
+    def __init__(self, value):
+        self.value = value
+
+    def __index__(self):
+        return self.value
+
+
+def test_batch_validators_accept_integer_like_scalars():
+    assert validate_time_ranges([_IndexOnly(60)], [_IndexOnly(120)]).ok
+    assert validate_time_ranges([_IndexOnly(120)], [_IndexOnly(60)]).errors == {
+        0: "start_min must be strictly less than end_min."
+    }
+    assert validate_costs([_IndexOnly(5), Fraction(1, 2)]).ok
+    assert validate_costs([Fraction(-1, 2)]).errors == {0: "cost must not be negative."}
+    # Still numbers only: a float minute or a numeric string is rejected as before.
+    assert not validate_time_ranges([60.0], [120]).ok
+    assert not validate_costs(["9"]).ok
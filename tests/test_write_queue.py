@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+
+import pytest
+
+from travel_planner.observability import metrics
+from travel_planner.persistence import day_repository, item_repository, trip_repository
+from travel_planner.persistence.db import connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.persistence.write_queue import WriteQueue
+from travel_planner.services import item_service
+
+
+@pytest.fixture
+def registry():
+    reg = metrics.enable_metrics()
+    yield reg
+    metrics.disable_metrics()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "queue.db")
+    conn = connect(path)
+    init_schema(conn)
+    trip_id = trip_repository.create_trip(conn, "Lisbon")
+    day_repository.create_day(conn, trip_id, "2026-05-01")
+    conn.close()
+    return path
+
+
+def test_concurrent_writers_share_group_commits(db_path, registry):
+    ids: list[int] = []
+    lock = threading.Lock()
+
+    def writer(n: int) -> None:
+        for i in range(20):
+            item_id = queue.submit(item_repository.create_item_min, 1, f"Item {n}-{i}", "activity").result()
+            with lock:
+                ids.append(item_id)
+
+    with WriteQueue(db_path, max_delay=0.01) as queue:
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert sorted(ids) == list(range(1, 161))
+    assert registry.value(metrics.WRITE_QUEUE_OPS, outcome="ok") == 160
+    assert registry.value(metrics.WRITE_QUEUE_BATCHES) < 160
+
+    conn = connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM items;").fetchone()[0] == 160
+    conn.close()
+
+
+def test_failed_operation_is_rolled_back_alone(db_path, registry):
+    # One full batch; the shift runs its own BEGIN IMMEDIATE inside it, and
+    # the third write breaks UNIQUE (trip_id, date).
+    with WriteQueue(db_path, max_batch=4, max_delay=5.0) as queue:
+        created = queue.submit(day_repository.create_day, 1, "2026-05-02")
+        shifted = queue.submit(day_repository.shift_trip_days, 1, 1)
+        clash = queue.submit(day_repository.create_day, 1, "2026-05-03")
+        scheduled = queue.submit(item_service.create_item_scheduled, 1, "Tram 28", "transport", 600, 660)
+
+        assert created.result() == 2
+        assert shifted.result() == 2
+        with pytest.raises(sqlite3.IntegrityError):
+            clash.result()
+        assert scheduled.result() == 1
+    assert registry.value(metrics.WRITE_QUEUE_BATCHES) == 1
+    assert registry.value(metrics.WRITE_QUEUE_OPS, outcome="error") == 1
+
+    conn = connect(db_path)
+    assert [d["date"] for d in day_repository.list_days_for_trip(conn, 1)] == ["2026-05-02", "2026-05-03"]
+    assert item_repository.get_item(conn, 1)["start_utc"] is not None
+    conn.close()
+
+
+def test_close_drains_queue_and_rejects_new_writes(db_path):
+    queue = WriteQueue(db_path, max_batch=4, max_delay=0.5)
+    futures = [queue.submit(item_repository.create_item_min, 1, f"Stop {i}", "activity") for i in range(6)]
+    queue.close()
+
+    assert [f.result(timeout=0) for f in futures] == [1, 2, 3, 4, 5, 6]
+    with pytest.raises(RuntimeError):
+        queue.submit(item_repository.create_item_min, 1, "Late", "activity")
@@ -0,0 +1,3 @@
+"""
+HTTP/JSON API package for travel_planner.
+"""
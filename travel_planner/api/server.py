@@ -0,0 +1,669 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import signal
+import sqlite3
+import sys
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, ContextManager, Iterable
+from urllib.parse import parse_qs, urlsplit
+
+from travel_planner.config import settings
+from travel_planner.domain.exceptions import ConflictError
+from travel_planner.domain.validators import ValidationError
+from travel_planner.observability import metrics
+from travel_planner.persistence import (
+    day_repository,
+    diagnostics_repository,
+    item_repository,
+    row_cache,
+    trip_repository,
+)
+from travel_planner.persistence.db import ConnectionPool, connect
+from travel_planner.persistence.schema import init_schema
+from travel_planner.persistence.tenants import TenantRouter
+from travel_planner.services import day_service, diagnostics_service, item_service, tenant_service, trip_service
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Lists longer than this are sent with chunked transfer encoding instead of
+# being serialized into a single body up front.
+STREAM_THRESHOLD = 500
+STREAM_BATCH_ROWS = 200
+
+# In multi-tenant mode every request names its tenant in this header.
+TENANT_HEADER = "X-Tenant-Id"
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ApiResponse:
+    def __init__(
+        self,
+        status: HTTPStatus,
+        payload: Any = None,
+        *,
+        versions: list | None = None,
+        stream: bool = False,
+    ) -> None:
+        self.status = status
+        # A list, or with stream=True an iterable that is only consumed while
+        # the body is written.
+        self.payload = payload
+        # Row-version tokens the ETag is derived from (GET responses only).
+        self.versions = versions
+        self.stream = stream
+
+
+def _row_version(row: dict) -> Any:
+    # Items carry updated_at; trips and days are small enough to version by content.
+    if "updated_at" in row:
+        return [row["id"], row["updated_at"]]
+    return [row[k] for k in sorted(row)]
+
+
+def _etag(versions: list) -> str:
+    digest = hashlib.sha1(
+        json.dumps(versions, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _require(row: dict | None, what: str) -> dict:
+    if row is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"{what} not found.")
+    return row
+
+
+def _body_str(body: dict, key: str, *, required: bool = True) -> str | None:
+    value = body.get(key)
+    if value is None:
+        if required:
+            raise ValidationError(f"{key} is required.")
+        return None
+    if not isinstance(value, str):
+        raise ValidationError(f"{key} must be a string.")
+    return value
+
+
+def _body_int(body: dict, key: str) -> int | None:
+    value = body.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValidationError(f"{key} must be an integer.")
+    return value
+
+
+# ----------------
+# handlers
+# ----------------
+
+def _list_trips(conn, ids, query, body) -> ApiResponse:
+    trips = trip_repository.list_trips(conn)
+    return ApiResponse(HTTPStatus.OK, trips, versions=[_row_version(t) for t in trips])
+
+
+def _create_trip(conn, ids, query, body) -> ApiResponse:
+    trip_id = trip_service.create_trip(conn, _body_str(body, "name"))
+    return ApiResponse(HTTPStatus.CREATED, {"id": trip_id})
+
+
+def _get_trip(conn, ids, query, body) -> ApiResponse:
+    trip = _require(trip_repository.get_trip(conn, ids[0]), "trip")
+    return ApiResponse(HTTPStatus.OK, trip, versions=[_row_version(trip)])
+
+
+def _rename_trip(conn, ids, query, body) -> ApiResponse:
+    _require(trip_repository.get_trip(conn, ids[0]), "trip")
+    trip_service.rename_trip(conn, ids[0], _body_str(body, "name"))
+    return ApiResponse(HTTPStatus.OK, trip_repository.get_trip(conn, ids[0]))
+
+
+def _delete_trip(conn, ids, query, body) -> ApiResponse:
+    _require(trip_repository.get_trip(conn, ids[0]), "trip")
+    trip_service.delete_trip(conn, ids[0])
+    return ApiResponse(HTTPStatus.NO_CONTENT)
+
+
+def _list_days(conn, ids, query, body) -> ApiResponse:
+    _require(trip_repository.get_trip(conn, ids[0]), "trip")
+    days = day_repository.list_days_for_trip(conn, ids[0])
+    return ApiResponse(HTTPStatus.OK, days, versions=[_row_version(d) for d in days])
+
+
+def _create_day(conn, ids, query, body) -> ApiResponse:
+    _require(trip_repository.get_trip(conn, ids[0]), "trip")
+    day_id = day_service.create_day(conn, ids[0], _body_str(body, "date"))
+    return ApiResponse(HTTPStatus.CREATED, {"id": day_id})
+
+
+def _get_day(conn, ids, query, body) -> ApiResponse:
+    day = _require(day_repository.get_day(conn, ids[0]), "day")
+    return ApiResponse(HTTPStatus.OK, day, versions=[_row_version(day)])
+
+
+def _set_day_date(conn, ids, query, body) -> ApiResponse:
+    _require(day_repository.get_day(conn, ids[0]), "day")
+    day_service.set_day_date(conn, ids[0], _body_str(body, "date"))
+    return ApiResponse(HTTPStatus.OK, day_repository.get_day(conn, ids[0]))
+
+
+def _delete_day(conn, ids, query, body) -> ApiResponse:
+    _require(day_repository.get_day(conn, ids[0]), "day")
+    day_service.delete_day(conn, ids[0])
+    return ApiResponse(HTTPStatus.NO_CONTENT)
+
+
+def _list_items(conn, ids, query, body) -> ApiResponse:
+    _require(day_repository.get_day(conn, ids[0]), "day")
+    # Versioned by an aggregate, so a 304 never reads the rows and a long
+    # listing is written straight from the cursor.
+    count, last_updated_at, stamp = item_repository.get_day_items_version(conn, ids[0])
+    return ApiResponse(
+        HTTPStatus.OK,
+        item_repository.iter_items_for_day(conn, ids[0]),
+        versions=[ids[0], count, last_updated_at, stamp],
+        stream=count > STREAM_THRESHOLD,
+    )
+
+
+def _create_item(conn, ids, query, body) -> ApiResponse:
+    _require(day_repository.get_day(conn, ids[0]), "day")
+    title = _body_str(body, "title")
+    category = _body_str(body, "category")
+    start = _body_int(body, "start_min")
+    end = _body_int(body, "end_min")
+
+    if start is None and end is None:
+        item_id = item_service.create_item_min(conn, ids[0], title, category)
+    else:
+        if start is None or end is None:
+            raise ValidationError("start_min and end_min must both be provided.")
+        item_id = item_service.create_item_scheduled(
+            conn,
+            ids[0],
+            title,
+            category,
+            start,
+            end,
+            reject_overlaps=not body.get("allow_overlap", False),
+        )
+    return ApiResponse(HTTPStatus.CREATED, {"id": item_id})
+
+
+def _get_item(conn, ids, query, body) -> ApiResponse:
+    item = _require(item_repository.get_item(conn, ids[0]), "item")
+    return ApiResponse(HTTPStatus.OK, item, versions=[_row_version(item)])
+
+
+def _update_item(conn, ids, query, body) -> ApiResponse:
+    item_id = ids[0]
+    _require(item_repository.get_item(conn, item_id), "item")
+
+    # The whole body is checked before anything is written.
+    start = _body_int(body, "start_min")
+    end = _body_int(body, "end_min")
+    clear_time = bool(body.get("clear_time", False))
+    if clear_time and (start is not None or end is not None):
+        raise ValidationError("clear_time cannot be combined with start_min/end_min.")
+    if (start is None) != (end is None):
+        raise ValidationError("start_min and end_min must both be provided.")
+
+    pinned = body.get("pinned")
+    if pinned is not None and not isinstance(pinned, (bool, int)):
+        raise ValidationError("pinned must be a boolean.")
+
+    fields = {k: _body_str(body, k, required=False) for k in ("title", "category", "notes", "tags")}
+    item_service.update_item(
+        conn,
+        item_id,
+        **fields,
+        pinned=(bool(pinned) if pinned is not None else None),
+        start_min=start,
+        end_min=end,
+        clear_time=clear_time,
+        reject_overlaps=not body.get("allow_overlap", False),
+        # Optimistic concurrency: the updated_at the client last read.
+        expected_updated_at=_body_str(body, "if_updated_at", required=False),
+    )
+    return ApiResponse(HTTPStatus.OK, item_repository.get_item(conn, item_id))
+
+
+def _move_item(conn, ids, query, body) -> ApiResponse:
+    item_id = ids[0]
+    _require(item_repository.get_item(conn, item_id), "item")
+    item_service.move_item(
+        conn,
+        item_id,
+        before_id=_body_int(body, "before"),
+        after_id=_body_int(body, "after"),
+    )
+    return ApiResponse(HTTPStatus.OK, item_repository.get_item(conn, item_id))
+
+
+def _delete_item(conn, ids, query, body) -> ApiResponse:
+    _require(item_repository.get_item(conn, ids[0]), "item")
+    item_service.delete_item(conn, ids[0])
+    return ApiResponse(HTTPStatus.NO_CONTENT)
+
+
+def _check_day(conn, ids, query, body) -> ApiResponse:
+    day_id = ids[0]
+    _require(day_repository.get_day(conn, day_id), "day")
+
+    raw_buffer = query.get("buffer", ["15"])[0]
+    try:
+        buffer_min = int(raw_buffer)
+    except ValueError:
+        raise ValidationError("buffer must be an integer.") from None
+
+    # Read before the checks: a write slipping in between leaves an older
+    # ETag, which only costs the client a refetch.
+    stamp = diagnostics_repository.get_day_stamp(conn, day_id)
+    overlaps = item_service.check_overlaps_for_day(conn, day_id)
+    tight = item_service.check_tight_connections_for_day(conn, day_id, buffer_min=buffer_min)
+
+    # The triggers bump the stamp on every change to the day's schedule:
+    # its items, recurring rules and skips, and its date.
+    return ApiResponse(
+        HTTPStatus.OK,
+        {"day_id": day_id, "overlaps": overlaps, "tight_connections": tight},
+        versions=[day_id, buffer_min, stamp],
+    )
+
+
+def _check_trip(conn, ids, query, body) -> ApiResponse:
+    _require(trip_repository.get_trip(conn, ids[0]), "trip")
+    try:
+        buffer_min = int(query.get("buffer", ["15"])[0])
+    except ValueError:
+        raise ValidationError("buffer must be an integer.") from None
+
+    results, stats = diagnostics_service.check_days(conn, trip_id=ids[0], buffer_min=buffer_min)
+    return ApiResponse(HTTPStatus.OK, {"trip_id": ids[0], "days": results, "cache": stats})
+
+
+Handler = Callable[[sqlite3.Connection, list, dict, dict], ApiResponse]
+
+ROUTES: list[tuple[str, re.Pattern, Handler]] = [
+    ("GET", re.compile(r"^/trips$"), _list_trips),
+    ("POST", re.compile(r"^/trips$"), _create_trip),
+    ("GET", re.compile(r"^/trips/(\d+)$"), _get_trip),
+    ("PATCH", re.compile(r"^/trips/(\d+)$"), _rename_trip),
+    ("DELETE", re.compile(r"^/trips/(\d+)$"), _delete_trip),
+    ("GET", re.compile(r"^/trips/(\d+)/days$"), _list_days),
+    ("GET", re.compile(r"^/trips/(\d+)/check$"), _check_trip),
+    ("POST", re.compile(r"^/trips/(\d+)/days$"), _create_day),
+    ("GET", re.compile(r"^/days/(\d+)$"), _get_day),
+    ("PATCH", re.compile(r"^/days/(\d+)$"), _set_day_date),
+    ("DELETE", re.compile(r"^/days/(\d+)$"), _delete_day),
+    ("GET", re.compile(r"^/days/(\d+)/items$"), _list_items),
+    ("POST", re.compile(r"^/days/(\d+)/items$"), _create_item),
+    ("GET", re.compile(r"^/days/(\d+)/check$"), _check_day),
+    ("GET", re.compile(r"^/items/(\d+)$"), _get_item),
+    ("PATCH", re.compile(r"^/items/(\d+)$"), _update_item),
+    ("DELETE", re.compile(r"^/items/(\d+)$"), _delete_item),
+    ("POST", re.compile(r"^/items/(\d+)/move$"), _move_item),
+]
+
+
+def _resolve(method: str, path: str) -> tuple[Handler, list[int]]:
+    path_matched = False
+    for route_method, pattern, handler in ROUTES:
+        m = pattern.match(path)
+        if m is None:
+            continue
+        path_matched = True
+        if route_method == method:
+            return handler, [int(g) for g in m.groups()]
+
+    if path_matched:
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}.")
+    raise ApiError(HTTPStatus.NOT_FOUND, f"no route for {path}.")
+
+
+# ----------------
+# HTTP plumbing
+# ----------------
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        pool: ConnectionPool | None,
+        *,
+        router: TenantRouter | None = None,
+        quiet: bool = False,
+    ) -> None:
+        if (pool is None) == (router is None):
+            raise ValueError("pass exactly one of pool or router.")
+        super().__init__(address, ApiRequestHandler)
+        self.pool = pool
+        self.router = router
+        self.quiet = quiet
+
+    def service_actions(self) -> None:
+        # Called by serve_forever() between polls; closes tenants that went idle
+        # even when no further requests arrive.
+        if self.router is not None:
+            self.router.evict_idle()
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.pool is not None:
+            self.pool.close()
+        if self.router is not None:
+            self.router.close()
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; do not let Nagle delay the body.
+    disable_nagle_algorithm = True
+    server: ApiServer
+    # Set once a chunked body has started; errors after that cannot be reported.
+    _streaming = False
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        if method == "GET" and url.path == "/metrics":
+            self._send_metrics()
+            return
+        self._streaming = False
+        try:
+            handler, ids = _resolve(method, url.path)
+            body = self._read_json_body()
+            with self._connection() as conn:
+                response = handler(conn, ids, parse_qs(url.query), body)
+                # Streamed payloads read from conn, so they are written before it is released.
+                self._send_response(response)
+            return
+
+        except ApiError as e:
+            self._send_error_json(e.status, str(e))
+            return
+        except ValidationError as e:
+            self._send_error_json(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        except LookupError as e:
+            self._send_error_json(HTTPStatus.NOT_FOUND, str(e))
+            return
+        except ConflictError as e:
+            self._send_error_json(HTTPStatus.CONFLICT, str(e))
+            return
+        except sqlite3.IntegrityError as e:
+            self._send_error_json(HTTPStatus.CONFLICT, f"database constraint error: {e}")
+            return
+        except sqlite3.OperationalError as e:
+            self._send_error_json(HTTPStatus.SERVICE_UNAVAILABLE, f"database operational error: {e}")
+            return
+        except Exception:
+            self.log_error("unhandled error on %s %s", method, self.path)
+            self._send_error_json(HTTPStatus.INTERNAL_SERVER_ERROR, "internal server error.")
+            return
+
+    def _connection(self) -> ContextManager[sqlite3.Connection]:
+        router = self.server.router
+        if router is None:
+            return self.server.pool.connection()  # type: ignore[union-attr]
+        tenant_id = self.headers.get(TENANT_HEADER)
+        if not tenant_id:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"{TENANT_HEADER} header is required.")
+        return tenant_service.tenant_connection(router, tenant_id)
+
+    def _read_json_body(self) -> dict:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Content-Length must be an integer.") from None
+        if length <= 0:
+            return {}
+        raw = self.rfile.read(length)
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "request body must be valid JSON.") from None
+        if not isinstance(body, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "request body must be a JSON object.")
+        return body
+
+    def _send_response(self, response: ApiResponse) -> None:
+        etag = _etag(response.versions) if response.versions is not None else None
+
+        if etag is not None and _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if response.payload is None:
+            self.send_response(response.status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = response.payload
+        if response.stream or (isinstance(payload, list) and len(payload) > STREAM_THRESHOLD):
+            self.send_response(response.status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            if etag is not None:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self._streaming = True
+            for chunk in _iter_json_array(payload):
+                self._write_chunk(chunk)
+            self._write_chunk(b"")
+            return
+
+        if not isinstance(payload, (dict, list)):
+            payload = list(payload)
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_metrics(self) -> None:
+        registry = metrics.get_registry()
+        if registry is None:
+            self._send_error_json(HTTPStatus.NOT_FOUND, "metrics are not enabled.")
+            return
+        data = registry.render().encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _send_error_json(self, status: HTTPStatus, message: str) -> None:
+        if self._streaming:
+            # The status line is already out; all that is left is to drop the connection.
+            self.close_connection = True
+            return
+        data = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _iter_json_array(rows: Iterable[Any]) -> Iterable[bytes]:
+    """
+    Serialize a JSON array in batches so large listings are never held as one string.
+    """
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    batch: list[str] = []
+    first = True
+
+    yield b"["
+    for row in rows:
+        batch.append(encode(row))
+        if len(batch) >= STREAM_BATCH_ROWS:
+            prefix = "" if first else ","
+            yield (prefix + ",".join(batch)).encode("utf-8")
+            first = False
+            batch = []
+    if batch:
+        prefix = "" if first else ","
+        yield (prefix + ",".join(batch)).encode("utf-8")
+    yield b"]"
+
+
+def make_server(
+    db_path: str,
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    pool_size: int = 8,
+    cache_size: int = 0,
+    enable_metrics: bool = False,
+    tenants_dir: str | None = None,
+    max_open_tenants: int = 32,
+    tenant_idle_timeout: float = 300.0,
+    quiet: bool = False,
+) -> ApiServer:
+    """
+    Initialize the schema and build a server bound to (host, port). Port 0 picks a free port.
+
+    cache_size > 0 gives each pooled connection a row cache of that many entries.
+    enable_metrics turns on the process metrics registry and serves it at GET /metrics.
+    tenants_dir switches to one database per tenant, chosen by the X-Tenant-Id
+    header; db_path is then unused. Tenant databases must already exist
+    (create them with the CLI's --tenant option).
+    """
+    if enable_metrics:
+        metrics.enable_metrics()
+
+    on_connect = None
+    if cache_size > 0:
+        def on_connect(conn: sqlite3.Connection) -> None:
+            row_cache.enable_cache(conn, max_entries=cache_size)
+
+    if tenants_dir is not None:
+        router = TenantRouter(
+            tenants_dir,
+            max_open=max_open_tenants,
+            idle_timeout=tenant_idle_timeout,
+            pool_size=pool_size,
+            create_missing=False,
+            on_connect=on_connect,
+        )
+        return ApiServer((host, port), None, router=router, quiet=quiet)
+
+    conn = connect(db_path)
+    try:
+        init_schema(conn)
+    finally:
+        conn.close()
+
+    pool = ConnectionPool(db_path, max_size=pool_size, on_connect=on_connect)
+    return ApiServer((host, port), pool, quiet=quiet)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="travel-planner-api")
+    parser.add_argument("--db", dest="db_path", default="travel_planner.db")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--cache-size", type=int, default=0, help="Row cache entries per connection (0 = off)")
+    parser.add_argument("--metrics", action="store_true", help="Collect metrics and serve them at GET /metrics")
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Also write metrics to this file on SIGUSR1 and at shutdown (implies --metrics)",
+    )
+    parser.add_argument(
+        "--tenants-dir",
+        default=settings.tenants_dir(),
+        help="Serve one database per tenant from this directory, selected by the X-Tenant-Id header",
+    )
+    parser.add_argument("--max-open-tenants", type=int, default=32, help="Tenant pools kept open (LRU)")
+    parser.add_argument(
+        "--tenant-idle-timeout",
+        type=float,
+        default=300.0,
+        help="Close a tenant's pool after this many idle seconds",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Do not log each request")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    server = make_server(
+        args.db_path,
+        host=args.host,
+        port=args.port,
+        pool_size=args.pool_size,
+        cache_size=args.cache_size,
+        enable_metrics=args.metrics or bool(args.metrics_file),
+        tenants_dir=args.tenants_dir,
+        max_open_tenants=args.max_open_tenants,
+        tenant_idle_timeout=args.tenant_idle_timeout,
+        quiet=args.quiet,
+    )
+
+    registry = metrics.get_registry()
+    if args.metrics_file and registry is not None and hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: registry.write_textfile(args.metrics_file))
+
+    host, port = server.server_address[:2]
+    print(f"Serving travel_planner API on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.metrics_file and registry is not None:
+            registry.write_textfile(args.metrics_file)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
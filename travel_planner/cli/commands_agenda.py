@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sys
+from sqlite3 import Connection
+
+from travel_planner.cli.formatters import fmt_time_range
+from travel_planner.services import agenda_service
+
+
+def _print_row(row: dict) -> None:
+    time_str = fmt_time_range(row["start_min"], row["end_min"])
+    if row["timezone"]:
+        time_str = f"{time_str} {row['timezone']}"
+    print(f"{row['date']}  {time_str:<11}  [{row['trip_name']}] {row['title']} ({row['category']})  #{row['item_id']}")
+
+
+def cmd_agenda(
+    conn: Connection,
+    from_date: str,
+    to_date: str,
+    *,
+    limit: int | None = None,
+    after: str | None = None,
+) -> int:
+    """
+    Print items of every trip dated from_date..to_date in chronological order.
+
+    Without --limit the whole range is streamed row by row. With --limit one
+    page is printed and the cursor for the next page goes to stderr.
+    """
+    if limit is None and after is None:
+        count = 0
+        for row in agenda_service.iter_agenda(conn, from_date, to_date):
+            _print_row(row)
+            count += 1
+        if count == 0:
+            print("No items found in this range.")
+        return 0
+
+    rows, next_cursor = agenda_service.page_agenda(
+        conn, from_date, to_date, after=after, limit=limit if limit is not None else 100
+    )
+    for row in rows:
+        _print_row(row)
+    if not rows:
+        print("No items found in this range.")
+    if next_cursor is not None:
+        print(f"Next page: --after {next_cursor}", file=sys.stderr)
+    return 0
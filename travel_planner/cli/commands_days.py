@@ -4,7 +4,7 @@ from sqlite3 import Connection
 
 from travel_planner.domain.validators import ValidationError
 from travel_planner.cli.formatters import print_table
-from travel_planner.services import day_service
+from travel_planner.services import archive_service, day_service
 
 
 # Prefer service layer when present
@@ -40,18 +40,41 @@ def cmd_day_add(conn: Connection, trip_id: int, date_str: str) -> int:
     return 0
 
 
-def cmd_day_list(conn: Connection, trip_id: int) -> int:
+def cmd_day_list(
+    conn: Connection,
+    trip_id: int | None,
+    from_date: str | None = None,
+    to_date: str | None = None,
+    archive_path: str | None = None,
+) -> int:
     """
-    List days for a trip.
+    List days for a trip, or days in a date range (optionally limited to one trip).
+
+    With archive_path, list an archived trip's days instead.
     """
-    if not isinstance(trip_id, int) or trip_id <= 0:
-        raise ValidationError("trip_id must be a positive integer.")
+    if archive_path is not None:
+        if from_date is not None or to_date is not None:
+            raise ValidationError("--archived lists one trip's days; --from/--to are not supported with it.")
+        days = archive_service.list_archived_days(conn, archive_path, trip_id)
+        if not days:
+            print("No archived days found for this trip.")
+            return 0
+    elif from_date is not None or to_date is not None:
+        if from_date is None or to_date is None:
+            raise ValidationError("--from and --to must be given together.")
+        days = day_service.list_days_in_range(conn, from_date, to_date, trip_id=trip_id)
+        if not days:
+            print("No days found in this range.")
+            return 0
+    else:
+        if not isinstance(trip_id, int) or trip_id <= 0:
+            raise ValidationError("trip_id must be a positive integer (or give --from/--to).")
 
-    days = list_days_for_trip(conn, trip_id)
+        days = list_days_for_trip(conn, trip_id)
 
-    if not days:
-        print("No days found for this trip.")
-        return 0
+        if not days:
+            print("No days found for this trip.")
+            return 0
 
     headers = ["Day ID", "Trip ID", "Date"]
     rows = [
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import sys
+from sqlite3 import Connection
+
+from travel_planner.cli.formatters import fmt_duration, fmt_spend, print_stats_categories, print_table
+from travel_planner.services import backup_service, stats_service
+
+
+def _print_progress(remaining: int, total: int) -> None:
+    done = total - remaining
+    pct = 100.0 * done / total if total else 100.0
+    sys.stderr.write(f"\rBacking up: {pct:5.1f}% ({done}/{total} pages)")
+    sys.stderr.flush()
+
+
+def cmd_db_backup(
+    conn: Connection,
+    out_path: str,
+    *,
+    pages: int,
+    sleep: float,
+    compress: bool,
+    verify: bool,
+) -> int:
+    """
+    Take an online backup of the database; writers keep working between copy steps.
+    """
+    show_progress = sys.stderr.isatty()
+    result = backup_service.backup_database(
+        conn,
+        out_path,
+        pages=pages,
+        sleep=sleep,
+        compress=compress,
+        verify=verify,
+        progress=_print_progress if show_progress else None,
+    )
+    if show_progress:
+        sys.stderr.write("\n")
+
+    if not result["written"]:
+        print(f"Backup failed integrity check, nothing written: {result['integrity']}")
+        return 1
+
+    checked = "integrity ok" if verify else "not verified"
+    print(
+        f"Backed up {result['pages']} page(s) to {out_path} "
+        f"({result['bytes']} bytes, {checked}, {result['seconds']:.2f}s)"
+    )
+    return 0
+
+
+def cmd_db_stats(conn: Connection, cache_path: str | None = None) -> int:
+    """
+    Print spend and schedule utilization across the database, per trip and per category.
+    """
+    stats = stats_service.db_stats(conn, cache_path=cache_path)
+    t = stats["totals"]
+    print(
+        f"{t['trips']} trip(s), {t['days']} day(s), {t['items']} item(s), "
+        f"{fmt_duration(t['busy_min'])} busy, {fmt_duration(t['idle_min'])} idle, spend {fmt_spend(t['spend'])}"
+    )
+    print()
+    print_table(
+        ["Trip ID", "Name", "Days", "Items", "Busy", "Idle", "Spend"],
+        [
+            [
+                str(trip["trip_id"]),
+                trip["name"],
+                str(trip["days"]),
+                str(trip["items"]),
+                fmt_duration(trip["busy_min"]),
+                fmt_duration(trip["idle_min"]),
+                fmt_spend(trip["spend"]),
+            ]
+            for trip in stats["trips"]
+        ],
+    )
+    print()
+    print_stats_categories(stats["categories"])
+    return 0
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import sys
+from sqlite3 import Connection
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import archive_repository
+from travel_planner.services import export_service
+
+
+def cmd_export_trip(
+    conn: Connection,
+    trip_id: int,
+    out_path: str | None = None,
+    archive_path: str | None = None,
+) -> int:
+    """
+    Export a whole trip (days and items) as one JSON document, from the archive if archive_path is given.
+    """
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+
+    schema = "main"
+    if archive_path is not None:
+        archive_repository.attach_archive(conn, archive_path)
+        schema = archive_repository.ARCHIVE_SCHEMA
+
+    try:
+        doc = export_service.export_trip(conn, trip_id, schema=schema)
+    except ValueError:
+        print("Trip not found.")
+        return 0
+
+    if out_path is None:
+        json.dump(doc, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print(f"Exported trip id={trip_id} to {out_path}")
+    return 0
+
+
+def cmd_export_changes(conn: Connection, since_seq: int, out_path: str | None = None) -> int:
+    """
+    Emit trips, days and items changed after since_seq as NDJSON.
+    """
+    if out_path is None:
+        count, last_seq = export_service.write_changes_ndjson(conn, since_seq, sys.stdout)
+    else:
+        with open(out_path, "w", encoding="utf-8") as f:
+            count, last_seq = export_service.write_changes_ndjson(conn, since_seq, f)
+
+    # Keep stdout pure NDJSON; the resume point goes to stderr.
+    print(f"Exported {count} change(s); next --since {last_seq}", file=sys.stderr)
+    return 0
+
+
+def cmd_export_compact(conn: Connection, through_seq: int | None, before: str | None) -> int:
+    """
+    Delete consumed change log entries.
+    """
+    deleted = export_service.compact_change_log(conn, through_seq=through_seq, before=before)
+    print(f"Compacted {deleted} change log entr{'y' if deleted == 1 else 'ies'}")
+    return 0
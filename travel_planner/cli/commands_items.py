@@ -4,7 +4,7 @@ from sqlite3 import Connection
 
 from travel_planner.domain.validators import ValidationError
 from travel_planner.cli.formatters import fmt_minutes, fmt_money, print_table
-from travel_planner.services import item_service
+from travel_planner.services import archive_service, diagnostics_service, item_service
 
 
 # Prefer service layer when present
@@ -30,6 +30,10 @@ from travel_planner.persistence.item_repository import (
 )
 
 
+def _fmt_days_later(days: int) -> str:
+    return f" +{days}d" if days else ""
+
+
 def cmd_item_add_min(conn: Connection, day_id: int, title: str, category: str) -> int:
     """
     Add an unscheduled (minimal) item to a day.
@@ -66,10 +70,12 @@ def cmd_item_add_scheduled(
     start_min: int,
     end_min: int,
     *,
+    end_days: int = 0,
+    timezone: str | None = None,
     reject_overlaps: bool = True,
 ) -> int:
     """
-    Add a scheduled item to a day.
+    Add a scheduled item to a day, ending end_days days later for multi-day items.
     """
     if not isinstance(day_id, int) or day_id <= 0:
         raise ValidationError("day_id must be a positive integer.")
@@ -86,6 +92,8 @@ def cmd_item_add_scheduled(
                 category,
                 start_min,
                 end_min,
+                end_days=end_days,
+                timezone=timezone,
                 reject_overlaps=reject_overlaps,
             )
         )
@@ -93,6 +101,9 @@ def cmd_item_add_scheduled(
         # Fallback validation
         from travel_planner.domain.validators import validate_time_range
 
+        if end_days or timezone:
+            raise ValidationError("multi-day and timezoned items require item_service.")
+
         if not isinstance(title, str):
             raise ValidationError("title must be a string.")
         if not isinstance(category, str):
@@ -125,19 +136,23 @@ def cmd_item_add_scheduled(
         item_id = int(repo_create_item_scheduled(conn, day_id, t, c, start_min, end_min))
 
     print(
-        f"Created item id={item_id} ({fmt_minutes(start_min)}–{fmt_minutes(end_min)}) for day id={day_id}"
+        f"Created item id={item_id} ({fmt_minutes(start_min)}–{fmt_minutes(end_min)}{_fmt_days_later(end_days)}"
+        f"{f' {timezone}' if timezone else ''}) for day id={day_id}"
     )
     return 0
 
 
-def cmd_item_list(conn: Connection, day_id: int) -> int:
+def cmd_item_list(conn: Connection, day_id: int, archive_path: str | None = None) -> int:
     """
-    List items for a day (summary).
+    List items for a day (summary), from the archive if archive_path is given.
     """
     if not isinstance(day_id, int) or day_id <= 0:
         raise ValidationError("day_id must be a positive integer.")
 
-    items = list_items_for_day(conn, day_id)
+    if archive_path is not None:
+        items = archive_service.list_archived_items(conn, archive_path, day_id)
+    else:
+        items = list_items_for_day(conn, day_id)
     if not items:
         print("No items found for this day.")
         return 0
@@ -146,7 +161,15 @@ def cmd_item_list(conn: Connection, day_id: int) -> int:
     rows: list[list[str]] = []
 
     for it in items:
-        time_str = "ALL DAY" if it.get("is_all_day") else f"{fmt_minutes(it.get('start_min'))}–{fmt_minutes(it.get('end_min'))}"
+        if it.get("is_all_day"):
+            time_str = "ALL DAY"
+        elif it.get("span_end_min"):
+            days, end = divmod(it["span_end_min"], 1440)
+            time_str = f"{fmt_minutes(it.get('start_min'))}–{fmt_minutes(end)}{_fmt_days_later(days)}"
+        else:
+            time_str = f"{fmt_minutes(it.get('start_min'))}–{fmt_minutes(it.get('end_min'))}"
+        if it.get("timezone") and it.get("start_min") is not None:
+            time_str = f"{time_str} {it['timezone']}"
         pinned_str = "Y" if it.get("pinned") else ""
         est = fmt_money(it.get("estimated_cost"), it.get("currency"))
         actual = fmt_money(it.get("actual_cost"), it.get("currency"))
@@ -200,6 +223,24 @@ def cmd_item_delete(conn: Connection, item_id: int) -> int:
     return 0
 
 
+def cmd_item_move(
+    conn: Connection,
+    item_id: int,
+    *,
+    before_id: int | None = None,
+    after_id: int | None = None,
+) -> int:
+    """
+    Reorder an unscheduled item relative to another item of the same day.
+    """
+    item_service.move_item(conn, item_id, before_id=before_id, after_id=after_id)
+    if before_id is not None:
+        print(f"Moved item id={item_id} before item id={before_id}")
+    else:
+        print(f"Moved item id={item_id} after item id={after_id}")
+    return 0
+
+
 def cmd_item_check(conn: Connection, day_id: int, buffer_min: int = 15) -> int:
     """
     Run scheduling diagnostics for a day.
@@ -235,6 +276,66 @@ def cmd_item_check(conn: Connection, day_id: int, buffer_min: int = 15) -> int:
     return 0
 
 
+def cmd_item_check_many(conn: Connection, trip_id: int | None, buffer_min: int = 15) -> int:
+    """
+    Run scheduling diagnostics for every day of a trip, or of the whole database when trip_id is None.
+    """
+    results, stats = diagnostics_service.check_days(conn, trip_id=trip_id, buffer_min=buffer_min)
+
+    issues = [r for r in results if r["overlaps"] or r["tight_connections"]]
+    if not issues:
+        print("No scheduling issues found.")
+
+    for r in issues:
+        print(f"Day {r['day_id']} ({r['date']}, trip {r['trip_id']}):")
+        if r["overlaps"]:
+            print("Overlaps:")
+            headers = ["Item A", "Item B", "Overlap (min)"]
+            rows = [[str(o["item_a_id"]), str(o["item_b_id"]), str(o["overlap_min"])] for o in r["overlaps"]]
+            print_table(headers, rows)
+        if r["tight_connections"]:
+            print(f"Tight connections (gap < {buffer_min} min):")
+            headers = ["Prev Item", "Next Item", "Gap (min)"]
+            rows = [
+                [str(t["prev_item_id"]), str(t["next_item_id"]), str(t["gap_min"])]
+                for t in r["tight_connections"]
+            ]
+            print_table(headers, rows)
+
+    print(
+        f"Checked {stats['days']} day(s): {stats['hits']} cached, {stats['misses']} recomputed "
+        f"(hit rate {stats['hit_rate']:.0%})"
+    )
+    return 0
+
+
+def cmd_item_check_timeline(conn: Connection, trip_id: int, buffer_min: int = 15) -> int:
+    """
+    Run scheduling diagnostics across a trip's whole timeline, including items spanning midnight.
+    """
+    result = item_service.check_trip_timeline(conn, trip_id, buffer_min=buffer_min)
+    overlaps = result["overlaps"]
+    tight = result["tight_connections"]
+
+    if not overlaps and not tight:
+        print("No scheduling issues found.")
+        return 0
+
+    if overlaps:
+        print("Overlaps:")
+        headers = ["Item A", "Item B", "Overlap (min)"]
+        rows = [[str(o["item_a_id"]), str(o["item_b_id"]), str(o["overlap_min"])] for o in overlaps]
+        print_table(headers, rows)
+
+    if tight:
+        print(f"Tight connections (gap < {buffer_min} min):")
+        headers = ["Prev Item", "Next Item", "Gap (min)"]
+        rows = [[str(t["prev_item_id"]), str(t["next_item_id"]), str(t["gap_min"])] for t in tight]
+        print_table(headers, rows)
+
+    return 0
+
+
 def cmd_item_update(
     conn,
     item_id: int,
@@ -248,36 +349,35 @@ def cmd_item_update(
     end: int | None,
     clear_time: bool,
     allow_overlap: bool,
+    timezone: str | None = None,
+    clear_timezone: bool = False,
+    if_updated_at: str | None = None,
 ) -> int:
 
     if clear_time and (start is not None or end is not None):
         raise ValueError("Cannot use --clear-time with --start/--end.")
+    if clear_timezone and timezone is not None:
+        raise ValueError("Cannot use --clear-tz with --tz.")
+    if (start is None) != (end is None):
+        raise ValueError("--start and --end must both be provided.")
+
+    # One validated, version-checked write: nothing is applied unless all of it is.
+    version = item_service.update_item(
+        conn,
+        item_id,
+        title=title,
+        category=category,
+        notes=notes,
+        tags=tags,
+        pinned=(bool(pinned) if pinned is not None else None),
+        start_min=start,
+        end_min=end,
+        clear_time=clear_time,
+        timezone=timezone,
+        clear_timezone=clear_timezone,
+        reject_overlaps=not allow_overlap,
+        expected_updated_at=if_updated_at,
+    )
 
-    if start is not None or end is not None:
-        if start is None or end is None:
-            raise ValueError("--start and --end must both be provided.")
-
-        item_service.set_item_time(
-            conn,
-            item_id,
-            start,
-            end,
-            reject_overlaps=not allow_overlap,
-        )
-
-    elif clear_time:
-        item_service.clear_item_time(conn, item_id)
-
-    if any(v is not None for v in [title, category, notes, tags, pinned]):
-        item_service.update_item_fields(
-            conn,
-            item_id,
-            title=title,
-            category=category,
-            notes=notes,
-            tags=tags,
-            pinned=(bool(pinned) if pinned is not None else None),
-        )
-
-    print(f"Updated item id={item_id}")
+    print(f"Updated item id={item_id} updated_at={version}")
     return 0
\ No newline at end of file
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from sqlite3 import Connection
+
+from travel_planner.cli.formatters import fmt_time_range, print_table
+from travel_planner.services import recurring_service
+
+
+def cmd_recurring_add(
+    conn: Connection,
+    trip_id: int,
+    title: str,
+    category: str,
+    *,
+    start_min: int | None = None,
+    end_min: int | None = None,
+    every_days: int = 1,
+    from_date: str | None = None,
+    until_date: str | None = None,
+    pinned: bool = False,
+) -> int:
+    """
+    Add a recurring item to a trip.
+    """
+    rule_id = recurring_service.add_recurring_item(
+        conn,
+        trip_id,
+        title,
+        category,
+        start_min=start_min,
+        end_min=end_min,
+        every_days=every_days,
+        from_date=from_date,
+        until_date=until_date,
+        pinned=pinned,
+    )
+    print(f"Created recurring item id={rule_id} for trip id={trip_id}")
+    return 0
+
+
+def cmd_recurring_list(conn: Connection, trip_id: int) -> int:
+    """
+    List a trip's recurring items.
+    """
+    rules = recurring_service.list_recurring_items(conn, trip_id)
+    if not rules:
+        print("No recurring items for this trip.")
+        return 0
+
+    rows = [
+        [
+            str(r["id"]),
+            fmt_time_range(r["start_min"], r["end_min"]),
+            r["title"],
+            r["category"],
+            "daily" if r["interval_days"] == 1 else f"every {r['interval_days']} days",
+            r["from_date"] or "",
+            r["until_date"] or "",
+        ]
+        for r in rules
+    ]
+    print_table(["ID", "Time", "Title", "Category", "Repeats", "From", "Until"], rows)
+    return 0
+
+
+def cmd_recurring_delete(conn: Connection, rule_id: int) -> int:
+    recurring_service.delete_recurring_item(conn, rule_id)
+    print(f"Deleted recurring item id={rule_id}")
+    return 0
+
+
+def cmd_recurring_skip(conn: Connection, rule_id: int, day_id: int, undo: bool = False) -> int:
+    """
+    Skip (or, with undo, restore) one day's occurrence of a recurring item.
+    """
+    recurring_service.set_occurrence_skipped(conn, rule_id, day_id, skipped=not undo)
+    verb = "Restored" if undo else "Skipped"
+    print(f"{verb} recurring item id={rule_id} on day id={day_id}")
+    return 0
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from travel_planner.cli.formatters import print_table
+from travel_planner.persistence.tenants import TenantRouter
+from travel_planner.services import tenant_service
+
+
+def cmd_tenant_list(router: TenantRouter) -> int:
+    """
+    List tenants that have a database in the tenants directory.
+    """
+    tenants = router.list_tenants()
+    if not tenants:
+        print(f"No tenants found in {router.directory}.")
+        return 0
+    for tenant_id in tenants:
+        print(tenant_id)
+    return 0
+
+
+def cmd_tenant_maintain(router: TenantRouter, workers: int) -> int:
+    """
+    Run integrity check + optimize on every tenant database in parallel; non-zero exit if any failed.
+    """
+    results = tenant_service.maintain_tenants(router, workers=workers)
+    if not results:
+        print(f"No tenants found in {router.directory}.")
+        return 0
+
+    headers = ["Tenant", "Status", "Seconds"]
+    rows = [
+        [r["tenant"], r["integrity"] if "integrity" in r else f"error: {r['error']}", f"{r['seconds']:.3f}"]
+        for r in results
+    ]
+    print_table(headers, rows)
+    failed = sum(1 for r in results if not r["ok"])
+    if failed:
+        print(f"{failed} tenant(s) need attention.")
+        return 1
+    return 0
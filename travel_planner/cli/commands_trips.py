@@ -3,8 +3,8 @@ from __future__ import annotations
 from sqlite3 import Connection
 
 from travel_planner.domain.validators import ValidationError
-from travel_planner.services import trip_service
-from travel_planner.cli.formatters import print_table
+from travel_planner.services import archive_service, day_service, snapshot_service, stats_service, trip_service
+from travel_planner.cli.formatters import fmt_duration, fmt_spend, print_stats_categories, print_table
 
 # Prefer service layer when present
 try:
@@ -36,10 +36,23 @@ def cmd_trip_create(conn: Connection, name: str) -> int:
     return 0
 
 
-def cmd_trip_list(conn: Connection) -> int:
+def cmd_trip_list(conn: Connection, archive_path: str | None = None) -> int:
     """
-    List all trips.
+    List all trips, or the archived ones when archive_path is given.
     """
+    if archive_path is not None:
+        trips = archive_service.list_archived_trips(conn, archive_path)
+        if not trips:
+            print("No archived trips found.")
+            return 0
+        headers = ["ID", "Name", "First day", "Last day"]
+        rows = [
+            [str(t["id"]), str(t["name"]), t["first_date"] or "—", t["last_date"] or "—"]
+            for t in trips
+        ]
+        print_table(headers, rows)
+        return 0
+
     trips = list_trips(conn)
     if not trips:
         print("No trips found.")
@@ -51,6 +64,108 @@ def cmd_trip_list(conn: Connection) -> int:
     return 0
 
 
+def cmd_trip_archive(conn: Connection, archive_path: str, before: str) -> int:
+    """
+    Move trips that ended before a date into the archive database.
+    """
+    counts = archive_service.archive_trips(conn, archive_path, before=before)
+    print(
+        f"Archived {counts['trips']} trip(s), {counts['days']} day(s), "
+        f"{counts['items']} item(s) to {archive_path}"
+    )
+    return 0
+
+
+def cmd_trip_unarchive(conn: Connection, archive_path: str, trip_id: int) -> int:
+    """
+    Move one trip back from the archive database.
+    """
+    counts = archive_service.unarchive_trip(conn, archive_path, trip_id)
+    print(f"Restored trip id={trip_id} ({counts['days']} day(s), {counts['items']} item(s))")
+    return 0
+
+
+def cmd_trip_clone(
+    conn: Connection,
+    trip_id: int,
+    name: str,
+    *,
+    shift_days: int | None = None,
+    start_date: str | None = None,
+) -> int:
+    """
+    Copy a trip (days and items) under a new name, optionally moving its dates.
+    """
+    result = trip_service.clone_trip(conn, trip_id, name, shift_days=shift_days, start_date=start_date)
+    print(
+        f"Cloned trip id={trip_id} as id={result['trip_id']} "
+        f"({result['days']} day(s), {result['items']} item(s), dates shifted {result['shift_days']:+d} day(s))"
+    )
+    return 0
+
+
+def cmd_trip_shift(conn: Connection, trip_id: int, days: int) -> int:
+    """
+    Move every day of a trip by a number of days in one transaction.
+    """
+    moved = day_service.shift_trip_days(conn, trip_id, days)
+    print(f"Shifted {moved} day(s) of trip id={trip_id} by {days:+d} day(s)")
+    return 0
+
+
+def cmd_trip_snapshot(conn: Connection, trip_id: int, out_path: str, compress: bool) -> int:
+    """
+    Write a trip to a binary snapshot file.
+    """
+    with open(out_path, "wb") as f:
+        counts = snapshot_service.snapshot_trip(conn, trip_id, f, compress=compress)
+    print(f"Wrote trip id={trip_id} ({counts['days']} day(s), {counts['items']} item(s)) to {out_path}")
+    return 0
+
+
+def cmd_trip_restore(conn: Connection, in_path: str, name: str | None = None) -> int:
+    """
+    Load a binary snapshot as a new trip.
+    """
+    with open(in_path, "rb") as f:
+        result = snapshot_service.restore_trip(conn, f, name=name)
+    print(
+        f"Restored trip id={result['trip_id']} "
+        f"({result['days']} day(s), {result['items']} item(s)) from {in_path}"
+    )
+    return 0
+
+
+def cmd_trip_stats(conn: Connection, trip_id: int, cache_path: str | None = None) -> int:
+    """
+    Print spend and schedule utilization for a trip, per day and per category.
+    """
+    stats = stats_service.trip_stats(conn, trip_id, cache_path=cache_path)
+    t = stats["trip"]
+    print(
+        f"Trip {t['trip_id']} ({t['name']}): {t['days']} day(s), {t['items']} item(s), "
+        f"{fmt_duration(t['busy_min'])} busy, {fmt_duration(t['idle_min'])} idle, spend {fmt_spend(t['spend'])}"
+    )
+    print()
+    print_table(
+        ["Date", "Items", "Scheduled", "Busy", "Idle", "Spend"],
+        [
+            [
+                d["date"],
+                str(d["items"]),
+                str(d["scheduled"]),
+                fmt_duration(d["busy_min"]),
+                fmt_duration(d["idle_min"]),
+                fmt_spend(d["spend"]),
+            ]
+            for d in stats["days"]
+        ],
+    )
+    print()
+    print_stats_categories(stats["categories"])
+    return 0
+
+
 def cmd_trip_delete(conn: Connection, trip_id: int) -> int:
     """
     Delete a trip by id.
@@ -65,4 +180,4 @@ def cmd_trip_delete(conn: Connection, trip_id: int) -> int:
 def cmd_trip_rename(conn, trip_id: int, name: str) -> int:
     trip_service.rename_trip(conn, trip_id, name)
     print(f"Renamed trip id={trip_id}")
-    return 0
\ No newline at end of file
+    return 0
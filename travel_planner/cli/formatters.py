@@ -47,6 +47,15 @@ def fmt_money(amount: float | None, currency: str | None) -> str:
     return f"{amount:,.2f}"
 
 
+def fmt_spend(spend: dict[str, float]) -> str:
+    """
+    Format per-currency totals (currency -> amount), e.g. "120.00 EUR, 35.50 USD".
+    """
+    if not spend:
+        return "—"
+    return ", ".join(fmt_money(spend[cur], cur) for cur in sorted(spend))
+
+
 def print_table(headers: list[str], rows: list[list[str]]) -> None:
     """
     Print a simple aligned table to stdout.
@@ -125,4 +134,21 @@ def fmt_time_range(start_min: int | None, end_min: int | None, *, is_all_day: bo
         return "UNSCHEDULED"
     if start_min is None or end_min is None:
         return "INVALID"
-    return f"{fmt_minutes(start_min)}–{fmt_minutes(end_min)}"
\ No newline at end of file
+    return f"{fmt_minutes(start_min)}–{fmt_minutes(end_min)}"
+
+
+def print_stats_categories(categories: list[dict[str, Any]]) -> None:
+    """
+    Print the per-category table shared by `trip stats` and `db stats`.
+    """
+    print_table(
+        ["Category", "Items", "Scheduled", "Spend"],
+        [[c["category"], str(c["items"]), fmt_duration(c["scheduled_min"]), fmt_spend(c["spend"])] for c in categories],
+    )
+
+
+def fmt_duration(mins: int) -> str:
+    """
+    Format a number of minutes as a duration, e.g. 135 -> "2h15m".
+    """
+    return f"{mins // 60}h{mins % 60:02d}m"
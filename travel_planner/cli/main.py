@@ -1,19 +1,35 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sqlite3
 import sys
 from typing import Any
 
+from travel_planner.config import settings
+from travel_planner.domain.exceptions import ConflictError
 from travel_planner.domain.validators import ValidationError
+from travel_planner.observability import metrics
+from travel_planner.observability.profiler import ProfiledConnection, Profiler
 from travel_planner.persistence.db import connect
 from travel_planner.persistence.schema import init_schema
+from travel_planner.persistence.tenants import TenantRouter
+from travel_planner.services.archive_service import default_archive_path
+from travel_planner.services.backup_service import DEFAULT_PAGES_PER_STEP, DEFAULT_STEP_SLEEP
+from travel_planner.services.tenant_service import validate_tenant_id
 
 from travel_planner.cli.commands_trips import (
+    cmd_trip_archive,
+    cmd_trip_clone,
     cmd_trip_create,
     cmd_trip_delete,
     cmd_trip_list,
     cmd_trip_rename,
+    cmd_trip_restore,
+    cmd_trip_shift,
+    cmd_trip_snapshot,
+    cmd_trip_stats,
+    cmd_trip_unarchive,
 )
 from travel_planner.cli.commands_days import (
     cmd_day_add,
@@ -27,9 +43,26 @@ from travel_planner.cli.commands_items import (
     cmd_item_delete,
     cmd_item_get,
     cmd_item_list,
+    cmd_item_move,
     cmd_item_update,
     cmd_item_check,
+    cmd_item_check_many,
+    cmd_item_check_timeline,
 )
+from travel_planner.cli.commands_export import (
+    cmd_export_changes,
+    cmd_export_compact,
+    cmd_export_trip,
+)
+from travel_planner.cli.commands_db import cmd_db_backup, cmd_db_stats
+from travel_planner.cli.commands_agenda import cmd_agenda
+from travel_planner.cli.commands_recurring import (
+    cmd_recurring_add,
+    cmd_recurring_delete,
+    cmd_recurring_list,
+    cmd_recurring_skip,
+)
+from travel_planner.cli.commands_tenants import cmd_tenant_list, cmd_tenant_maintain
 
 DEFAULT_DB_PATH = "travel_planner.db"
 
@@ -42,6 +75,44 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_DB_PATH,
         help=f"Path to SQLite database file (default: {DEFAULT_DB_PATH})",
     )
+    parser.add_argument(
+        "--archive",
+        dest="archive_path",
+        default=None,
+        help="Path to the archive database (default: <db>.archive.db next to --db)",
+    )
+    parser.add_argument(
+        "--tenants-dir",
+        default=settings.tenants_dir(),
+        help=f"Directory holding one database per tenant (or set {settings.TENANTS_DIR_ENV})",
+    )
+    parser.add_argument(
+        "--tenant",
+        default=None,
+        help="Use <tenants-dir>/<tenant>.db instead of --db",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=settings.profile_enabled(),
+        help=f"Print SQL and service timings to stderr when the command finishes (or set {settings.PROFILE_ENV}=1)",
+    )
+    parser.add_argument(
+        "--slow-log",
+        default=settings.slow_log_path(),
+        help="Append statements slower than --slow-ms to this file (implies --profile)",
+    )
+    parser.add_argument(
+        "--slow-ms",
+        type=float,
+        default=settings.slow_query_ms(),
+        help=f"Slow statement threshold in milliseconds (default: {settings.DEFAULT_SLOW_MS:g})",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        default=None,
+        help="Write Prometheus text-format metrics for this command to a file",
+    )
 
     subparsers = parser.add_subparsers(dest="command_group", required=True)
 
@@ -56,6 +127,7 @@ def build_parser() -> argparse.ArgumentParser:
     trip_create.set_defaults(command_group="trip", command_action="create")
 
     trip_list = trip_sp.add_parser("list", help="List trips")
+    trip_list.add_argument("--archived", action="store_true", help="List trips in the archive database instead")
     trip_list.set_defaults(command_group="trip", command_action="list")
 
     trip_delete = trip_sp.add_parser("delete", help="Delete a trip")
@@ -67,6 +139,43 @@ def build_parser() -> argparse.ArgumentParser:
     trip_rename.add_argument("--name", required=True)
     trip_rename.set_defaults(command_group="trip", command_action="rename")
 
+    trip_archive = trip_sp.add_parser("archive", help="Move trips that ended before a date to the archive database")
+    trip_archive.add_argument("--before", required=True, help="YYYY-MM-DD; trips whose last day is earlier move")
+    trip_archive.set_defaults(command_group="trip", command_action="archive")
+
+    trip_unarchive = trip_sp.add_parser("unarchive", help="Move an archived trip back")
+    trip_unarchive.add_argument("--trip-id", type=int, required=True)
+    trip_unarchive.set_defaults(command_group="trip", command_action="unarchive")
+
+    trip_clone = trip_sp.add_parser("clone", help="Copy a trip with its days and items, optionally shifting dates")
+    trip_clone.add_argument("--trip-id", type=int, required=True)
+    trip_clone.add_argument("--name", required=True)
+    trip_clone_shift = trip_clone.add_mutually_exclusive_group()
+    trip_clone_shift.add_argument("--shift-days", type=int, default=None, help="Move every date by N days")
+    trip_clone_shift.add_argument("--start-date", default=None, help="YYYY-MM-DD for the copy's first day")
+    trip_clone.set_defaults(command_group="trip", command_action="clone")
+
+    trip_shift = trip_sp.add_parser("shift", help="Move every day of a trip by N days (atomically)")
+    trip_shift.add_argument("--trip-id", type=int, required=True)
+    trip_shift.add_argument("--days", type=int, required=True, help="Days to move by; negative moves earlier")
+    trip_shift.set_defaults(command_group="trip", command_action="shift")
+
+    trip_snapshot = trip_sp.add_parser("snapshot", help="Write a trip to a compact binary snapshot file")
+    trip_snapshot.add_argument("--trip-id", type=int, required=True)
+    trip_snapshot.add_argument("--out", required=True)
+    trip_snapshot.add_argument("--compress", action="store_true", help="zlib-compress the snapshot body")
+    trip_snapshot.set_defaults(command_group="trip", command_action="snapshot")
+
+    trip_restore = trip_sp.add_parser("restore", help="Load a binary snapshot as a new trip")
+    trip_restore.add_argument("--in", dest="in_path", required=True)
+    trip_restore.add_argument("--name", default=None, help="Name for the new trip (default: the snapshot's)")
+    trip_restore.set_defaults(command_group="trip", command_action="restore")
+
+    trip_stats = trip_sp.add_parser("stats", help="Spend and schedule utilization per day and category")
+    trip_stats.add_argument("--trip-id", type=int, required=True)
+    trip_stats.add_argument("--cache", dest="cache_path", default=None, help="Reuse results until the data changes")
+    trip_stats.set_defaults(command_group="trip", command_action="stats")
+
     # ----------------
     # day
     # ----------------
@@ -78,8 +187,11 @@ def build_parser() -> argparse.ArgumentParser:
     day_add.add_argument("--date", required=True, help="YYYY-MM-DD")
     day_add.set_defaults(command_group="day", command_action="add")
 
-    day_list = day_sp.add_parser("list", help="List days for a trip")
-    day_list.add_argument("--trip-id", type=int, required=True)
+    day_list = day_sp.add_parser("list", help="List days for a trip, or across trips in a date range")
+    day_list.add_argument("--trip-id", type=int, default=None)
+    day_list.add_argument("--from", dest="from_date", default=None, help="YYYY-MM-DD, inclusive")
+    day_list.add_argument("--to", dest="to_date", default=None, help="YYYY-MM-DD, inclusive")
+    day_list.add_argument("--archived", action="store_true", help="List an archived trip's days")
     day_list.set_defaults(command_group="day", command_action="list")
 
     day_delete = day_sp.add_parser("delete", help="Delete a day")
@@ -103,10 +215,15 @@ def build_parser() -> argparse.ArgumentParser:
     item_add.add_argument("--category", required=True)
     item_add.add_argument("--start", type=int, default=None, help="Minutes since midnight")
     item_add.add_argument("--end", type=int, default=None, help="Minutes since midnight")
+    item_add.add_argument(
+        "--end-days", type=int, default=0, help="Days after the start day that --end falls on (multi-day items)"
+    )
+    item_add.add_argument("--tz", default=None, help="IANA timezone the times are local to (e.g. Asia/Tokyo)")
     item_add.set_defaults(command_group="item", command_action="add")
 
     item_list = item_sp.add_parser("list", help="List items for a day")
     item_list.add_argument("--day-id", type=int, required=True)
+    item_list.add_argument("--archived", action="store_true", help="Read the day from the archive database")
     item_list.set_defaults(command_group="item", command_action="list")
 
     item_get = item_sp.add_parser("get", help="Show a single item")
@@ -128,16 +245,145 @@ def build_parser() -> argparse.ArgumentParser:
     item_update.add_argument("--end", type=int)
     item_update.add_argument("--clear-time", action="store_true")
     item_update.add_argument("--allow-overlap", action="store_true")
+    item_update.add_argument("--tz", default=None, help="IANA timezone the times are local to")
+    item_update.add_argument("--clear-tz", action="store_true", help="Back to floating local time")
+    item_update.add_argument(
+        "--if-updated-at",
+        default=None,
+        help="Only update if the item's updated_at still equals this value",
+    )
     item_update.set_defaults(command_group="item", command_action="update")
 
-    item_check = item_sp.add_parser("check", help="Check overlaps and tight connections for a day")
-    item_check.add_argument("--day-id", type=int, required=True)
+    item_move = item_sp.add_parser("move", help="Reorder an unscheduled item within its day")
+    item_move.add_argument("--item-id", type=int, required=True)
+    item_move_anchor = item_move.add_mutually_exclusive_group(required=True)
+    item_move_anchor.add_argument("--before", type=int, dest="before_id", help="Place directly before this item")
+    item_move_anchor.add_argument("--after", type=int, dest="after_id", help="Place directly after this item")
+    item_move.set_defaults(command_group="item", command_action="move")
+
+    item_check = item_sp.add_parser("check", help="Check overlaps and tight connections")
+    item_check_scope = item_check.add_mutually_exclusive_group(required=True)
+    item_check_scope.add_argument("--day-id", type=int)
+    item_check_scope.add_argument("--trip-id", type=int, help="Check every day of a trip (cached per day)")
+    item_check_scope.add_argument("--all", action="store_true", help="Check every day in the database (cached per day)")
     item_check.add_argument("--buffer", type=int, default=15)
+    item_check.add_argument(
+        "--timeline", action="store_true", help="With --trip-id: check the whole trip in one pass, across midnight"
+    )
     item_check.set_defaults(command_group="item", command_action="check")
 
+    # ----------------
+    # recurring
+    # ----------------
+    rec_p = subparsers.add_parser("recurring", help="Items that repeat across the days of a trip")
+    rec_sp = rec_p.add_subparsers(dest="command_action", required=True)
+
+    rec_add = rec_sp.add_parser("add", help="Add a recurring item to a trip")
+    rec_add.add_argument("--trip-id", type=int, required=True)
+    rec_add.add_argument("--title", required=True)
+    rec_add.add_argument("--category", required=True)
+    rec_add.add_argument("--start", type=int, default=None, help="Minutes since midnight")
+    rec_add.add_argument("--end", type=int, default=None, help="Minutes since midnight")
+    rec_add.add_argument("--every", type=int, default=1, help="Repeat every N days (default: 1)")
+    rec_add.add_argument("--from", dest="from_date", default=None, help="First date, YYYY-MM-DD")
+    rec_add.add_argument("--until", dest="until_date", default=None, help="Last date, YYYY-MM-DD")
+    rec_add.add_argument("--pinned", action="store_true")
+    rec_add.set_defaults(command_group="recurring", command_action="add")
+
+    rec_list = rec_sp.add_parser("list", help="List a trip's recurring items")
+    rec_list.add_argument("--trip-id", type=int, required=True)
+    rec_list.set_defaults(command_group="recurring", command_action="list")
+
+    rec_delete = rec_sp.add_parser("delete", help="Delete a recurring item and all its occurrences")
+    rec_delete.add_argument("--recurring-id", type=int, required=True)
+    rec_delete.set_defaults(command_group="recurring", command_action="delete")
+
+    rec_skip = rec_sp.add_parser("skip", help="Leave a recurring item out on one day")
+    rec_skip.add_argument("--recurring-id", type=int, required=True)
+    rec_skip.add_argument("--day-id", type=int, required=True)
+    rec_skip.add_argument("--undo", action="store_true", help="Restore a skipped occurrence")
+    rec_skip.set_defaults(command_group="recurring", command_action="skip")
+
+    # ----------------
+    # agenda
+    # ----------------
+    agenda_p = subparsers.add_parser("agenda", help="Items of every trip in a date range, in time order")
+    agenda_p.add_argument("--from", dest="from_date", required=True, help="YYYY-MM-DD, inclusive")
+    agenda_p.add_argument("--to", dest="to_date", required=True, help="YYYY-MM-DD, inclusive")
+    agenda_p.add_argument("--limit", type=int, default=None, help="Print one page of this many items")
+    agenda_p.add_argument("--after", default=None, help="Cursor printed by the previous page")
+    agenda_p.set_defaults(command_group="agenda", command_action="show")
+
+    # ----------------
+    # export
+    # ----------------
+    export_p = subparsers.add_parser("export", help="Export commands")
+    export_sp = export_p.add_subparsers(dest="command_action", required=True)
+
+    export_trip = export_sp.add_parser("trip", help="Export a trip with its days and items as JSON")
+    export_trip.add_argument("--trip-id", type=int, required=True)
+    export_trip.add_argument("--out", default=None, help="Output file (default: stdout)")
+    export_trip.add_argument("--archived", action="store_true", help="Read the trip from the archive database")
+    export_trip.set_defaults(command_group="export", command_action="trip")
+
+    export_changes = export_sp.add_parser("changes", help="Emit rows changed since a change log seq as NDJSON")
+    export_changes.add_argument("--since", type=int, required=True, help="Last seq already consumed (0 = all)")
+    export_changes.add_argument("--out", default=None, help="Output file (default: stdout)")
+    export_changes.set_defaults(command_group="export", command_action="changes")
+
+    export_compact = export_sp.add_parser("compact", help="Delete consumed change log entries")
+    export_compact.add_argument("--through", type=int, default=None, help="Delete entries with seq <= this")
+    export_compact.add_argument("--before", default=None, help="Delete entries logged before YYYY-MM-DD")
+    export_compact.set_defaults(command_group="export", command_action="compact")
+
+    # ----------------
+    # db
+    # ----------------
+    db_p = subparsers.add_parser("db", help="Database maintenance commands")
+    db_sp = db_p.add_subparsers(dest="command_action", required=True)
+
+    db_backup = db_sp.add_parser("backup", help="Online backup that lets writers continue between steps")
+    db_backup.add_argument("--out", required=True, help="Backup file (gzip-compressed if it ends in .gz)")
+    db_backup.add_argument(
+        "--pages",
+        type=int,
+        default=DEFAULT_PAGES_PER_STEP,
+        help=f"Pages copied per step (default: {DEFAULT_PAGES_PER_STEP})",
+    )
+    db_backup.add_argument(
+        "--sleep",
+        type=float,
+        default=DEFAULT_STEP_SLEEP,
+        help=f"Seconds to pause between steps so writers can commit (default: {DEFAULT_STEP_SLEEP:g})",
+    )
+    db_backup.add_argument("--gzip", action="store_true", help="Compress the backup")
+    db_backup.add_argument("--no-verify", action="store_true", help="Skip the integrity check of the copy")
+    db_backup.set_defaults(command_group="db", command_action="backup")
+
+    db_stats = db_sp.add_parser("stats", help="Spend and schedule utilization per trip and category")
+    db_stats.add_argument("--cache", dest="cache_path", default=None, help="Reuse results until the data changes")
+    db_stats.set_defaults(command_group="db", command_action="stats")
+
+    # ----------------
+    # tenant
+    # ----------------
+    tenant_p = subparsers.add_parser("tenant", help="Commands across all tenant databases (needs --tenants-dir)")
+    tenant_sp = tenant_p.add_subparsers(dest="command_action", required=True)
+
+    tenant_list = tenant_sp.add_parser("list", help="List tenants")
+    tenant_list.set_defaults(command_group="tenant", command_action="list")
+
+    tenant_maintain = tenant_sp.add_parser("maintain", help="Integrity check and optimize every tenant database")
+    tenant_maintain.add_argument("--workers", type=int, default=4, help="Tenants processed in parallel (default: 4)")
+    tenant_maintain.set_defaults(command_group="tenant", command_action="maintain")
+
     return parser
 
 
+def _archive_path(args: Any) -> str:
+    return args.archive_path or default_archive_path(args.db_path)
+
+
 def dispatch(conn: sqlite3.Connection, args: Any) -> int:
     group = getattr(args, "command_group", None)
     action = getattr(args, "command_action", None)
@@ -146,17 +392,35 @@ def dispatch(conn: sqlite3.Connection, args: Any) -> int:
         if action == "create":
             return cmd_trip_create(conn, args.name)
         if action == "list":
-            return cmd_trip_list(conn)
+            return cmd_trip_list(conn, _archive_path(args) if args.archived else None)
         if action == "delete":
             return cmd_trip_delete(conn, args.trip_id)
         if action == "rename":
             return cmd_trip_rename(conn, args.trip_id, args.name)
+        if action == "archive":
+            return cmd_trip_archive(conn, _archive_path(args), args.before)
+        if action == "unarchive":
+            return cmd_trip_unarchive(conn, _archive_path(args), args.trip_id)
+        if action == "clone":
+            return cmd_trip_clone(
+                conn, args.trip_id, args.name, shift_days=args.shift_days, start_date=args.start_date
+            )
+        if action == "shift":
+            return cmd_trip_shift(conn, args.trip_id, args.days)
+        if action == "snapshot":
+            return cmd_trip_snapshot(conn, args.trip_id, args.out, args.compress)
+        if action == "restore":
+            return cmd_trip_restore(conn, args.in_path, args.name)
+        if action == "stats":
+            return cmd_trip_stats(conn, args.trip_id, args.cache_path)
 
     if group == "day":
         if action == "add":
             return cmd_day_add(conn, args.trip_id, args.date)
         if action == "list":
-            return cmd_day_list(conn, args.trip_id)
+            return cmd_day_list(
+                conn, args.trip_id, args.from_date, args.to_date, _archive_path(args) if args.archived else None
+            )
         if action == "delete":
             return cmd_day_delete(conn, args.day_id)
         if action == "set-date":
@@ -175,10 +439,12 @@ def dispatch(conn: sqlite3.Connection, args: Any) -> int:
                 args.category,
                 start,
                 end,
+                end_days=args.end_days,
+                timezone=args.tz,
                 reject_overlaps=True,
             )
         if action == "list":
-            return cmd_item_list(conn, args.day_id)
+            return cmd_item_list(conn, args.day_id, _archive_path(args) if args.archived else None)
         if action == "get":
             return cmd_item_get(conn, args.item_id)
         if action == "delete":
@@ -196,21 +462,120 @@ def dispatch(conn: sqlite3.Connection, args: Any) -> int:
                 end=args.end,
                 clear_time=args.clear_time,
                 allow_overlap=args.allow_overlap,
+                timezone=args.tz,
+                clear_timezone=args.clear_tz,
+                if_updated_at=args.if_updated_at,
             )
+        if action == "move":
+            return cmd_item_move(conn, args.item_id, before_id=args.before_id, after_id=args.after_id)
         if action == "check":
-            return cmd_item_check(conn, args.day_id, buffer_min=args.buffer)
+            if args.day_id is not None:
+                return cmd_item_check(conn, args.day_id, buffer_min=args.buffer)
+            if args.timeline:
+                if args.trip_id is None:
+                    raise ValidationError("--timeline requires --trip-id.")
+                return cmd_item_check_timeline(conn, args.trip_id, buffer_min=args.buffer)
+            return cmd_item_check_many(conn, args.trip_id, buffer_min=args.buffer)
+
+    if group == "recurring":
+        if action == "add":
+            return cmd_recurring_add(
+                conn,
+                args.trip_id,
+                args.title,
+                args.category,
+                start_min=args.start,
+                end_min=args.end,
+                every_days=args.every,
+                from_date=args.from_date,
+                until_date=args.until_date,
+                pinned=args.pinned,
+            )
+        if action == "list":
+            return cmd_recurring_list(conn, args.trip_id)
+        if action == "delete":
+            return cmd_recurring_delete(conn, args.recurring_id)
+        if action == "skip":
+            return cmd_recurring_skip(conn, args.recurring_id, args.day_id, args.undo)
+
+    if group == "agenda":
+        return cmd_agenda(conn, args.from_date, args.to_date, limit=args.limit, after=args.after)
+
+    if group == "export":
+        if action == "trip":
+            return cmd_export_trip(
+                conn, args.trip_id, args.out, _archive_path(args) if args.archived else None
+            )
+        if action == "changes":
+            return cmd_export_changes(conn, args.since, args.out)
+        if action == "compact":
+            return cmd_export_compact(conn, args.through, args.before)
+
+    if group == "db":
+        if action == "backup":
+            return cmd_db_backup(
+                conn,
+                args.out,
+                pages=args.pages,
+                sleep=args.sleep,
+                compress=args.gzip or args.out.endswith(".gz"),
+                verify=not args.no_verify,
+            )
+        if action == "stats":
+            return cmd_db_stats(conn, args.cache_path)
 
     print("Unknown command. Use -h for help.", file=sys.stderr)
     return 1
 
 
+def dispatch_tenants(router: TenantRouter, args: Any) -> int:
+    action = getattr(args, "command_action", None)
+    if action == "list":
+        return cmd_tenant_list(router)
+    if action == "maintain":
+        return cmd_tenant_maintain(router, args.workers)
+
+    print("Unknown command. Use -h for help.", file=sys.stderr)
+    return 1
+
+
+def _tenant_router(args: Any, **kwargs: Any) -> TenantRouter:
+    if not args.tenants_dir:
+        raise ValidationError(f"--tenants-dir (or {settings.TENANTS_DIR_ENV}) is required for tenant commands.")
+    return TenantRouter(args.tenants_dir, **kwargs)
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if args.metrics_out:
+        metrics.enable_metrics()
+
+    profiler: Profiler | None = None
+    if args.profile or args.slow_log:
+        profiler = Profiler(slow_log_path=args.slow_log, slow_ms=args.slow_ms)
+        profiler.start()
+
     conn: sqlite3.Connection | None = None
     try:
-        conn = connect(args.db_path)
+        if args.command_group == "tenant":
+            router = _tenant_router(args, max_open=max(args.workers, 1) if args.command_action == "maintain" else 1)
+            try:
+                return dispatch_tenants(router, args)
+            finally:
+                router.close()
+
+        if args.tenant is not None:
+            validate_tenant_id(args.tenant)
+            args.db_path = _tenant_router(args).db_path(args.tenant)
+            os.makedirs(args.tenants_dir, exist_ok=True)
+
+        if profiler is not None:
+            conn = connect(args.db_path, factory=ProfiledConnection)
+            profiler.attach(conn)
+        else:
+            conn = connect(args.db_path)
         init_schema(conn)
         return dispatch(conn, args)
 
@@ -226,9 +591,20 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Database operational error: {e}", file=sys.stderr)
         return 4
 
+    except ConflictError as e:
+        print(f"Conflict: {e}", file=sys.stderr)
+        return 5
+
     finally:
         if conn is not None:
             conn.close()
+        if profiler is not None:
+            profiler.stop()
+            if args.profile:
+                profiler.print_summary()
+        registry = metrics.get_registry()
+        if args.metrics_out and registry is not None:
+            registry.write_textfile(args.metrics_out)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+'''
+Purpose: Runtime settings read from the environment.
+'''
+
+from __future__ import annotations
+
+import os
+
+PROFILE_ENV = "TRAVEL_PLANNER_PROFILE"
+SLOW_LOG_ENV = "TRAVEL_PLANNER_SLOW_LOG"
+SLOW_MS_ENV = "TRAVEL_PLANNER_SLOW_MS"
+
+DEFAULT_SLOW_MS = 50.0
+
+_TRUE = {"1", "true", "yes", "on"}
+
+
+def env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in _TRUE
+
+
+def env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def profile_enabled() -> bool:
+    return env_flag(PROFILE_ENV)
+
+
+def slow_log_path() -> str | None:
+    return os.environ.get(SLOW_LOG_ENV) or None
+
+
+def slow_query_ms() -> float:
+    return env_float(SLOW_MS_ENV, DEFAULT_SLOW_MS)
+
+
+TENANTS_DIR_ENV = "TRAVEL_PLANNER_TENANTS_DIR"
+
+
+def tenants_dir() -> str | None:
+    return os.environ.get(TENANTS_DIR_ENV) or None
@@ -0,0 +1,7 @@
+# travel_planner/domain/exceptions.py
+
+from __future__ import annotations
+
+
+class ConflictError(Exception):
+    """Raised when a version-checked update finds the row changed since the caller read it."""
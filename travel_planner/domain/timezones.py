@@ -0,0 +1,82 @@
+# travel_planner/domain/timezones.py
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from travel_planner.domain.validators import ValidationError
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def validate_timezone(name: str | None) -> None:
+    """
+    Validates an IANA timezone name (e.g. "Asia/Tokyo").
+
+    None is allowed: the item keeps floating local time.
+    """
+    if name is None:
+        return
+    if not isinstance(name, str) or not name.strip():
+        raise ValidationError("timezone must be a non-blank string.")
+    try:
+        _zone(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(f"unknown timezone: {name}") from None
+
+
+def utc_minutes(date_str: str, minute: int, tz: str | None) -> int:
+    """
+    Minutes since the Unix epoch (UTC) of local `minute` past midnight of date_str in tz.
+
+    minute may run past 1440 into the following days. Without a timezone
+    the local time is taken as UTC, so floating items keep their naive order
+    among themselves.
+    """
+    days, minute = divmod(minute, 1440)
+    ordinal = _ordinal(date_str) + days
+    local = (ordinal - _EPOCH_ORDINAL) * 1440 + minute
+    if tz is None:
+        return local
+
+    at_start, at_end = _day_offsets(tz, ordinal)
+    if at_start == at_end:
+        return local - at_start
+    # The offset changes during this day (DST): ask zoneinfo for this minute.
+    # Wall times skipped or repeated by the change resolve with fold=0.
+    moment = datetime.combine(date.fromordinal(ordinal), time(minute // 60, minute % 60), _zone(tz))
+    return local - _offset_min(moment)
+
+
+def offset_cache_info():
+    """
+    Hit/miss statistics of the (tz, date) offset cache.
+    """
+    return _day_offsets.cache_info()
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+# Items repeat the same few dates; parse each distinct string once.
+@lru_cache(maxsize=4096)
+def _ordinal(date_str: str) -> int:
+    return date.fromisoformat(date_str).toordinal()
+
+
+# Keyed by (tz, date): a trip touches few of each, so nearly every lookup is a hit.
+@lru_cache(maxsize=16384)
+def _day_offsets(tz: str, ordinal: int) -> tuple[int, int]:
+    zone = _zone(tz)
+    day = date.fromordinal(ordinal)
+    start = datetime.combine(day, time(), zone)
+    end = datetime.combine(day + timedelta(days=1), time(), zone)
+    return _offset_min(start), _offset_min(end)
+
+
+def _offset_min(moment: datetime) -> int:
+    return int(moment.utcoffset().total_seconds()) // 60
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import numbers
+import operator
 import re
+from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
+from typing import Sequence
 
 
 class ValidationError(ValueError):
@@ -19,22 +24,29 @@ def validate_time_range(start_min: int | None, end_min: int | None) -> None:
       - If provided: 0 <= start_min <= 1440 and 0 <= end_min <= 1440
       - If provided: start_min < end_min
     """
+    error = _time_range_error(start_min, end_min)
+    if error is not None:
+        raise ValidationError(error)
+
+
+def _time_range_error(start_min, end_min) -> str | None:
     if (start_min is None) != (end_min is None):
-        raise ValidationError("start_min and end_min must be both set or both None.")
+        return "start_min and end_min must be both set or both None."
 
     if start_min is None and end_min is None:
-        return
+        return None
 
     if not isinstance(start_min, int) or not isinstance(end_min, int):
-        raise ValidationError("start_min and end_min must be integers (minutes since midnight).")
+        return "start_min and end_min must be integers (minutes since midnight)."
 
     if not (0 <= start_min <= 1440):
-        raise ValidationError("start_min must be between 0 and 1440.")
+        return "start_min must be between 0 and 1440."
     if not (0 <= end_min <= 1440):
-        raise ValidationError("end_min must be between 0 and 1440.")
+        return "end_min must be between 0 and 1440."
 
     if start_min >= end_min:
-        raise ValidationError("start_min must be strictly less than end_min.")
+        return "start_min must be strictly less than end_min."
+    return None
 
 
 def validate_cost(value: float | None, *, max_reasonable: float = 1_000_000.0) -> None:
@@ -46,17 +58,24 @@ def validate_cost(value: float | None, *, max_reasonable: float = 1_000_000.0) -
       - If provided: value must be >= 0
       - Optionally blocks absurdly large values (default threshold can be changed)
     """
+    error = _cost_error(value, max_reasonable)
+    if error is not None:
+        raise ValidationError(error)
+
+
+def _cost_error(value, max_reasonable: float) -> str | None:
     if value is None:
-        return
+        return None
 
     if not isinstance(value, (int, float)):
-        raise ValidationError("cost must be a number.")
+        return "cost must be a number."
 
     if value < 0:
-        raise ValidationError("cost must not be negative.")
+        return "cost must not be negative."
 
     if value > max_reasonable:
-        raise ValidationError(f"cost is unusually large (>{max_reasonable}).")
+        return f"cost is unusually large (>{max_reasonable})."
+    return None
 
 
 _DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
@@ -73,11 +92,128 @@ def validate_date_string(date_str: str) -> None:
     if not isinstance(date_str, str):
         raise ValidationError("date must be a string in YYYY-MM-DD format.")
 
+    error = _date_error(date_str)
+    if error is not None:
+        raise ValidationError(error)
+
+
+# Feeds repeat the same few dates many times; parse each distinct string once.
+@lru_cache(maxsize=4096)
+def _date_error(date_str: str) -> str | None:
     if not _DATE_RE.match(date_str):
-        raise ValidationError("date must be in YYYY-MM-DD format.")
+        return "date must be in YYYY-MM-DD format."
 
     y, m, d = date_str.split("-")
     try:
         date(int(y), int(m), int(d))
-    except ValueError as e:
-        raise ValidationError(f"invalid date: {date_str}") from e
\ No newline at end of file
+    except ValueError:
+        return f"invalid date: {date_str}"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Batch validators: one pass over columns of values, collecting every error
+# instead of raising on the first. Messages match the scalar validators.
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class BatchValidation:
+    """
+    Result of a batch validator.
+
+    mask[i] is True when row i is invalid; errors maps those row indexes to
+    the message the scalar validator would have raised.
+    """
+
+    mask: list[bool]
+    errors: dict[int, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_first(self) -> None:
+        """
+        Raise ValidationError for the first invalid row (prefixed with its index), if any.
+        """
+        if self.errors:
+            i, message = next(iter(self.errors.items()))
+            raise ValidationError(f"row {i}: {message}")
+
+
+# Columns may hold NumPy (or other) scalars that are not int/float subclasses;
+# the fallbacks convert them before the scalar checks so they validate like
+# the plain numbers they stand for.
+
+
+def _as_int(value):
+    if value is None or type(value) is int:
+        return value
+    try:
+        return operator.index(value)
+    except TypeError:
+        return value
+
+
+def _as_number(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    number = _as_int(value)
+    if number is value and isinstance(value, numbers.Real):
+        return float(value)
+    return number
+
+
+def _collect(n: int, errors: dict[int, str]) -> BatchValidation:
+    mask = [False] * n
+    for i in errors:
+        mask[i] = True
+    return BatchValidation(mask, errors)
+
+
+def validate_time_ranges(starts: Sequence[int | None], ends: Sequence[int | None]) -> BatchValidation:
+    """
+    Batch form of validate_time_range over parallel start/end columns.
+    """
+    if len(starts) != len(ends):
+        raise ValidationError("starts and ends must have the same length.")
+
+    errors: dict[int, str] = {}
+    for i, (start_min, end_min) in enumerate(zip(starts, ends)):
+        # Fast path for the common valid scheduled row; anything else takes the full check.
+        if type(start_min) is int and type(end_min) is int and 0 <= start_min < end_min <= 1440:
+            continue
+        error = _time_range_error(_as_int(start_min), _as_int(end_min))
+        if error is not None:
+            errors[i] = error
+    return _collect(len(starts), errors)
+
+
+def validate_costs(values: Sequence[float | None], *, max_reasonable: float = 1_000_000.0) -> BatchValidation:
+    """
+    Batch form of validate_cost.
+    """
+    errors: dict[int, str] = {}
+    for i, value in enumerate(values):
+        if (type(value) is float or type(value) is int) and 0 <= value <= max_reasonable:
+            continue
+        error = _cost_error(_as_number(value), max_reasonable)
+        if error is not None:
+            errors[i] = error
+    return _collect(len(values), errors)
+
+
+def validate_date_strings(values: Sequence[str]) -> BatchValidation:
+    """
+    Batch form of validate_date_string; each distinct string is parsed once.
+    """
+    errors: dict[int, str] = {}
+    for i, date_str in enumerate(values):
+        if not isinstance(date_str, str):
+            errors[i] = "date must be a string in YYYY-MM-DD format."
+            continue
+        error = _date_error(date_str)
+        if error is not None:
+            errors[i] = error
+    return _collect(len(values), errors)
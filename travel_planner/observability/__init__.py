@@ -0,0 +1,3 @@
+"""
+Profiling and instrumentation for travel_planner.
+"""
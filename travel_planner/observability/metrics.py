@@ -0,0 +1,241 @@
+'''
+Purpose: In-process metrics registry with Prometheus text exposition.
+
+Metrics are off until enable_metrics() is called; until then inc() and
+observe() return after a single module-global check, so instrumented code
+paths cost next to nothing in the CLI. Counters and histograms are keyed by
+a sorted label tuple and guarded by one lock, which is enough for the
+threaded API server.
+'''
+
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+import threading
+from typing import Iterable
+
+SERVICE_CALLS = "travel_planner_service_calls_total"
+SERVICE_DURATION = "travel_planner_service_duration_seconds"
+OVERLAP_REJECTIONS = "travel_planner_overlap_rejections_total"
+DB_STATEMENTS = "travel_planner_db_statements_total"
+DB_COMMITS = "travel_planner_db_commits_total"
+DB_ROWS_READ = "travel_planner_db_rows_read_total"
+DB_COMMIT_DURATION = "travel_planner_db_commit_duration_seconds"
+DB_BUSY_RETRIES = "travel_planner_db_busy_retries_total"
+DB_BUSY_EXHAUSTED = "travel_planner_db_busy_exhausted_total"
+WRITE_QUEUE_BATCHES = "travel_planner_write_queue_batches_total"
+WRITE_QUEUE_OPS = "travel_planner_write_queue_ops_total"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# (name, type, help) for every metric the package emits; registered up front
+# so a scrape shows HELP/TYPE lines before the first observation.
+STANDARD_METRICS = (
+    (SERVICE_CALLS, "counter", "Service function calls by function and outcome."),
+    (SERVICE_DURATION, "histogram", "Service function latency in seconds."),
+    (OVERLAP_REJECTIONS, "counter", "Scheduled items rejected because they overlap an existing item."),
+    (DB_STATEMENTS, "counter", "SQL statements executed through instrumented connections."),
+    (DB_COMMITS, "counter", "Transactions committed through instrumented connections."),
+    (DB_ROWS_READ, "counter", "Rows fetched from SQLite through instrumented connections."),
+    (DB_COMMIT_DURATION, "histogram", "Commit latency in seconds."),
+    (DB_BUSY_RETRIES, "counter", "Write transactions retried after SQLITE_BUSY, by function."),
+    (DB_BUSY_EXHAUSTED, "counter", "Write transactions that stayed SQLITE_BUSY through every retry, by function."),
+    (WRITE_QUEUE_BATCHES, "counter", "Group commits made by write queues."),
+    (WRITE_QUEUE_OPS, "counter", "Operations run by write queues, by outcome."),
+)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, object]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.values: dict[LabelKey, float] = {}
+
+    def inc(self, key: LabelKey, amount: float) -> None:
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> Iterable[str]:
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(key)} {_format_value(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts (non-cumulative)..., +Inf count, sum]
+        self.values: dict[LabelKey, list[float]] = {}
+
+    def observe(self, key: LabelKey, value: float) -> None:
+        state = self.values.get(key)
+        if state is None:
+            state = self.values[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        else:
+            state[len(self.buckets)] += 1
+        state[-1] += value
+
+    def render(self) -> Iterable[str]:
+        for key, state in sorted(self.values.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {_format_value(cumulative)}"
+            cumulative += state[len(self.buckets)]
+            yield f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {_format_value(cumulative)}"
+            yield f"{self.name}_sum{_format_labels(key)} {_format_value(state[-1])}"
+            yield f"{self.name}_count{_format_labels(key)} {_format_value(cumulative)}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str) -> Counter:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Counter(name, help)
+        if not isinstance(metric, Counter):
+            raise ValueError(f"{name} is already registered as a {metric.kind}.")
+        return metric
+
+    def histogram(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, help, buckets)
+        if not isinstance(metric, Histogram):
+            raise ValueError(f"{name} is already registered as a {metric.kind}.")
+        return metric
+
+    def inc(self, name: str, amount: float = 1.0, **labels: object) -> None:
+        metric = self._metrics[name]
+        key = _label_key(labels)
+        with self._lock:
+            metric.inc(key, amount)  # type: ignore[union-attr]
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        metric = self._metrics[name]
+        key = _label_key(labels)
+        with self._lock:
+            metric.observe(key, value)  # type: ignore[union-attr]
+
+    def value(self, name: str, **labels: object) -> float:
+        """
+        Current counter value (or histogram observation count) for one label set.
+        """
+        metric = self._metrics[name]
+        key = _label_key(labels)
+        with self._lock:
+            if isinstance(metric, Counter):
+                return metric.values.get(key, 0.0)
+            state = metric.values.get(key)
+            return sum(state[:-1]) if state else 0.0
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._metrics):
+                metric = self._metrics[name]
+                lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Write the exposition atomically, so a collector never reads a half-written file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+
+_registry: MetricsRegistry | None = None
+
+
+def enable_metrics() -> MetricsRegistry:
+    """
+    Turn metrics on for this process and return the registry (idempotent).
+    """
+    global _registry
+    if _registry is None:
+        registry = MetricsRegistry()
+        for name, kind, help in STANDARD_METRICS:
+            if kind == "counter":
+                registry.counter(name, help)
+            else:
+                registry.histogram(name, help)
+        _registry = registry
+    return _registry
+
+
+def disable_metrics() -> None:
+    global _registry
+    _registry = None
+
+
+def get_registry() -> MetricsRegistry | None:
+    return _registry
+
+
+def enabled() -> bool:
+    return _registry is not None
+
+
+def inc(name: str, amount: float = 1.0, **labels: object) -> None:
+    registry = _registry
+    if registry is not None:
+        registry.inc(name, amount, **labels)
+
+
+def observe(name: str, value: float, **labels: object) -> None:
+    registry = _registry
+    if registry is not None:
+        registry.observe(name, value, **labels)
@@ -0,0 +1,313 @@
+'''
+Purpose: Per-command SQL and service-call profiling.
+
+A Profiler attached to a ProfiledConnection times every statement executed
+through the connection (execute, row fetches and commit), counts every
+statement SQLite runs via the trace callback, and collects timings for
+service functions decorated with @profiled (which also feeds the metrics
+registry when metrics are enabled). The summary shows the slowest
+statements, repeat counts (N+1 patterns stand out), and wall time split
+between SQLite and Python.
+'''
+
+from __future__ import annotations
+
+import functools
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, TextIO, TypeVar
+
+from travel_planner.domain.exceptions import ConflictError
+from travel_planner.domain.validators import ValidationError
+from travel_planner.observability import metrics
+from travel_planner.persistence.db import MeteredConnection, MeteredCursor
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_active: "Profiler | None" = None
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+class _Stat:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float, *, count: int = 1) -> None:
+        self.count += count
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+
+class Profiler:
+    def __init__(self, *, slow_log_path: str | None = None, slow_ms: float = 50.0) -> None:
+        self.slow_log_path = slow_log_path
+        self.slow_seconds = slow_ms / 1000.0
+
+        self.statements: dict[str, _Stat] = {}
+        self.services: dict[str, _Stat] = {}
+        # Counted, not keyed: traced text has the bound values expanded, so a
+        # bulk command would add one entry per statement.
+        self.traced_statements = 0
+        self.sqlite_seconds = 0.0
+
+        self._started = 0.0
+        self._stopped = 0.0
+        self._last_expanded: str | None = None
+        self._slow_log: TextIO | None = None
+
+    # ---- lifecycle ----
+
+    def start(self) -> None:
+        global _active
+        self._started = time.perf_counter()
+        if self.slow_log_path:
+            self._slow_log = open(self.slow_log_path, "a", encoding="utf-8")
+        _active = self
+
+    def stop(self) -> None:
+        global _active
+        self._stopped = time.perf_counter()
+        if _active is self:
+            _active = None
+        if self._slow_log is not None:
+            self._slow_log.close()
+            self._slow_log = None
+
+    def attach(self, conn: sqlite3.Connection) -> None:
+        if isinstance(conn, ProfiledConnection):
+            conn.profiler = self
+        conn.set_trace_callback(self._on_trace)
+
+    # ---- recording ----
+
+    def _on_trace(self, expanded_sql: str) -> None:
+        self.traced_statements += 1
+        if self._last_expanded is None and expanded_sql.strip() != "BEGIN":
+            self._last_expanded = expanded_sql
+
+    def begin_statement(self) -> None:
+        self._last_expanded = None
+
+    def record_statement(self, sql: str, seconds: float, *, rows: int = 1) -> None:
+        key = _normalize(sql)
+        stat = self.statements.get(key)
+        if stat is None:
+            stat = self.statements[key] = _Stat()
+        stat.add(seconds, count=rows)
+        self.sqlite_seconds += seconds
+
+        if seconds >= self.slow_seconds and self._slow_log is not None:
+            ts = datetime.now(timezone.utc).isoformat()
+            expanded = _normalize(self._last_expanded or sql)
+            self._slow_log.write(f"{ts}\t{seconds * 1000:.3f}ms\t{expanded}\n")
+            self._slow_log.flush()
+
+    def record_fetch(self, sql: str, seconds: float, *, execution_seconds: float) -> None:
+        """
+        Add fetch time to a statement; execution_seconds is its execution's time so far, fetches included.
+        """
+        stat = self.statements.get(_normalize(sql))
+        if stat is not None:
+            stat.total += seconds
+            stat.max = max(stat.max, execution_seconds)
+        self.sqlite_seconds += seconds
+
+    def record_call(self, name: str, seconds: float) -> None:
+        stat = self.services.get(name)
+        if stat is None:
+            stat = self.services[name] = _Stat()
+        stat.add(seconds)
+
+    # ---- reporting ----
+
+    def summary(self, *, top: int = 10) -> dict[str, Any]:
+        end = self._stopped or time.perf_counter()
+        wall = max(0.0, end - self._started)
+        return {
+            "wall_s": wall,
+            "sqlite_s": self.sqlite_seconds,
+            "python_s": max(0.0, wall - self.sqlite_seconds),
+            "statements": sum(s.count for s in self.statements.values()),
+            "sqlite_statements": self.traced_statements,
+            "slowest": sorted(self.statements.items(), key=lambda kv: kv[1].total, reverse=True)[:top],
+            "most_frequent": sorted(self.statements.items(), key=lambda kv: kv[1].count, reverse=True)[:top],
+            "services": sorted(self.services.items(), key=lambda kv: kv[1].total, reverse=True),
+        }
+
+    def print_summary(self, out: TextIO = sys.stderr, *, top: int = 10) -> None:
+        s = self.summary(top=top)
+
+        def clip(sql: str, width: int = 90) -> str:
+            return sql if len(sql) <= width else sql[: width - 1] + "…"
+
+        print("", file=out)
+        print("== profile ==", file=out)
+        print(
+            f"wall {s['wall_s'] * 1000:.2f}ms  sqlite {s['sqlite_s'] * 1000:.2f}ms  "
+            f"python {s['python_s'] * 1000:.2f}ms  "
+            f"({s['statements']} statements issued, {s['sqlite_statements']} run by SQLite incl. "
+            f"transaction control and triggers)",
+            file=out,
+        )
+
+        if s["services"]:
+            print("-- service calls --", file=out)
+            for name, st in s["services"]:
+                print(f"{st.count:>6}x {st.total * 1000:>10.3f}ms  {name}", file=out)
+
+        if s["slowest"]:
+            print("-- slowest statements (total) --", file=out)
+            for sql, st in s["slowest"]:
+                print(f"{st.total * 1000:>10.3f}ms {st.count:>6}x  {clip(sql)}", file=out)
+
+        repeated = [(sql, st) for sql, st in s["most_frequent"] if st.count > 1]
+        if repeated:
+            print("-- most frequent statements (possible N+1) --", file=out)
+            for sql, st in repeated:
+                print(f"{st.count:>6}x {st.total * 1000:>10.3f}ms  {clip(sql)}", file=out)
+
+
+class ProfiledCursor(MeteredCursor):
+    _sql = ""
+    # Time spent on the current statement: its execute plus every fetch so far.
+    _spent = 0.0
+
+    def _profiler(self) -> Profiler | None:
+        return getattr(self.connection, "profiler", None)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> "ProfiledCursor":
+        prof = self._profiler()
+        if prof is None:
+            super().execute(sql, parameters)
+            return self
+
+        self._sql = sql
+        prof.begin_statement()
+        t0 = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        finally:
+            self._spent = time.perf_counter() - t0
+            prof.record_statement(sql, self._spent)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> "ProfiledCursor":
+        prof = self._profiler()
+        if prof is None:
+            super().executemany(sql, seq_of_parameters)
+            return self
+
+        self._sql = sql
+        prof.begin_statement()
+        t0 = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        finally:
+            self._spent = time.perf_counter() - t0
+            prof.record_statement(sql, self._spent)
+        return self
+
+    def _timed_fetch(self, fetch: Callable[[], Any]) -> Any:
+        prof = self._profiler()
+        if prof is None:
+            return fetch()
+        t0 = time.perf_counter()
+        try:
+            return fetch()
+        finally:
+            seconds = time.perf_counter() - t0
+            self._spent += seconds
+            prof.record_fetch(self._sql, seconds, execution_seconds=self._spent)
+
+    def fetchone(self) -> Any:
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size: int | None = None) -> list:
+        if size is None:
+            return self._timed_fetch(super().fetchmany)
+        return self._timed_fetch(lambda: super(ProfiledCursor, self).fetchmany(size))
+
+    def fetchall(self) -> list:
+        return self._timed_fetch(super().fetchall)
+
+    def __next__(self) -> Any:
+        return self._timed_fetch(super().__next__)
+
+
+class ProfiledConnection(MeteredConnection):
+    """
+    Connection whose statements, fetches and commits are timed by its attached Profiler.
+    """
+
+    profiler: Profiler | None = None
+
+    def cursor(self, factory: Any = None) -> sqlite3.Cursor:
+        return super().cursor(factory or ProfiledCursor)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:
+        prof = self.profiler
+        if prof is None or not self.in_transaction:
+            super().commit()
+            return
+
+        prof.begin_statement()
+        t0 = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            prof.record_statement("COMMIT", time.perf_counter() - t0)
+
+
+def profiled(func: F) -> F:
+    """
+    Time calls to a service function for the active Profiler and the metrics registry.
+
+    With neither enabled the wrapper costs two global lookups per call.
+    """
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        prof = _active
+        registry = metrics.get_registry()
+        if prof is None and registry is None:
+            return func(*args, **kwargs)
+
+        outcome = "ok"
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except ValidationError:
+            outcome = "validation_error"
+            raise
+        except ConflictError:
+            outcome = "conflict"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            if prof is not None:
+                prof.record_call(name, elapsed)
+            if registry is not None:
+                registry.inc(metrics.SERVICE_CALLS, function=name, outcome=outcome)
+                registry.observe(metrics.SERVICE_DURATION, elapsed, function=name)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,82 @@
+'''
+Purpose: Chronological items across all trips for a date range (the ops agenda).
+'''
+
+from __future__ import annotations
+
+from typing import Iterator
+
+# Sort key of an agenda row: (day_num, unscheduled flag, start_utc or 0, item id).
+# Scheduled items come first within a date, by UTC start (so items in different
+# timezones interleave correctly); unscheduled ones follow by id.
+AgendaKey = tuple[int, int, int, int]
+
+_UNSCHEDULED = "CASE WHEN i.start_min IS NULL THEN 1 ELSE 0 END"
+
+
+def iter_agenda(
+    conn,
+    from_date: str,
+    to_date: str,
+    *,
+    after: AgendaKey | None = None,
+    limit: int | None = None,
+    batch_rows: int = 500,
+) -> Iterator[dict]:
+    """
+    Yield items dated from_date..to_date in (date, start_utc) order, starting after the `after` key.
+
+    One join driven by a range scan on idx_days_day_num; rows are fetched in
+    batches, so memory stays bounded however wide the range. Only the items
+    of one date at a time are sorted (to interleave trips by start time).
+    """
+    where = [
+        "d.day_num BETWEEN CAST(julianday(?) AS INTEGER) AND CAST(julianday(?) AS INTEGER)",
+    ]
+    params: list = [from_date, to_date]
+    if after is not None:
+        # The day_num bound keeps the index range tight; the row value picks up mid-day.
+        where.append("d.day_num >= ?")
+        where.append(f"(d.day_num, {_UNSCHEDULED}, COALESCE(i.start_utc, 0), i.id) > (?, ?, ?, ?)")
+        params.extend([after[0], *after])
+    sql = f"""
+        SELECT
+            d.day_num, d.date, d.trip_id, t.name,
+            i.id, i.day_id, i.start_min, i.end_min, i.title, i.category, i.location_name,
+            i.timezone, i.start_utc
+        FROM days AS d
+        JOIN items AS i ON i.day_id = d.id
+        JOIN trips AS t ON t.id = d.trip_id
+        WHERE {" AND ".join(where)}
+        ORDER BY d.day_num ASC, {_UNSCHEDULED} ASC, i.start_utc ASC, i.id ASC
+    """
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    cursor = conn.execute(sql + ";", params)
+    while True:
+        rows = cursor.fetchmany(batch_rows)
+        if not rows:
+            return
+        for r in rows:
+            yield {
+                "day_num": r[0],
+                "date": r[1],
+                "trip_id": r[2],
+                "trip_name": r[3],
+                "item_id": r[4],
+                "day_id": r[5],
+                "start_min": r[6],
+                "end_min": r[7],
+                "title": r[8],
+                "category": r[9],
+                "location_name": r[10],
+                "timezone": r[11],
+                "start_utc": r[12],
+            }
+
+
+def agenda_key(row: dict) -> AgendaKey:
+    start = row["start_utc"]
+    return (row["day_num"], 1 if start is None else 0, start or 0, row["item_id"])
@@ -0,0 +1,218 @@
+'''
+Purpose: Move whole trips between the hot database and an attached archive database.
+
+The archive is an ordinary SQLite file holding only the trips/days/items
+tables (and the trips' recurring item rules). It is ATTACHed to the hot connection as schema "archive" and rows are
+moved with set-based INSERT ... SELECT / DELETE inside one transaction, so a
+trip is always entirely in one database or the other. (SQLite commits
+attached databases atomically unless the hot database is in WAL mode, where
+each file is atomic on its own.)
+
+Rows keep their ids across the move. The hot tables use AUTOINCREMENT, so a
+new trip never takes the id of an archived one; every move also raises the
+hot sqlite_sequence to the archive's highest ids, in case it fell behind
+(e.g. the tables got AUTOINCREMENT after trips had been archived).
+'''
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+from travel_planner.persistence import row_cache
+from travel_planner.persistence.migrations import (
+    AUTOINCREMENT_TABLES,
+    add_days_day_num,
+    add_items_span_end_min,
+    add_items_utc_instants,
+)
+from travel_planner.persistence.schema import get_entity_table_ddl, get_index_ddl
+
+ARCHIVE_SCHEMA = "archive"
+
+
+def init_archive(path: str) -> None:
+    """
+    Create the archive file and its tables/indexes if needed.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        for ddl in get_entity_table_ddl():
+            conn.execute(ddl)
+        add_days_day_num(conn)
+        add_items_span_end_min(conn)
+        add_items_utc_instants(conn)
+        for ddl in get_index_ddl():
+            conn.execute(ddl)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def is_attached(conn) -> bool:
+    return any(row[1] == ARCHIVE_SCHEMA for row in conn.execute("PRAGMA database_list;"))
+
+
+def attach_archive(conn, path: str) -> None:
+    if is_attached(conn):
+        return
+    init_archive(path)
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA};", (path,))
+
+
+def detach_archive(conn) -> None:
+    if is_attached(conn):
+        conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA};")
+
+
+def _shared_columns(conn, table: str) -> str:
+    # Only columns present on both sides are copied, so an archive created by
+    # an older schema version still accepts rows.
+    main_cols = [r[1] for r in conn.execute(f"PRAGMA main.table_info({table});")]
+    archive_cols = {r[1] for r in conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.table_info({table});")}
+    return ", ".join(c for c in main_cols if c in archive_cols)
+
+
+def _reserve_archived_ids(conn) -> None:
+    # sqlite_sequence has no key on name: add the row if missing, then raise it.
+    for table in AUTOINCREMENT_TABLES:
+        conn.execute(
+            "INSERT INTO main.sqlite_sequence (name, seq) SELECT ?, 0 "
+            "WHERE NOT EXISTS (SELECT 1 FROM main.sqlite_sequence WHERE name = ?);",
+            (table, table),
+        )
+        conn.execute(
+            f"""
+            UPDATE main.sqlite_sequence
+            SET seq = MAX(seq, (SELECT COALESCE(MAX(id), 0) FROM {ARCHIVE_SCHEMA}.{table}))
+            WHERE name = ?;
+            """,
+            (table,),
+        )
+
+
+def _move_trips(conn, src: str, dst: str, trip_filter_sql: str, params: tuple[Any, ...]) -> dict[str, int]:
+    """
+    Copy the selected trips (and their days/items) from src to dst, then delete them from src.
+
+    trip_filter_sql selects trip ids from the src schema.
+    """
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        conn.execute("DROP TABLE IF EXISTS temp.moving_trips;")
+        conn.execute(
+            f"CREATE TEMP TABLE moving_trips AS {trip_filter_sql};",
+            params,
+        )
+        moved_ids = "SELECT trip_id FROM temp.moving_trips"
+
+        conflicts = conn.execute(
+            f"""
+            SELECT
+                (SELECT COUNT(*) FROM {dst}.trips WHERE id IN ({moved_ids})),
+                (SELECT COUNT(*) FROM {dst}.days WHERE id IN (
+                    SELECT id FROM {src}.days WHERE trip_id IN ({moved_ids}))),
+                (SELECT COUNT(*) FROM {dst}.items WHERE id IN (
+                    SELECT i.id FROM {src}.items AS i
+                    JOIN {src}.days AS d ON d.id = i.day_id
+                    WHERE d.trip_id IN ({moved_ids}))),
+                (SELECT COUNT(*) FROM {dst}.recurring_items WHERE id IN (
+                    SELECT id FROM {src}.recurring_items WHERE trip_id IN ({moved_ids})));
+            """
+        ).fetchone()
+        if any(conflicts):
+            raise sqlite3.IntegrityError(
+                f"{dst} already holds rows with the same ids "
+                f"(trips={conflicts[0]}, days={conflicts[1]}, items={conflicts[2]}, "
+                f"recurring items={conflicts[3]})."
+            )
+
+        counts: dict[str, int] = {}
+        cols = _shared_columns(conn, "trips")
+        counts["trips"] = conn.execute(
+            f"INSERT INTO {dst}.trips ({cols}) SELECT {cols} FROM {src}.trips WHERE id IN ({moved_ids});"
+        ).rowcount
+
+        cols = _shared_columns(conn, "days")
+        counts["days"] = conn.execute(
+            f"INSERT INTO {dst}.days ({cols}) SELECT {cols} FROM {src}.days WHERE trip_id IN ({moved_ids});"
+        ).rowcount
+
+        cols = _shared_columns(conn, "items")
+        counts["items"] = conn.execute(
+            f"""
+            INSERT INTO {dst}.items ({cols})
+            SELECT {cols} FROM {src}.items
+            WHERE day_id IN (SELECT id FROM {src}.days WHERE trip_id IN ({moved_ids}));
+            """
+        ).rowcount
+
+        moved_rules = f"SELECT id FROM {src}.recurring_items WHERE trip_id IN ({moved_ids})"
+        cols = _shared_columns(conn, "recurring_items")
+        conn.execute(
+            f"INSERT INTO {dst}.recurring_items ({cols}) SELECT {cols} FROM {src}.recurring_items "
+            f"WHERE trip_id IN ({moved_ids});"
+        )
+        conn.execute(
+            f"INSERT INTO {dst}.recurring_skips (rule_id, day_id) SELECT rule_id, day_id "
+            f"FROM {src}.recurring_skips WHERE rule_id IN ({moved_rules});"
+        )
+
+        # Children first, so the FK cascades from the parent deletes find nothing left.
+        conn.execute(f"DELETE FROM {src}.recurring_skips WHERE rule_id IN ({moved_rules});")
+        conn.execute(f"DELETE FROM {src}.recurring_items WHERE trip_id IN ({moved_ids});")
+        conn.execute(
+            f"""
+            DELETE FROM {src}.items
+            WHERE day_id IN (SELECT id FROM {src}.days WHERE trip_id IN ({moved_ids}));
+            """
+        )
+        conn.execute(f"DELETE FROM {src}.days WHERE trip_id IN ({moved_ids});")
+        conn.execute(f"DELETE FROM {src}.trips WHERE id IN ({moved_ids});")
+        _reserve_archived_ids(conn)
+    except BaseException:
+        conn.rollback()
+        raise
+
+    conn.commit()
+    row_cache.invalidate_all(conn)
+    return counts
+
+
+def archive_trips_before(conn, before: str) -> dict[str, int]:
+    """
+    Move every trip whose last day is before `before` (YYYY-MM-DD) into the attached archive.
+    """
+    return _move_trips(
+        conn,
+        "main",
+        ARCHIVE_SCHEMA,
+        "SELECT trip_id FROM main.days GROUP BY trip_id HAVING MAX(date) < ?",
+        (before,),
+    )
+
+
+def unarchive_trip(conn, trip_id: int) -> dict[str, int]:
+    return _move_trips(
+        conn,
+        ARCHIVE_SCHEMA,
+        "main",
+        f"SELECT id AS trip_id FROM {ARCHIVE_SCHEMA}.trips WHERE id = ?",
+        (trip_id,),
+    )
+
+
+def list_archived_trips(conn) -> list[dict]:
+    cursor = conn.execute(
+        f"""
+        SELECT t.id, t.name, MIN(d.date), MAX(d.date)
+        FROM {ARCHIVE_SCHEMA}.trips AS t
+        LEFT JOIN {ARCHIVE_SCHEMA}.days AS d ON d.trip_id = t.id
+        GROUP BY t.id
+        ORDER BY t.id ASC;
+        """
+    )
+    return [
+        {"id": r[0], "name": r[1], "first_date": r[2], "last_date": r[3]}
+        for r in cursor.fetchall()
+    ]
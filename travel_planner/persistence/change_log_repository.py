@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+_ENTITY_TABLES = {
+    "trip": "trips",
+    "day": "days",
+    "item": "items",
+}
+
+
+def get_max_seq(conn) -> int:
+    cursor = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log;")
+    return int(cursor.fetchone()[0])
+
+
+def iter_changed_rows(
+    conn,
+    entity: str,
+    since_seq: int,
+    through_seq: int,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield one record per entity row changed in (since_seq, through_seq], ordered by its latest seq.
+
+    Several changes to the same row collapse into the latest one. The current
+    row is joined in; it is None when the latest change was a delete.
+    """
+    table = _ENTITY_TABLES[entity]
+    cursor = conn.execute(
+        f"""
+        WITH latest AS (
+            SELECT entity_id, MAX(seq) AS seq
+            FROM change_log
+            WHERE seq > ? AND seq <= ? AND entity = ?
+            GROUP BY entity_id
+        )
+        SELECT latest.seq, latest.entity_id, c.op, c.changed_at, t.*
+        FROM latest
+        JOIN change_log AS c ON c.seq = latest.seq
+        LEFT JOIN {table} AS t ON t.id = latest.entity_id AND c.op <> 'delete'
+        ORDER BY latest.seq ASC;
+        """,
+        (since_seq, through_seq, entity),
+    )
+    cols = [d[0] for d in cursor.description][4:]
+
+    for row in cursor:
+        seq, entity_id, op, changed_at = row[0], row[1], row[2], row[3]
+        values = row[4:]
+        data = dict(zip(cols, values)) if op != "delete" and values[0] is not None else None
+        yield {
+            "seq": seq,
+            "entity": entity,
+            "id": entity_id,
+            "op": op,
+            "changed_at": changed_at,
+            "row": data,
+        }
+
+
+def compact(conn, *, through_seq: int | None = None, before: str | None = None) -> int:
+    """
+    Delete log entries with seq <= through_seq and/or changed_at < before (ISO-8601 UTC).
+    """
+    clauses = []
+    values: list[Any] = []
+
+    if through_seq is not None:
+        clauses.append("seq <= ?")
+        values.append(through_seq)
+
+    if before is not None:
+        clauses.append("changed_at < ?")
+        values.append(before)
+
+    if not clauses:
+        return 0
+
+    cursor = conn.execute(
+        f"DELETE FROM change_log WHERE {' AND '.join(clauses)};",
+        tuple(values),
+    )
+    conn.commit()
+    return int(cursor.rowcount)
@@ -1,3 +1,6 @@
+from travel_planner.persistence import item_repository, row_cache
+
+
 def create_day(conn, trip_id: int, date: str) -> int:
     cursor = conn.execute(
         "INSERT INTO days (trip_id, date) VALUES (?, ?);",
@@ -7,6 +10,12 @@ def create_day(conn, trip_id: int, date: str) -> int:
     return cursor.lastrowid
 
 def get_day(conn, day_id: int) -> dict | None:
+    cache = row_cache.get_cache(conn)
+    if cache is not None:
+        cached = cache.get(("day", day_id))
+        if cached is not None:
+            return cached
+
     cursor = conn.execute(
         "SELECT id, trip_id, date FROM days WHERE id = ?;",
         (day_id,),
@@ -16,11 +25,14 @@ def get_day(conn, day_id: int) -> dict | None:
     if row is None:
         return None
 
-    return {
+    day = {
         "id": row[0],
         "trip_id": row[1],
         "date": row[2],
     }
+    if cache is not None:
+        cache.put(("day", day_id), day)
+    return day
 
 
 def list_days_for_trip(conn, trip_id: int) -> list[dict]:
@@ -45,6 +57,7 @@ def delete_day(conn, day_id: int) -> None:
         "DELETE FROM days WHERE id = ?;",
         (day_id,),
     )
+    row_cache.invalidate_day(conn, day_id, cascade=True)
     conn.commit()
 
 
@@ -53,4 +66,77 @@ def update_day_date(conn, day_id: int, date_str: str) -> None:
         "UPDATE days SET date = ? WHERE id = ?;",
         (date_str, day_id),
     )
-    conn.commit()
\ No newline at end of file
+    item_repository.refresh_utc_instants(conn, day_id=day_id)
+    row_cache.invalidate_day(conn, day_id, cascade=True)
+    conn.commit()
+
+
+def shift_trip_days(conn, trip_id: int, shift_days: int) -> int:
+    """
+    Move every day of a trip by shift_days in one transaction; returns the number of days moved.
+
+    UNIQUE (trip_id, date) is checked row by row during an UPDATE, so a
+    single re-dating statement fails as soon as one day lands on a date
+    another day still holds. Every date is parked under a '~' prefix first
+    (no real date starts with it), then re-dated from the parked value:
+    two statements whatever the trip length. The trip's recurring rules move
+    with it, and its items' UTC instants are recomputed.
+    """
+    shift = f"{int(shift_days):+d} days"
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        conn.execute(
+            "UPDATE days SET date = '~' || date WHERE trip_id = ?;",
+            (trip_id,),
+        )
+        moved = conn.execute(
+            "UPDATE days SET date = date(substr(date, 2), ?) WHERE trip_id = ?;",
+            (shift, trip_id),
+        ).rowcount
+        # Recurring rules keep their place in the trip (date(NULL) stays NULL).
+        conn.execute(
+            """
+            UPDATE recurring_items
+            SET from_date = date(from_date, ?), until_date = date(until_date, ?)
+            WHERE trip_id = ?;
+            """,
+            (shift, shift, trip_id),
+        )
+        item_repository.refresh_utc_instants(conn, trip_id=trip_id)
+    except BaseException:
+        conn.rollback()
+        raise
+
+    # Only the trip's days change; cascade is what reaches them in the cache.
+    row_cache.invalidate_trip(conn, trip_id, cascade=True)
+    conn.commit()
+    return moved
+
+
+def list_days_in_range(conn, from_date: str, to_date: str, *, trip_id: int | None = None) -> list[dict]:
+    """
+    Days dated from_date..to_date (inclusive), across all trips or one, in date order.
+
+    The bounds are converted to day numbers once per statement, so the lookup
+    is a range scan on idx_days_day_num (or idx_days_trip_day_num for one trip).
+    """
+    sql = """
+        SELECT id, trip_id, date
+        FROM days
+        WHERE day_num BETWEEN CAST(julianday(?) AS INTEGER) AND CAST(julianday(?) AS INTEGER)
+    """
+    params: list = [from_date, to_date]
+    if trip_id is not None:
+        sql += " AND trip_id = ?"
+        params.append(trip_id)
+    # (trip_id, day_num) is unique, so this order is total and comes straight from the index.
+    cursor = conn.execute(sql + " ORDER BY day_num ASC, trip_id ASC;", params)
+
+    return [
+        {
+            "id": row[0],
+            "trip_id": row[1],
+            "date": row[2],
+        }
+        for row in cursor.fetchall()
+    ]
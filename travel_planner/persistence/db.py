@@ -2,16 +2,278 @@
 Purpose: Responsible for opening a connection to the SQLite databse
 '''
 
+from __future__ import annotations
+
+import functools
+import queue
+import random
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+
+from travel_planner.observability import metrics
+from travel_planner.persistence import row_cache
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Bounded exponential backoff for write transactions that hit SQLITE_BUSY:
+# delays of 10, 20, 40, 80 ms (with jitter) before giving up on the 5th attempt.
+BUSY_RETRY_ATTEMPTS = 5
+BUSY_RETRY_BASE_DELAY = 0.01
+BUSY_RETRY_MAX_DELAY = 0.5
+
+_busy_scope = threading.local()
+_sleep = time.sleep
+
+
+def _statement_op(sql: str) -> str:
+    head = sql.lstrip().split(None, 1)
+    return head[0].lower() if head else "other"
 
-def connect(db_path: str) -> sqlite3.Connection:
+
+class MeteredCursor(sqlite3.Cursor):
+    """
+    Cursor that counts statements and fetched rows in the metrics registry.
+    """
+
+    def execute(self, sql: str, parameters: Any = (), /) -> "MeteredCursor":
+        super().execute(sql, parameters)
+        metrics.inc(metrics.DB_STATEMENTS, op=_statement_op(sql))
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> "MeteredCursor":
+        super().executemany(sql, seq_of_parameters)
+        metrics.inc(metrics.DB_STATEMENTS, op=_statement_op(sql))
+        return self
+
+    def fetchone(self) -> Any:
+        row = super().fetchone()
+        if row is not None:
+            metrics.inc(metrics.DB_ROWS_READ)
+        return row
+
+    def fetchmany(self, size: int | None = None) -> list:
+        rows = super().fetchmany() if size is None else super().fetchmany(size)
+        if rows:
+            metrics.inc(metrics.DB_ROWS_READ, len(rows))
+        return rows
+
+    def fetchall(self) -> list:
+        rows = super().fetchall()
+        if rows:
+            metrics.inc(metrics.DB_ROWS_READ, len(rows))
+        return rows
+
+    def __next__(self) -> Any:
+        row = super().__next__()
+        metrics.inc(metrics.DB_ROWS_READ)
+        return row
+
+
+class MeteredConnection(sqlite3.Connection):
+    """
+    Connection used by connect() while metrics are enabled; counts statements, rows and commits.
+    """
+
+    def cursor(self, factory: Any = None) -> sqlite3.Cursor:
+        return super().cursor(factory or MeteredCursor)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:
+        if not self.in_transaction:
+            super().commit()
+            return
+        t0 = time.perf_counter()
+        super().commit()
+        metrics.inc(metrics.DB_COMMITS)
+        metrics.observe(metrics.DB_COMMIT_DURATION, time.perf_counter() - t0)
+
+
+def connect(
+    db_path: str,
+    *,
+    check_same_thread: bool = True,
+    factory: type[sqlite3.Connection] | None = None,
+) -> sqlite3.Connection:
     """
     Open to a connection to the SQLite database and enable foreign key enforcement.
     """
 
-    conn = sqlite3.connect(db_path)
+    if factory is None:
+        factory = MeteredConnection if metrics.enabled() else sqlite3.Connection
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread, factory=factory)
 
     # Enable foreign key constraints
     conn.execute("PRAGMA foreign_keys = ON;")
 
-    return conn
\ No newline at end of file
+    return conn
+
+
+def is_busy_error(exc: BaseException) -> bool:
+    """
+    True for SQLITE_BUSY / SQLITE_LOCKED ("database is locked") errors.
+    """
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return "locked" in str(exc)
+
+
+def retry_on_busy(func: F) -> F:
+    """
+    Re-run a write service call when SQLite reports the database busy.
+
+    The busy timeout already waits for a lock held by another writer, but a
+    deferred transaction that read before writing gets SQLITE_BUSY at once
+    (waiting could deadlock). The call's transaction is rolled back and the
+    whole call, reads included, runs again after an exponential, jittered
+    backoff, up to BUSY_RETRY_ATTEMPTS times. The function's first argument
+    must be the connection. Nested decorated calls retry only at the outermost
+    one, which owns the transaction.
+    """
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(conn: sqlite3.Connection, *args: Any, **kwargs: Any) -> Any:
+        if getattr(_busy_scope, "active", False):
+            return func(conn, *args, **kwargs)
+
+        _busy_scope.active = True
+        try:
+            attempt = 1
+            while True:
+                try:
+                    return func(conn, *args, **kwargs)
+                except sqlite3.OperationalError as e:
+                    if not is_busy_error(e):
+                        raise
+                    if conn.in_transaction:
+                        conn.rollback()
+                        row_cache.invalidate_all(conn)
+                    if attempt >= BUSY_RETRY_ATTEMPTS:
+                        metrics.inc(metrics.DB_BUSY_EXHAUSTED, function=name)
+                        raise
+                metrics.inc(metrics.DB_BUSY_RETRIES, function=name)
+                delay = min(BUSY_RETRY_MAX_DELAY, BUSY_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                _sleep(random.uniform(delay / 2, delay))
+                attempt += 1
+        finally:
+            _busy_scope.active = False
+
+    return wrapper  # type: ignore[return-value]
+
+
+class ConnectionPool:
+    """
+    A bounded pool of SQLite connections shared between threads.
+
+    Connections are opened lazily up to max_size and handed out one caller at a
+    time, so a connection is never used by two threads at once.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        max_size: int = 8,
+        timeout: float = 30.0,
+        on_connect: Callable[[sqlite3.Connection], None] | None = None,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive.")
+
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.on_connect = on_connect
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("connection pool is closed.")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            # Other connections may have committed since it was last used.
+            row_cache.expire(conn)
+            return conn
+
+        with self._lock:
+            if self._opened < self.max_size:
+                self._opened += 1
+                open_new = True
+            else:
+                open_new = False
+
+        if open_new:
+            try:
+                conn = connect(self.db_path, check_same_thread=False)
+                if self.on_connect is not None:
+                    self.on_connect(conn)
+                return conn
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("timed out waiting for a pooled connection.") from None
+        row_cache.expire(conn)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            # Never hand out a connection with half-finished work on it.
+            conn.rollback()
+            row_cache.invalidate_all(conn)
+
+        if self._closed:
+            self._close_conn(conn)
+            with self._lock:
+                self._opened -= 1
+            return
+
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close_conn(conn)
+            with self._lock:
+                self._opened -= 1
+
+    @staticmethod
+    def _close_conn(conn: sqlite3.Connection) -> None:
+        row_cache.disable_cache(conn)
+        conn.close()
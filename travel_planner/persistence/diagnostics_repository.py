@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+
+def list_day_stamps(conn, buffer_min: int, *, trip_id: int | None = None) -> list[dict]:
+    """
+    Current change stamp and any cached diagnostics for every day (of one trip, or all trips).
+
+    Days that never had an item change recorded report stamp 0.
+    """
+    where = "WHERE d.trip_id = ?" if trip_id is not None else ""
+    params = (buffer_min, trip_id) if trip_id is not None else (buffer_min,)
+
+    cursor = conn.execute(
+        f"""
+        SELECT
+            d.id,
+            d.trip_id,
+            d.date,
+            COALESCE(s.stamp, 0),
+            dd.stamp,
+            dd.overlaps_json,
+            dd.tight_json
+        FROM days AS d
+        LEFT JOIN day_stamps AS s ON s.day_id = d.id
+        LEFT JOIN day_diagnostics AS dd ON dd.day_id = d.id AND dd.buffer_min = ?
+        {where}
+        ORDER BY d.trip_id ASC, d.date ASC, d.id ASC;
+        """,
+        params,
+    )
+
+    return [
+        {
+            "day_id": r[0],
+            "trip_id": r[1],
+            "date": r[2],
+            "stamp": r[3],
+            "cached_stamp": r[4],
+            "overlaps_json": r[5],
+            "tight_json": r[6],
+        }
+        for r in cursor.fetchall()
+    ]
+
+
+def get_day_stamp(conn, day_id: int) -> int:
+    """
+    Change stamp of one day's schedule; 0 when it was never bumped.
+    """
+    row = conn.execute("SELECT stamp FROM day_stamps WHERE day_id = ?;", (day_id,)).fetchone()
+    return 0 if row is None else int(row[0])
+
+
+def save_day_diagnostics(conn, buffer_min: int, rows: list[tuple[int, int, str, str]]) -> None:
+    """
+    Upsert (day_id, stamp, overlaps_json, tight_json) rows in a single commit.
+    """
+    if not rows:
+        return
+
+    conn.executemany(
+        """
+        INSERT INTO day_diagnostics (day_id, buffer_min, stamp, overlaps_json, tight_json)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (day_id, buffer_min) DO UPDATE SET
+            stamp = excluded.stamp,
+            overlaps_json = excluded.overlaps_json,
+            tight_json = excluded.tight_json;
+        """,
+        [(day_id, buffer_min, stamp, o, t) for day_id, stamp, o, t in rows],
+    )
+    conn.commit()
@@ -1,6 +1,18 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Iterator
+
+from travel_planner.domain.timezones import utc_minutes
+from travel_planner.persistence import recurring_repository, row_cache
+
+# New items are appended this far after the day's last position, and a
+# rebalance respaces a day to multiples of it, so most moves find room for a
+# midpoint without touching any other row.
+POSITION_GAP = 1024
+
+_NEXT_POSITION = f"(SELECT COALESCE(MAX(position), 0) + {POSITION_GAP} FROM items WHERE day_id = ?)"
+
 
 def create_item_min(
     conn,
@@ -10,17 +22,18 @@ def create_item_min(
 ) -> int:
     now = _now_iso_utc()
     cursor = conn.execute(
-        """
+        f"""
         INSERT INTO items (
             day_id,
             title,
             category,
+            position,
             created_at,
             updated_at
         )
-        VALUES (?, ?, ?, ?, ?);
+        VALUES (?, ?, ?, {_NEXT_POSITION}, ?, ?);
         """,
-        (day_id, title, category, now, now),
+        (day_id, title, category, day_id, now, now),
     )
     conn.commit()
     return int(cursor.lastrowid)
@@ -33,28 +46,42 @@ def create_item_scheduled(
     category: str,
     start_min: int,
     end_min: int,
+    *,
+    span_end_min: int | None = None,
+    tz: str | None = None,
 ) -> int:
     now = _now_iso_utc()
     cursor = conn.execute(
-        """
+        f"""
         INSERT INTO items (
             day_id,
             title,
             category,
             start_min,
             end_min,
+            span_end_min,
+            timezone,
+            position,
             created_at,
             updated_at
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?);
+        VALUES (?, ?, ?, ?, ?, ?, ?, {_NEXT_POSITION}, ?, ?);
         """,
-        (day_id, title, category, start_min, end_min, now, now),
+        (day_id, title, category, start_min, end_min, span_end_min, tz, day_id, now, now),
     )
+    item_id = int(cursor.lastrowid)
+    refresh_utc_instants(conn, item_id=item_id)
     conn.commit()
-    return int(cursor.lastrowid)
+    return item_id
 
 
 def get_item(conn, item_id: int) -> dict | None:
+    cache = row_cache.get_cache(conn)
+    if cache is not None:
+        cached = cache.get(("item", item_id))
+        if cached is not None:
+            return cached
+
     cursor = conn.execute(
         """
         SELECT
@@ -86,7 +113,10 @@ def get_item(conn, item_id: int) -> dict | None:
             provider,
             extra_json,
             created_at,
-            updated_at
+            updated_at,
+            span_end_min,
+            start_utc,
+            end_utc
         FROM items
         WHERE id = ?;
         """,
@@ -96,7 +126,7 @@ def get_item(conn, item_id: int) -> dict | None:
     if row is None:
         return None
 
-    return {
+    item = {
         "id": row[0],
         "day_id": row[1],
         "title": row[2],
@@ -126,10 +156,25 @@ def get_item(conn, item_id: int) -> dict | None:
         "extra_json": row[26],
         "created_at": row[27],
         "updated_at": row[28],
+        "span_end_min": row[29],
+        "start_utc": row[30],
+        "end_utc": row[31],
     }
+    if cache is not None:
+        cache.put(("item", item_id), item)
+    return item
 
 
 def list_items_for_day(conn, day_id: int) -> list[dict]:
+    return list(iter_items_for_day(conn, day_id))
+
+
+def iter_items_for_day(conn, day_id: int) -> Iterator[dict]:
+    """
+    list_items_for_day's rows, read from the cursor as they are consumed.
+
+    Nothing is queried until the first row is requested.
+    """
     cursor = conn.execute(
         """
         SELECT
@@ -147,20 +192,22 @@ def list_items_for_day(conn, day_id: int) -> list[dict]:
             tags,
             notes,
             created_at,
-            updated_at
+            updated_at,
+            span_end_min,
+            timezone
         FROM items
         WHERE day_id = ?
         ORDER BY
             pinned DESC,
             CASE WHEN start_min IS NULL THEN 1 ELSE 0 END,
             start_min ASC,
+            position ASC,
             id ASC;
         """,
         (day_id,),
     )
 
-    rows = cursor.fetchall()
-    return [
+    rows = (
         {
             "id": r[0],
             "day_id": r[1],
@@ -177,9 +224,339 @@ def list_items_for_day(conn, day_id: int) -> list[dict]:
             "notes": r[12],
             "created_at": r[13],
             "updated_at": r[14],
+            "span_end_min": r[15],
+            "timezone": r[16],
         }
-        for r in rows
+        for r in cursor
+    )
+    yield from recurring_repository.merge_occurrences(
+        rows,
+        recurring_repository.list_occurrences_for_day(conn, day_id),
+        key=_list_order_key,
+        fields=_LIST_FIELDS,
+    )
+
+
+def get_day_items_version(conn, day_id: int) -> tuple[int, str | None, int]:
+    """
+    (item count, latest updated_at, schedule stamp) of a day: changes whenever its listing does.
+
+    Every item write sets updated_at to now and deletes lower the count;
+    recurring rules, skips and re-dating bump the day's stamp.
+    """
+    row = conn.execute(
+        """
+        SELECT
+            COUNT(*),
+            MAX(updated_at),
+            (SELECT COALESCE(MAX(stamp), 0) FROM day_stamps WHERE day_id = ?)
+        FROM items
+        WHERE day_id = ?;
+        """,
+        (day_id, day_id),
+    ).fetchone()
+    return int(row[0]), row[1], int(row[2])
+
+
+_LIST_FIELDS = (
+    "id", "day_id", "title", "category", "start_min", "end_min", "is_all_day", "pinned",
+    "estimated_cost", "actual_cost", "currency", "tags", "notes", "created_at", "updated_at", "span_end_min",
+    "timezone",
+)
+
+
+def _list_order_key(it: dict) -> tuple:
+    # list_items_for_day's ORDER BY down to start_min; recurring occurrences
+    # follow the items they tie with.
+    start = it["start_min"]
+    return (-it["pinned"], start is None, start or 0, it.get("recurring_id") or 0)
+
+
+def list_scheduled_for_day(conn, day_id: int) -> list[dict]:
+    """
+    Scheduled items of a day as {id, start_min, end_min, pinned, start_utc, end_utc}, in list_items_for_day order.
+
+    Served entirely from idx_items_day_scheduled; scheduled recurring
+    occurrences are merged in.
+    """
+    cursor = conn.execute(
+        """
+        SELECT id, start_min, end_min, pinned, start_utc, end_utc
+        FROM items
+        WHERE day_id = ? AND start_min IS NOT NULL
+        ORDER BY pinned DESC, start_min ASC, id ASC;
+        """,
+        (day_id,),
+    )
+    rows = (
+        {"id": r[0], "start_min": r[1], "end_min": r[2], "pinned": r[3], "start_utc": r[4], "end_utc": r[5]}
+        for r in cursor.fetchall()
+    )
+    occurrences = [
+        occ for occ in recurring_repository.list_occurrences_for_day(conn, day_id) if occ["start_min"] is not None
+    ]
+    return list(
+        recurring_repository.merge_occurrences(
+            rows,
+            occurrences,
+            key=_list_order_key,
+            fields=("id", "start_min", "end_min", "pinned", "start_utc", "end_utc"),
+        )
+    )
+
+
+def find_overlapping_item(
+    conn,
+    day_id: int,
+    start_min: int,
+    end_min: int,
+    *,
+    tz: str | None = None,
+    exclude_item_id: int | None = None,
+) -> dict | None:
+    """
+    First scheduled item overlapping the half-open range [start_min, end_min) of day_id, local to tz.
+
+    end_min may run past 1440 (multi-day items). Items are compared by UTC
+    instant, so items of neighbouring days and other timezones count, as do
+    multi-day items from earlier days reaching into this one. Recurring
+    occurrences on the day count too; they are looked at only when no stored
+    item overlaps. Returns {id, day_id, start_min, end_min} with the other
+    item's minutes relative to its own day.
+    """
+    day = conn.execute("SELECT date FROM days WHERE id = ?;", (day_id,)).fetchone()
+    if day is None:
+        return None
+    start_utc = utc_minutes(day[0], start_min, tz)
+    end_utc = utc_minutes(day[0], end_min, tz)
+
+    # UTC offsets differ by at most 26 hours: two days either side reach every
+    # single-day item that can overlap; earlier multi-day items are added by span.
+    cursor = conn.execute(
+        """
+        SELECT i.id, i.day_id, i.start_min, COALESCE(i.span_end_min, i.end_min)
+        FROM days AS cur
+        JOIN days AS d
+            ON d.trip_id = cur.trip_id
+            AND d.day_num <= cur.day_num + ?
+        JOIN items AS i ON i.day_id = d.id AND i.start_utc < ?
+        WHERE cur.id = ?
+          AND (d.day_num >= cur.day_num - 2 OR i.span_end_min IS NOT NULL)
+          AND i.end_utc > ?
+          AND i.id IS NOT ?
+        ORDER BY d.day_num ASC, d.date ASC, d.id ASC, i.start_utc ASC, i.end_utc ASC
+        LIMIT 1;
+        """,
+        (end_min // 1440 + 2, end_utc, day_id, start_utc, exclude_item_id),
+    )
+    row = cursor.fetchone()
+    if row is not None:
+        return {"id": row[0], "day_id": row[1], "start_min": row[2], "end_min": row[3]}
+
+    clashes = [
+        occ
+        for occ in recurring_repository.list_occurrences_for_day(conn, day_id)
+        if occ["start_min"] is not None and occ["start_utc"] < end_utc and occ["end_utc"] > start_utc
     ]
+    if not clashes:
+        return None
+    occ = min(clashes, key=_list_order_key)
+    return {"id": occ["id"], "day_id": day_id, "start_min": occ["start_min"], "end_min": occ["end_min"]}
+
+
+def iter_trip_timeline(conn, trip_id: int) -> Iterator[dict]:
+    """
+    Yield a trip's scheduled items as {id, day_id, date, start, end} in UTC order.
+
+    start/end are the items' UTC instants (minutes since the epoch), so
+    multi-day items keep their full extent and items in different timezones
+    compare correctly. Read from idx_items_day_utc; only the trip's items are
+    sorted.
+    """
+    cursor = conn.execute(
+        """
+        SELECT i.id, i.day_id, d.date, i.start_utc, i.end_utc
+        FROM days AS d
+        JOIN items AS i ON i.day_id = d.id AND i.start_utc IS NOT NULL
+        WHERE d.trip_id = ?
+        ORDER BY i.start_utc ASC, i.id ASC;
+        """,
+        (trip_id,),
+    )
+    for r in cursor:
+        yield {"id": r[0], "day_id": r[1], "date": r[2], "start": r[3], "end": r[4]}
+
+
+def refresh_utc_instants(
+    conn,
+    *,
+    item_id: int | None = None,
+    day_id: int | None = None,
+    trip_id: int | None = None,
+    schema: str = "main",
+) -> int:
+    """
+    Recompute start_utc/end_utc for one item, one day, one trip or (no argument) every item.
+
+    Run inside the caller's transaction by every write that moves an item in
+    time: scheduling it, changing its timezone, re-dating its day. Only rows
+    whose instants change are written. Returns the number of rows updated.
+    """
+    if item_id is not None:
+        scope, params = "i.id = ?", (item_id,)
+    elif day_id is not None:
+        scope, params = "i.day_id = ?", (day_id,)
+    elif trip_id is not None:
+        scope, params = "d.trip_id = ?", (trip_id,)
+    else:
+        scope, params = "1 = 1", ()
+
+    cursor = conn.execute(
+        f"""
+        SELECT i.id, d.date, i.start_min, COALESCE(i.span_end_min, i.end_min), i.timezone, i.start_utc, i.end_utc
+        FROM {schema}.days AS d
+        JOIN {schema}.items AS i ON i.day_id = d.id
+        WHERE {scope};
+        """,
+        params,
+    )
+    changed = []
+    for id_, date, start_min, end_min, tz, old_start, old_end in cursor.fetchall():
+        if start_min is None:
+            new_start = new_end = None
+        else:
+            new_start = utc_minutes(date, start_min, tz)
+            new_end = utc_minutes(date, end_min, tz)
+        if (new_start, new_end) != (old_start, old_end):
+            changed.append((new_start, new_end, id_))
+    if changed:
+        conn.executemany(f"UPDATE {schema}.items SET start_utc = ?, end_utc = ? WHERE id = ?;", changed)
+    return len(changed)
+
+
+def get_adjacent_position(
+    conn,
+    day_id: int,
+    position: int,
+    *,
+    direction: str,
+    exclude_item_id: int | None = None,
+) -> int | None:
+    """
+    Nearest position in the day strictly before or after `position` (direction "before"/"after").
+    """
+    if direction == "before":
+        sql = """
+            SELECT position FROM items
+            WHERE day_id = ? AND position < ? AND id IS NOT ?
+            ORDER BY position DESC
+            LIMIT 1;
+        """
+    elif direction == "after":
+        sql = """
+            SELECT position FROM items
+            WHERE day_id = ? AND position > ? AND id IS NOT ?
+            ORDER BY position ASC
+            LIMIT 1;
+        """
+    else:
+        raise ValueError(f"unknown direction: {direction!r}")
+
+    row = conn.execute(sql, (day_id, position, exclude_item_id)).fetchone()
+    return None if row is None else int(row[0])
+
+
+def day_has_unpositioned_items(conn, day_id: int) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM items WHERE day_id = ? AND position IS NULL LIMIT 1;",
+        (day_id,),
+    ).fetchone()
+    return row is not None
+
+
+def _midpoint_between(conn, day_id: int, item_id: int, anchor_pos: int, direction: str) -> int | None:
+    neighbour = get_adjacent_position(conn, day_id, anchor_pos, direction=direction, exclude_item_id=item_id)
+    if direction == "before":
+        lo, hi = (neighbour if neighbour is not None else anchor_pos - 2 * POSITION_GAP), anchor_pos
+    else:
+        lo, hi = anchor_pos, (neighbour if neighbour is not None else anchor_pos + 2 * POSITION_GAP)
+
+    mid = (lo + hi) // 2
+    return mid if lo < mid < hi else None
+
+
+def move_item_position(conn, item_id: int, anchor_id: int, *, direction: str) -> int:
+    """
+    Put item_id directly before or after anchor_id (direction "before"/"after"); returns its new position.
+
+    Usually a single-row update to the midpoint between the anchor and its
+    neighbour. The day is respaced first when it still has rows without a
+    position, or when that gap is used up; either way in the same
+    transaction as the move, so no other writer sees one without the other.
+    """
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        row = conn.execute("SELECT day_id FROM items WHERE id = ?;", (anchor_id,)).fetchone()
+        if row is None:
+            raise LookupError("anchor item not found.")
+        day_id = row[0]
+
+        respaced = False
+        if day_has_unpositioned_items(conn, day_id):
+            _respace_day(conn, day_id)
+            respaced = True
+        anchor_pos = conn.execute("SELECT position FROM items WHERE id = ?;", (anchor_id,)).fetchone()[0]
+        position = _midpoint_between(conn, day_id, item_id, anchor_pos, direction)
+        if position is None:
+            _respace_day(conn, day_id)
+            respaced = True
+            anchor_pos = conn.execute("SELECT position FROM items WHERE id = ?;", (anchor_id,)).fetchone()[0]
+            position = _midpoint_between(conn, day_id, item_id, anchor_pos, direction)
+
+        conn.execute(
+            "UPDATE items SET position = ?, updated_at = ? WHERE id = ?;",
+            (position, _now_iso_utc(), item_id),
+        )
+    except BaseException:
+        conn.rollback()
+        raise
+
+    if respaced:
+        row_cache.invalidate_day(conn, day_id, cascade=True)
+    else:
+        row_cache.invalidate_item(conn, item_id)
+    conn.commit()
+    return position
+
+
+def rebalance_positions(conn, day_id: int) -> int:
+    """
+    Respace a day's positions to POSITION_GAP multiples, keeping their order
+    (items without a position first, ties by id). Returns the rows rewritten.
+    """
+    rewritten = _respace_day(conn, day_id)
+    row_cache.invalidate_day(conn, day_id, cascade=True)
+    conn.commit()
+    return rewritten
+
+
+def _respace_day(conn, day_id: int) -> int:
+    cursor = conn.execute(
+        f"""
+        WITH ranked AS (
+            SELECT id, ROW_NUMBER() OVER (ORDER BY position, id) AS rn
+            FROM items
+            WHERE day_id = ?
+        )
+        UPDATE items
+        SET position = ranked.rn * {POSITION_GAP}, updated_at = ?
+        FROM ranked
+        WHERE items.id = ranked.id
+          AND items.position IS NOT ranked.rn * {POSITION_GAP};
+        """,
+        (day_id, _now_iso_utc()),
+    )
+    return int(cursor.rowcount)
 
 
 def delete_item(conn, item_id: int) -> None:
@@ -187,12 +564,59 @@ def delete_item(conn, item_id: int) -> None:
         "DELETE FROM items WHERE id = ?;",
         (item_id,),
     )
+    row_cache.invalidate_item(conn, item_id)
     conn.commit()
 
 def _now_iso_utc() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+# Columns update_item may set, and those that move the item in time.
+_UPDATABLE_COLUMNS = frozenset(
+    {"title", "category", "notes", "tags", "pinned", "start_min", "end_min", "span_end_min", "timezone"}
+)
+_TIME_COLUMNS = frozenset({"start_min", "end_min", "span_end_min", "timezone"})
+
+
+def update_item(
+    conn,
+    item_id: int,
+    changes: dict[str, object],
+    *,
+    expected_updated_at: str | None = None,
+) -> str | None:
+    """
+    Apply every column in `changes` in one UPDATE; returns the item's new updated_at.
+
+    With expected_updated_at the update only applies while the row still has
+    that updated_at (optimistic concurrency). None means no row was written:
+    the item is gone, or another writer got there first. The UTC instants
+    are recomputed in the same transaction when the time or timezone changes.
+    """
+    unknown = set(changes) - _UPDATABLE_COLUMNS
+    if unknown:
+        raise ValueError(f"cannot update item columns: {', '.join(sorted(unknown))}")
+    if not changes:
+        return None
+
+    now = _now_iso_utc()
+    assignments = ", ".join(f"{column} = ?" for column in changes)
+    where = ""
+    params: tuple = ()
+    if expected_updated_at is not None:
+        where, params = " AND updated_at = ?", (expected_updated_at,)
+
+    cursor = conn.execute(
+        f"UPDATE items SET {assignments}, updated_at = ? WHERE id = ?{where};",
+        (*changes.values(), now, item_id, *params),
+    )
+    if cursor.rowcount and not _TIME_COLUMNS.isdisjoint(changes):
+        refresh_utc_instants(conn, item_id=item_id)
+    row_cache.invalidate_item(conn, item_id)
+    conn.commit()
+    return now if cursor.rowcount else None
+
+
 def update_item_fields(
     conn,
     item_id: int,
@@ -202,62 +626,49 @@ def update_item_fields(
     notes: str | None = None,
     tags: str | None = None,
     pinned: int | None = None,
-) -> None:
-    fields = []
-    values = []
-
-    if title is not None:
-        fields.append("title = ?")
-        values.append(title)
+    expected_updated_at: str | None = None,
+) -> str | None:
+    """
+    Patch the given fields; returns the item's new updated_at, or None when nothing was written.
+    """
+    fields = {"title": title, "category": category, "notes": notes, "tags": tags, "pinned": pinned}
+    changes = {column: value for column, value in fields.items() if value is not None}
+    return update_item(conn, item_id, changes, expected_updated_at=expected_updated_at)
 
-    if category is not None:
-        fields.append("category = ?")
-        values.append(category)
 
-    if notes is not None:
-        fields.append("notes = ?")
-        values.append(notes)
-
-    if tags is not None:
-        fields.append("tags = ?")
-        values.append(tags)
-
-    if pinned is not None:
-        fields.append("pinned = ?")
-        values.append(pinned)
-
-    if not fields:
-        return
-
-    fields.append("updated_at = ?")
-    values.append(_now_iso_utc())
-
-    values.append(item_id)
-
-    sql = f"UPDATE items SET {', '.join(fields)} WHERE id = ?;"
-    conn.execute(sql, tuple(values))
-    conn.commit()
+def update_item_time(
+    conn,
+    item_id: int,
+    start_min: int,
+    end_min: int,
+    *,
+    expected_updated_at: str | None = None,
+) -> str | None:
+    """
+    Reschedule an item within its day; returns the new updated_at (None: nothing written).
+    """
+    return update_item(
+        conn,
+        item_id,
+        {"start_min": start_min, "end_min": end_min, "span_end_min": None},
+        expected_updated_at=expected_updated_at,
+    )
 
 
-def update_item_time(conn, item_id: int, start_min: int, end_min: int) -> None:
-    conn.execute(
-        """
-        UPDATE items
-        SET start_min = ?, end_min = ?, updated_at = ?
-        WHERE id = ?;
-        """,
-        (start_min, end_min, _now_iso_utc(), item_id),
+def clear_item_time(conn, item_id: int, *, expected_updated_at: str | None = None) -> str | None:
+    return update_item(
+        conn,
+        item_id,
+        {"start_min": None, "end_min": None, "span_end_min": None},
+        expected_updated_at=expected_updated_at,
     )
-    conn.commit()
 
 
-def clear_item_time(conn, item_id: int) -> None:
-    conn.execute(
-        """
-        UPDATE items
-        SET start_min = NULL, end_min = NULL, updated_at = ?
-        WHERE id = ?;
-        """,
-        (_now_iso_utc(), item_id),
-    )
-    conn.commit()
\ No newline at end of file
+def update_item_timezone(
+    conn,
+    item_id: int,
+    tz: str | None,
+    *,
+    expected_updated_at: str | None = None,
+) -> str | None:
+    return update_item(conn, item_id, {"timezone": tz}, expected_updated_at=expected_updated_at)
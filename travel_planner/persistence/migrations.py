@@ -0,0 +1,164 @@
+'''
+Purpose: Versioned schema changes for existing databases.
+
+init_schema() creates every table, index and trigger with IF NOT EXISTS, so
+additions need no migration. MIGRATIONS holds the steps that cannot be
+expressed that way (dropping superseded objects, ALTER TABLE, backfills).
+Migrations run after the table DDL and before the index and trigger DDL,
+so indexes may cover columns a migration adds.
+The applied version is stored in PRAGMA user_version; each step runs in its
+own transaction together with the version bump.
+'''
+
+from __future__ import annotations
+
+import sqlite3
+from sqlite3 import Connection
+from typing import Callable, Union
+
+from travel_planner.persistence import item_repository
+
+# A step is SQL text, or a callable for changes that depend on the current
+# schema (e.g. adding a column only where CREATE TABLE did not already).
+Step = Union[str, Callable[[Connection], None]]
+
+
+# Tables whose ids must never be reused: archived trips keep theirs.
+AUTOINCREMENT_TABLES = ("trips", "days", "items", "recurring_items")
+
+
+def rebuild_with_autoincrement(conn: Connection, schema: str = "main") -> None:
+    """
+    Recreate the id tables with AUTOINCREMENT where CREATE TABLE did not have it, keeping their rows.
+
+    Needs foreign keys off (migrate turns them off). The old tables' indexes
+    and triggers go with them; init_schema creates them again.
+    """
+    # schema.py imports this module.
+    from travel_planner.persistence.schema import get_entity_table_ddl
+
+    pending = [
+        table
+        for table in AUTOINCREMENT_TABLES
+        if "AUTOINCREMENT" not in conn.execute(
+            f"SELECT sql FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?;", (table,)
+        ).fetchone()[0].upper()
+    ]
+    if not pending:
+        return
+
+    # RENAME re-checks every trigger, and a trigger body may name a table
+    # that is dropped at that moment.
+    triggers = [r[0] for r in conn.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'trigger';")]
+    for name in triggers:
+        conn.execute(f"DROP TRIGGER {schema}.{name};")
+
+    for table in pending:
+        ddl = next(d for d in get_entity_table_ddl() if f"CREATE TABLE IF NOT EXISTS {table} (" in d)
+        conn.execute(ddl.replace(f"CREATE TABLE IF NOT EXISTS {table} (", f"CREATE TABLE {schema}.{table}_rebuild ("))
+        new_cols = {r[1] for r in conn.execute(f"PRAGMA {schema}.table_info({table}_rebuild);")}
+        cols = ", ".join(r[1] for r in conn.execute(f"PRAGMA {schema}.table_info({table});") if r[1] in new_cols)
+        conn.execute(f"INSERT INTO {schema}.{table}_rebuild ({cols}) SELECT {cols} FROM {schema}.{table};")
+        conn.execute(f"DROP TABLE {schema}.{table};")
+        conn.execute(f"ALTER TABLE {schema}.{table}_rebuild RENAME TO {table};")
+
+
+def add_days_day_num(conn: Connection, schema: str = "main") -> None:
+    """
+    Add days.day_num to a database created before it existed (also used for archive files).
+    """
+    columns = {r[1] for r in conn.execute(f"PRAGMA {schema}.table_xinfo(days);")}
+    if "day_num" not in columns:
+        # ALTER TABLE can add a VIRTUAL generated column but not a STORED one;
+        # idx_days_day_num stores the values.
+        conn.execute(
+            f"ALTER TABLE {schema}.days ADD COLUMN day_num INTEGER "
+            "GENERATED ALWAYS AS (CAST(julianday(date) AS INTEGER)) VIRTUAL;"
+        )
+
+
+def add_items_span_end_min(conn: Connection, schema: str = "main") -> None:
+    """
+    Add items.span_end_min (multi-day items) where CREATE TABLE did not already have it.
+    """
+    columns = {r[1] for r in conn.execute(f"PRAGMA {schema}.table_info(items);")}
+    if "span_end_min" not in columns:
+        conn.execute(
+            f"ALTER TABLE {schema}.items ADD COLUMN span_end_min INTEGER "
+            "CHECK (span_end_min IS NULL OR (end_min = 1440 AND span_end_min > 1440));"
+        )
+
+
+def add_items_utc_instants(conn: Connection, schema: str = "main") -> None:
+    """
+    Add items.start_utc/end_utc where CREATE TABLE did not already have them, and fill them in.
+    """
+    columns = {r[1] for r in conn.execute(f"PRAGMA {schema}.table_info(items);")}
+    for column in ("start_utc", "end_utc"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {schema}.items ADD COLUMN {column} INTEGER;")
+    item_repository.refresh_utc_instants(conn, schema=schema)
+
+
+MIGRATIONS: list[tuple[int, str, list[Step]]] = [
+    (
+        1,
+        "replace the item day indexes with the ordered/partial ones; give the id tables "
+        "AUTOINCREMENT; add days.day_num, items.span_end_min and items.start_utc/end_utc",
+        [
+            "DROP INDEX IF EXISTS idx_items_day;",
+            "DROP INDEX IF EXISTS idx_items_day_time;",
+            rebuild_with_autoincrement,
+            add_days_day_num,
+            add_items_span_end_min,
+            add_items_utc_instants,
+        ],
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_user_version(conn: Connection) -> int:
+    return int(conn.execute("PRAGMA user_version;").fetchone()[0])
+
+
+def migrate(conn: Connection) -> int:
+    """
+    Apply pending migrations in order and return the resulting schema version.
+    """
+    version = get_user_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"database schema version {version} is newer than this code supports ({SCHEMA_VERSION})."
+        )
+
+    pending = [m for m in MIGRATIONS if m[0] > version]
+    if not pending:
+        return version
+
+    # Off while steps rebuild tables (a DROP TABLE would cascade); checked
+    # before each commit instead. The pragma is a no-op inside a transaction.
+    foreign_keys = conn.execute("PRAGMA foreign_keys;").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF;")
+    try:
+        for target, _description, statements in pending:
+            conn.execute("BEGIN;")
+            try:
+                for step in statements:
+                    if callable(step):
+                        step(conn)
+                    else:
+                        conn.execute(step)
+                if conn.execute("PRAGMA foreign_key_check;").fetchone() is not None:
+                    raise sqlite3.IntegrityError(f"migration {target} left rows with dangling foreign keys.")
+                conn.execute(f"PRAGMA user_version = {int(target)};")
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            version = target
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {int(foreign_keys)};")
+
+    return version
@@ -0,0 +1,203 @@
+'''
+Purpose: Recurring item rules (one row per trip) and their lazy per-day expansion.
+
+An occurrence is a rule seen on one day. It is never stored: the day
+listings, overlap checks and exports ask for the occurrences of the day they
+are reading and merge them with that day's items. Occurrences look like item
+rows whose id is "r<rule id>" and that carry recurring_id. Rules have no
+timezone: their UTC instants are floating local time.
+'''
+
+from __future__ import annotations
+
+import heapq
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator
+
+from travel_planner.domain.timezones import utc_minutes
+
+# The rule matches the day: inside its date window, on its interval, not skipped.
+_MATCHES_DAY = """
+    (r.from_date IS NULL OR d.date >= r.from_date)
+    AND (r.until_date IS NULL OR d.date <= r.until_date)
+    AND (r.interval_days = 1 OR (d.day_num - CAST(julianday(r.from_date) AS INTEGER)) % r.interval_days = 0)
+    AND NOT EXISTS (
+        SELECT 1 FROM {schema}.recurring_skips AS s WHERE s.rule_id = r.id AND s.day_id = d.id
+    )
+"""
+
+_RULE_COLUMNS = (
+    "id",
+    "trip_id",
+    "title",
+    "category",
+    "start_min",
+    "end_min",
+    "pinned",
+    "interval_days",
+    "from_date",
+    "until_date",
+    "created_at",
+    "updated_at",
+)
+
+
+def occurrence_id(rule_id: int) -> str:
+    return f"r{rule_id}"
+
+
+def create_rule(
+    conn,
+    trip_id: int,
+    title: str,
+    category: str,
+    *,
+    start_min: int | None = None,
+    end_min: int | None = None,
+    pinned: int = 0,
+    interval_days: int = 1,
+    from_date: str | None = None,
+    until_date: str | None = None,
+) -> int:
+    now = _now_iso_utc()
+    cursor = conn.execute(
+        """
+        INSERT INTO recurring_items (
+            trip_id, title, category, start_min, end_min, pinned,
+            interval_days, from_date, until_date, created_at, updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """,
+        (trip_id, title, category, start_min, end_min, pinned, interval_days, from_date, until_date, now, now),
+    )
+    conn.commit()
+    return int(cursor.lastrowid)
+
+
+def get_rule(conn, rule_id: int) -> dict | None:
+    row = conn.execute(
+        f"SELECT {', '.join(_RULE_COLUMNS)} FROM recurring_items WHERE id = ?;",
+        (rule_id,),
+    ).fetchone()
+    return None if row is None else dict(zip(_RULE_COLUMNS, row))
+
+
+def list_rules_for_trip(conn, trip_id: int) -> list[dict]:
+    cursor = conn.execute(
+        f"SELECT {', '.join(_RULE_COLUMNS)} FROM recurring_items WHERE trip_id = ? ORDER BY id ASC;",
+        (trip_id,),
+    )
+    return [dict(zip(_RULE_COLUMNS, r)) for r in cursor.fetchall()]
+
+
+def delete_rule(conn, rule_id: int) -> None:
+    conn.execute("DELETE FROM recurring_items WHERE id = ?;", (rule_id,))
+    conn.commit()
+
+
+def add_skip(conn, rule_id: int, day_id: int) -> None:
+    conn.execute(
+        "INSERT OR IGNORE INTO recurring_skips (rule_id, day_id) VALUES (?, ?);",
+        (rule_id, day_id),
+    )
+    conn.commit()
+
+
+def remove_skip(conn, rule_id: int, day_id: int) -> None:
+    conn.execute(
+        "DELETE FROM recurring_skips WHERE rule_id = ? AND day_id = ?;",
+        (rule_id, day_id),
+    )
+    conn.commit()
+
+
+def list_occurrences_for_day(conn, day_id: int, *, schema: str = "main") -> list[dict]:
+    """
+    Rules of the day's trip that occur on that day, as item-shaped rows (unsorted).
+
+    One probe of the day plus its trip's rules (idx_recurring_items_trip);
+    trips without rules cost a single index seek.
+    """
+    cursor = conn.execute(
+        f"""
+        SELECT r.id, d.id, r.title, r.category, r.start_min, r.end_min, r.pinned, r.created_at, r.updated_at, d.date
+        FROM {schema}.days AS d
+        JOIN {schema}.recurring_items AS r ON r.trip_id = d.trip_id
+        WHERE d.id = ? AND {_MATCHES_DAY.format(schema=schema)};
+        """,
+        (day_id,),
+    )
+    return [
+        {
+            "id": occurrence_id(r[0]),
+            "recurring_id": r[0],
+            "day_id": r[1],
+            "title": r[2],
+            "category": r[3],
+            "start_min": r[4],
+            "end_min": r[5],
+            "is_all_day": 0,
+            "pinned": r[6],
+            "created_at": r[7],
+            "updated_at": r[8],
+            "start_utc": None if r[4] is None else utc_minutes(r[9], r[4], None),
+            "end_utc": None if r[5] is None else utc_minutes(r[9], r[5], None),
+        }
+        for r in cursor.fetchall()
+    ]
+
+
+def list_trip_occurrences(conn, trip_id: int) -> list[dict]:
+    """
+    Scheduled occurrences across a trip as {id, day_id, date, start, end} (unsorted).
+
+    start/end are UTC instants, the coordinates of
+    item_repository.iter_trip_timeline.
+    """
+    cursor = conn.execute(
+        f"""
+        SELECT r.id, d.id, d.date, r.start_min, r.end_min
+        FROM days AS d
+        JOIN recurring_items AS r ON r.trip_id = d.trip_id AND r.start_min IS NOT NULL
+        WHERE d.trip_id = ? AND {_MATCHES_DAY.format(schema="main")};
+        """,
+        (trip_id,),
+    )
+    return [
+        {
+            "id": occurrence_id(r[0]),
+            "day_id": r[1],
+            "date": r[2],
+            "start": utc_minutes(r[2], r[3], None),
+            "end": utc_minutes(r[2], r[4], None),
+        }
+        for r in cursor.fetchall()
+    ]
+
+
+def merge_occurrences(
+    rows: Iterable[dict],
+    occurrences: list[dict],
+    *,
+    key: Callable[[dict], Any],
+    fields: Iterable[str],
+) -> Iterator[dict]:
+    """
+    Lazily merge a day's occurrences into its already-sorted item rows.
+
+    Occurrences are reshaped to the rows' fields (plus recurring_id). key must
+    order the rows as their query does; ties keep items before occurrences.
+    """
+    if not occurrences:
+        yield from rows
+        return
+    fields = tuple(fields)
+    shaped = sorted(
+        ({**{f: occ.get(f) for f in fields}, "recurring_id": occ["recurring_id"]} for occ in occurrences),
+        key=key,
+    )
+    yield from heapq.merge(rows, shaped, key=key)
+
+
+def _now_iso_utc() -> str:
+    return datetime.now(timezone.utc).isoformat()
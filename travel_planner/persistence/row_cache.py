@@ -0,0 +1,208 @@
+'''
+Purpose: Optional in-process LRU cache for single-row repository reads
+(get_trip / get_day / get_item).
+
+The cache is attached to one connection. Writes made through the repositories
+on that connection invalidate exactly the affected entries; writes committed by
+any other connection (another thread or process) are detected through
+PRAGMA data_version, which drops the whole cache.
+
+data_version is checked once per unit of work, not on every lookup: at the
+first lookup after expire(), which ConnectionPool calls on every checkout.
+'''
+
+from __future__ import annotations
+
+import sqlite3
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class RowCache:
+    def __init__(self, conn: sqlite3.Connection, *, max_entries: int = 1024) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+
+        self.conn = conn
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, dict] = OrderedDict()
+        self._data_version = self._read_data_version()
+        self._synced = True
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.external_resets = 0
+
+    def _read_data_version(self) -> int:
+        return int(self.conn.execute("PRAGMA data_version;").fetchone()[0])
+
+    def sync(self) -> None:
+        """
+        Drop everything if another connection has committed since the last check.
+        """
+        version = self._read_data_version()
+        self._synced = True
+        if version != self._data_version:
+            self._data_version = version
+            if self._entries:
+                self._entries.clear()
+                self.external_resets += 1
+
+    def expire(self) -> None:
+        """
+        Make the next lookup check data_version again.
+        """
+        self._synced = False
+
+    @property
+    def synced(self) -> bool:
+        return self._synced
+
+    def get(self, key: Hashable) -> dict | None:
+        row = self._entries.get(key)
+        if row is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Hand out copies so callers can never mutate a cached row.
+        return dict(row)
+
+    def put(self, key: Hashable, row: dict) -> None:
+        self._entries[key] = dict(row)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def invalidate_where(self, kind: str, predicate: Callable[[dict], bool]) -> list[dict]:
+        """
+        Drop every cached row of the given kind matching predicate; returns the dropped rows.
+        """
+        dropped = [
+            (key, row)
+            for key, row in self._entries.items()
+            if key[0] == kind and predicate(row)
+        ]
+        for key, _ in dropped:
+            del self._entries[key]
+        self.invalidations += len(dropped)
+        return [row for _, row in dropped]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "external_resets": self.external_resets,
+        }
+
+
+# sqlite3.Connection cannot be weak-referenced, so caches are registered by id()
+# and hold the connection until disable_cache() is called.
+_caches: dict[int, RowCache] = {}
+
+
+def enable_cache(conn: sqlite3.Connection, *, max_entries: int = 1024) -> RowCache:
+    cache = _caches.get(id(conn))
+    if cache is None or cache.conn is not conn:
+        cache = RowCache(conn, max_entries=max_entries)
+        _caches[id(conn)] = cache
+    return cache
+
+
+def disable_cache(conn: sqlite3.Connection) -> None:
+    _caches.pop(id(conn), None)
+
+
+def get_cache(conn: sqlite3.Connection) -> RowCache | None:
+    """
+    Return the connection's cache (synced against other writers), or None if caching is off.
+    """
+    if not _caches:
+        return None
+
+    cache = _caches.get(id(conn))
+    if cache is None or cache.conn is not conn:
+        return None
+
+    if not cache.synced:
+        cache.sync()
+    return cache
+
+
+def expire(conn: sqlite3.Connection) -> None:
+    """
+    Start a new unit of work on conn: its next cache lookup re-checks data_version.
+
+    Code that keeps one cached connection across units of work (rather than
+    checking it out of a ConnectionPool) calls this between them.
+    """
+    cache = _caches.get(id(conn))
+    if cache is not None and cache.conn is conn:
+        cache.expire()
+
+
+def invalidate_trip(conn: sqlite3.Connection, trip_id: int, *, cascade: bool = False) -> None:
+    """
+    Invalidate a trip; with cascade, also every cached day and item ON DELETE CASCADE would remove.
+    """
+    cache = get_cache(conn)
+    if cache is None:
+        return
+    cache.invalidate(("trip", trip_id))
+    if not cascade:
+        return
+    days = cache.invalidate_where("day", lambda d: d["trip_id"] == trip_id)
+    day_ids = {d["id"] for d in days}
+    # Days of this trip that were never cached still own items; match via the item's day_id.
+    day_ids.update(
+        row[0]
+        for row in conn.execute("SELECT id FROM days WHERE trip_id = ?;", (trip_id,))
+    )
+    cache.invalidate_where("item", lambda it: it["day_id"] in day_ids)
+
+
+def invalidate_day(conn: sqlite3.Connection, day_id: int, *, cascade: bool = False) -> None:
+    cache = get_cache(conn)
+    if cache is None:
+        return
+    cache.invalidate(("day", day_id))
+    if cascade:
+        cache.invalidate_where("item", lambda it: it["day_id"] == day_id)
+
+
+def invalidate_item(conn: sqlite3.Connection, item_id: int) -> None:
+    cache = get_cache(conn)
+    if cache is None:
+        return
+    cache.invalidate(("item", item_id))
+
+
+def invalidate_all(conn: sqlite3.Connection) -> None:
+    """
+    For set-based writes that touch rows the caller cannot cheaply enumerate.
+    """
+    cache = get_cache(conn)
+    if cache is None:
+        return
+    cache.invalidations += len(cache)
+    cache.clear()
@@ -1,26 +1,45 @@
 from sqlite3 import Connection
 
+from travel_planner.persistence.migrations import migrate
+
 
 def get_schema_ddl() -> list[str]:
+    # Bulk loaders can run get_table_ddl() alone, load rows, then init_schema()
+    # to build indexes and triggers once instead of maintaining them per row.
+    return [*get_table_ddl(), *get_index_ddl(), *get_trigger_ddl()]
+
+
+def get_table_ddl() -> list[str]:
+    return [*get_entity_table_ddl(), *_support_table_ddl()]
+
+
+def get_entity_table_ddl() -> list[str]:
+    """
+    The trips/days/items tables alone; also the whole schema of an archive database.
+    """
     return [
         """
         CREATE TABLE IF NOT EXISTS trips (
-            id INTEGER PRIMARY KEY,
+            -- AUTOINCREMENT here and below: ids are never reused, so the ids
+            -- of trips moved to an archive database stay theirs.
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL
         );
         """,
         """
         CREATE TABLE IF NOT EXISTS days (
-            id INTEGER PRIMARY KEY,
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
             trip_id INTEGER NOT NULL,
             date TEXT NOT NULL,
+            -- Julian day number of date (floor), for integer range queries.
+            day_num INTEGER GENERATED ALWAYS AS (CAST(julianday(date) AS INTEGER)) VIRTUAL,
             UNIQUE (trip_id, date),
             FOREIGN KEY (trip_id) REFERENCES trips(id) ON DELETE CASCADE
         );
         """,
         """
         CREATE TABLE IF NOT EXISTS items (
-            id INTEGER PRIMARY KEY,
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
             day_id INTEGER NOT NULL,
             title TEXT NOT NULL,
             category TEXT NOT NULL,
@@ -29,6 +48,16 @@ def get_schema_ddl() -> list[str]:
 
             start_min INTEGER,
             end_min INTEGER,
+            -- Multi-day items: minutes from the start day's midnight to the real
+            -- end (past 1440). end_min is then 1440: the start day sees the item
+            -- until midnight, the trip timeline sees all of it.
+            span_end_min INTEGER CHECK (span_end_min IS NULL OR (end_min = 1440 AND span_end_min > 1440)),
+            -- Start/end as minutes since the Unix epoch (UTC), derived from the
+            -- day's date, the minutes above and timezone (floating local time
+            -- when NULL). Refreshed by the repositories on every write that
+            -- moves them; NULL while unscheduled.
+            start_utc INTEGER,
+            end_utc INTEGER,
 
             is_all_day INTEGER NOT NULL DEFAULT 0 CHECK (is_all_day IN (0,1)),
             timezone TEXT,
@@ -71,23 +100,298 @@ def get_schema_ddl() -> list[str]:
             )
         );
         """,
-        # ---- INDEXES ----
+        # ---- RECURRING ITEMS ----
+        # Stored once per trip and expanded into each matching day at query
+        # time. A rule repeats every interval_days days counted from from_date;
+        # NULL from_date/until_date leave that side open (interval_days > 1
+        # needs a from_date to count from).
+        """
+        CREATE TABLE IF NOT EXISTS recurring_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trip_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            category TEXT NOT NULL,
+            start_min INTEGER,
+            end_min INTEGER,
+            pinned INTEGER NOT NULL DEFAULT 0 CHECK (pinned IN (0,1)),
+            interval_days INTEGER NOT NULL DEFAULT 1 CHECK (interval_days >= 1),
+            from_date TEXT,
+            until_date TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+
+            FOREIGN KEY (trip_id) REFERENCES trips(id) ON DELETE CASCADE,
+
+            CHECK (interval_days = 1 OR from_date IS NOT NULL),
+            CHECK (
+                (start_min IS NULL AND end_min IS NULL)
+                OR
+                (
+                    start_min IS NOT NULL
+                    AND end_min IS NOT NULL
+                    AND start_min >= 0
+                    AND end_min <= 1440
+                    AND start_min < end_min
+                )
+            )
+        );
+        """,
+        # Per-date exceptions: the rule does not occur on that day.
+        """
+        CREATE TABLE IF NOT EXISTS recurring_skips (
+            rule_id INTEGER NOT NULL,
+            day_id INTEGER NOT NULL,
+            PRIMARY KEY (rule_id, day_id),
+            FOREIGN KEY (rule_id) REFERENCES recurring_items(id) ON DELETE CASCADE,
+            FOREIGN KEY (day_id) REFERENCES days(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """,
+    ]
+
+
+def _support_table_ddl() -> list[str]:
+    return [
+        # ---- CHANGE LOG ----
+        # AUTOINCREMENT keeps seq strictly increasing even after compaction
+        # deletes the newest rows.
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL CHECK (entity IN ('trip', 'day', 'item')),
+            entity_id INTEGER NOT NULL,
+            op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+            changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+        );
+        """,
+        # ---- DIAGNOSTICS CACHE ----
+        # day_stamps.stamp is bumped whenever an item's schedule in that day
+        # changes. No FK: cascaded item deletes bump the stamp of a day that is
+        # already gone, so trg_days_stamp_cleanup removes the row afterwards.
+        """
+        CREATE TABLE IF NOT EXISTS day_stamps (
+            day_id INTEGER PRIMARY KEY,
+            stamp INTEGER NOT NULL DEFAULT 0
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS day_diagnostics (
+            day_id INTEGER NOT NULL,
+            buffer_min INTEGER NOT NULL,
+            stamp INTEGER NOT NULL,
+            overlaps_json TEXT NOT NULL,
+            tight_json TEXT NOT NULL,
+            PRIMARY KEY (day_id, buffer_min),
+            FOREIGN KEY (day_id) REFERENCES days(id) ON DELETE CASCADE
+        );
+        """,
+    ]
+
+
+def get_index_ddl() -> list[str]:
+    return [
         """
         CREATE INDEX IF NOT EXISTS idx_days_trip_date
         ON days (trip_id, date);
         """,
+        # Date-range queries across trips and within one trip; both covering
+        # for day listings and already in date order.
+        """
+        CREATE INDEX IF NOT EXISTS idx_days_day_num
+        ON days (day_num, trip_id, date);
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_days_trip_day_num
+        ON days (trip_id, day_num, date);
+        """,
+        # Matches item_repository.list_items_for_day's ORDER BY term for term,
+        # then carries the rest of its columns: a day's listing is read from
+        # the index alone, already sorted.
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_day_list_order
+        ON items (
+            day_id,
+            pinned DESC,
+            (CASE WHEN start_min IS NULL THEN 1 ELSE 0 END),
+            start_min,
+            position,
+            id,
+            title,
+            category,
+            end_min,
+            is_all_day,
+            estimated_cost,
+            actual_cost,
+            currency,
+            tags,
+            notes,
+            created_at,
+            updated_at,
+            span_end_min,
+            timezone
+        );
+        """,
+        # Matches export_service.list_items_for_day (scheduled first, by time).
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_day_export_order
+        ON items (
+            day_id,
+            (CASE WHEN start_min IS NULL THEN 1 ELSE 0 END),
+            start_min,
+            end_min,
+            position
+        );
+        """,
+        # Next-position and neighbour lookups for manual reordering.
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_day_position
+        ON items (day_id, position);
+        """,
+        # Scheduled items only, in listing order and covering (id, start, end)
+        # in local and UTC terms: per-day checks never touch the table.
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_day_scheduled
+        ON items (day_id, pinned DESC, start_min, id, end_min, start_utc, end_utc)
+        WHERE start_min IS NOT NULL;
+        """,
+        # Scheduled items per day by UTC instant: overlap lookups across days
+        # and timezones, and the trip timeline, read only the index.
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_day_utc
+        ON items (day_id, start_utc, end_utc)
+        WHERE start_utc IS NOT NULL;
+        """,
         """
-        CREATE INDEX IF NOT EXISTS idx_items_day
-        ON items (day_id);
+        CREATE INDEX IF NOT EXISTS idx_recurring_items_trip
+        ON recurring_items (trip_id);
         """,
+        # Skips cascade from day deletes.
         """
-        CREATE INDEX IF NOT EXISTS idx_items_day_time
-        ON items (day_id, start_min, end_min);
+        CREATE INDEX IF NOT EXISTS idx_recurring_skips_day
+        ON recurring_skips (day_id);
+        """,
+    ]
+
+
+def get_trigger_ddl() -> list[str]:
+    return [*_change_log_triggers(), *_day_stamp_triggers()]
+
+
+def _change_log_triggers() -> list[str]:
+    ddl = []
+    for table, entity in (("trips", "trip"), ("days", "day"), ("items", "item")):
+        for event, op, ref in (
+            ("INSERT", "insert", "NEW"),
+            ("UPDATE", "update", "NEW"),
+            ("DELETE", "delete", "OLD"),
+        ):
+            ddl.append(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_log_{op}
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO change_log (entity, entity_id, op)
+                    VALUES ('{entity}', {ref}.id, '{op}');
+                END;
+                """
+            )
+    return ddl
+
+
+def _day_stamp_triggers() -> list[str]:
+    bump = """
+        INSERT INTO day_stamps (day_id, stamp) VALUES ({ref}.day_id, 1)
+        ON CONFLICT (day_id) DO UPDATE SET stamp = stamp + 1;
+    """
+    bump_trip = """
+        INSERT INTO day_stamps (day_id, stamp)
+        SELECT id, 1 FROM days WHERE trip_id = {ref}.trip_id
+        ON CONFLICT (day_id) DO UPDATE SET stamp = stamp + 1;
+    """
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_items_stamp_insert
+        AFTER INSERT ON items
+        BEGIN
+            {bump.format(ref="NEW")}
+        END;
+        """,
+        # pinned decides which item of an overlapping pair is reported first.
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_items_stamp_update
+        AFTER UPDATE OF day_id, start_min, end_min, start_utc, end_utc, pinned ON items
+        BEGIN
+            {bump.format(ref="OLD")}
+            {bump.format(ref="NEW")}
+        END;
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_items_stamp_delete
+        AFTER DELETE ON items
+        BEGIN
+            {bump.format(ref="OLD")}
+        END;
+        """,
+        # Recurring occurrences are part of a day's schedule too: a rule change
+        # touches every day of its trip, a skip or a re-dated day just one.
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_recurring_stamp_insert
+        AFTER INSERT ON recurring_items
+        BEGIN
+            {bump_trip.format(ref="NEW")}
+        END;
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_recurring_stamp_update
+        AFTER UPDATE ON recurring_items
+        BEGIN
+            {bump_trip.format(ref="OLD")}
+        END;
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_recurring_stamp_delete
+        AFTER DELETE ON recurring_items
+        BEGIN
+            {bump_trip.format(ref="OLD")}
+        END;
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_recurring_skips_stamp_insert
+        AFTER INSERT ON recurring_skips
+        BEGIN
+            {bump.format(ref="NEW")}
+        END;
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_recurring_skips_stamp_delete
+        AFTER DELETE ON recurring_skips
+        BEGIN
+            {bump.format(ref="OLD")}
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_days_stamp_redate
+        AFTER UPDATE OF date ON days
+        BEGIN
+            INSERT INTO day_stamps (day_id, stamp) VALUES (NEW.id, 1)
+            ON CONFLICT (day_id) DO UPDATE SET stamp = stamp + 1;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_days_stamp_cleanup
+        AFTER DELETE ON days
+        BEGIN
+            DELETE FROM day_stamps WHERE day_id = OLD.id;
+        END;
         """,
     ]
 
 
 def init_schema(conn: Connection) -> None:
-    for ddl in get_schema_ddl():
+    for ddl in get_table_ddl():
+        conn.execute(ddl)
+    conn.commit()
+    # Before indexes and triggers: they may refer to columns a migration adds.
+    migrate(conn)
+    for ddl in (*get_index_ddl(), *get_trigger_ddl()):
         conn.execute(ddl)
     conn.commit()
\ No newline at end of file
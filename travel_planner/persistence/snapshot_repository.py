@@ -0,0 +1,173 @@
+'''
+Purpose: Column-wise reads and bulk inserts of whole trips for binary snapshots.
+'''
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Sequence
+
+from travel_planner.persistence import item_repository
+
+# Copied by reference (day ordinal) or regenerated on restore.
+_ITEM_KEY_COLUMNS = ("id", "day_id")
+# Rules belong to the restored trip; skips refer to rules by ordinal.
+_RULE_KEY_COLUMNS = ("id", "trip_id")
+
+
+def _kind(declared_type: str) -> str:
+    declared = declared_type.upper()
+    if "INT" in declared:
+        return "i"
+    if "REAL" in declared or "FLOA" in declared or "DOUB" in declared:
+        return "f"
+    return "s"
+
+
+def _columns(conn, table: str, key_columns: Sequence[str]) -> list[tuple[str, str]]:
+    return [
+        (r[1], _kind(r[2]))
+        for r in conn.execute(f"PRAGMA table_info({table});")
+        if r[1] not in key_columns
+    ]
+
+
+def _kept_columns(conn, table: str, columns: Sequence[str], key_columns: Sequence[str]) -> list[int]:
+    # Indexes of the given columns the table has; a snapshot may carry others.
+    existing = {r[1] for r in conn.execute(f"PRAGMA table_info({table});")}
+    return [i for i, c in enumerate(columns) if c in existing and c not in key_columns]
+
+
+def get_item_columns(conn) -> list[tuple[str, str]]:
+    """
+    (name, kind) for every items column except id/day_id; kind is 'i', 'f' or 's'.
+    """
+    return _columns(conn, "items", _ITEM_KEY_COLUMNS)
+
+
+def get_rule_columns(conn) -> list[tuple[str, str]]:
+    """
+    (name, kind) for every recurring_items column except id/trip_id.
+    """
+    return _columns(conn, "recurring_items", _RULE_KEY_COLUMNS)
+
+
+def list_rule_rows(conn, trip_id: int, columns: Sequence[str]) -> list[tuple]:
+    """
+    (rule id, *columns) for the trip's recurring rules, in id order.
+    """
+    return conn.execute(
+        f"SELECT id, {', '.join(columns)} FROM recurring_items WHERE trip_id = ? ORDER BY id ASC;",
+        (trip_id,),
+    ).fetchall()
+
+
+def list_skip_rows(conn, trip_id: int) -> list[tuple[int, int]]:
+    """
+    (rule id, day id) for every skip of the trip's recurring rules.
+    """
+    return conn.execute(
+        """
+        SELECT s.rule_id, s.day_id
+        FROM recurring_items AS r
+        JOIN recurring_skips AS s ON s.rule_id = r.id
+        WHERE r.trip_id = ?;
+        """,
+        (trip_id,),
+    ).fetchall()
+
+
+def iter_item_rows_for_days(
+    conn,
+    day_ids: Sequence[int],
+    columns: Sequence[str],
+    *,
+    batch_rows: int = 1024,
+) -> Iterator[list[tuple]]:
+    """
+    Yield batches of (day ordinal, *columns) rows for the given days, in day order then position/id.
+    """
+    select = ", ".join(columns)
+    batch: list[tuple] = []
+    for ordinal, day_id in enumerate(day_ids):
+        cursor = conn.execute(
+            f"SELECT ?, {select} FROM items WHERE day_id = ? ORDER BY position ASC, id ASC;",
+            (ordinal, day_id),
+        )
+        while True:
+            rows = cursor.fetchmany(batch_rows - len(batch))
+            if not rows:
+                break
+            batch.extend(rows)
+            if len(batch) >= batch_rows:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def insert_trip_rows(
+    conn,
+    name: str,
+    dates: Sequence[str],
+    columns: Sequence[str],
+    item_batches: Iterable[Sequence[Sequence[Any]]],
+    *,
+    rule_columns: Sequence[str] = (),
+    rules: Sequence[Sequence[Any]] = (),
+    skips: Sequence[tuple[int, int]] = (),
+) -> dict[str, int]:
+    """
+    Insert a trip, its days, recurring rules and items in one transaction.
+
+    item_batches yields rows of (day ordinal, *values for columns); rules
+    are rows of values for rule_columns and skips (rule ordinal, day
+    ordinal) pairs. Columns the tables do not have are dropped. Returns the
+    new trip id and row counts.
+    """
+    keep = _kept_columns(conn, "items", columns, _ITEM_KEY_COLUMNS)
+    insert_cols = ", ".join(["day_id", *(columns[i] for i in keep)])
+    placeholders = ", ".join("?" * (len(keep) + 1))
+    keep_rule = _kept_columns(conn, "recurring_items", rule_columns, _RULE_KEY_COLUMNS)
+    rule_cols = ", ".join(["trip_id", *(rule_columns[i] for i in keep_rule)])
+    rule_placeholders = ", ".join("?" * (len(keep_rule) + 1))
+
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        trip_id = conn.execute("INSERT INTO trips (name) VALUES (?);", (name,)).lastrowid
+        conn.executemany(
+            "INSERT INTO days (trip_id, date) VALUES (?, ?);",
+            [(trip_id, d) for d in dates],
+        )
+        by_date = dict(
+            conn.execute("SELECT date, id FROM days WHERE trip_id = ?;", (trip_id,)).fetchall()
+        )
+        day_ids = [by_date[d] for d in dates]
+
+        # One at a time for the new ids; a trip has a handful of rules.
+        rule_ids = [
+            conn.execute(
+                f"INSERT INTO recurring_items ({rule_cols}) VALUES ({rule_placeholders});",
+                (trip_id, *(row[i] for i in keep_rule)),
+            ).lastrowid
+            for row in rules
+        ]
+        conn.executemany(
+            "INSERT INTO recurring_skips (rule_id, day_id) VALUES (?, ?);",
+            [(rule_ids[rule], day_ids[day]) for rule, day in skips],
+        )
+
+        items = 0
+        for batch in item_batches:
+            conn.executemany(
+                f"INSERT INTO items ({insert_cols}) VALUES ({placeholders});",
+                [(day_ids[row[0]], *(row[i + 1] for i in keep)) for row in batch],
+            )
+            items += len(batch)
+        # Snapshots taken before start_utc/end_utc existed have none to restore.
+        item_repository.refresh_utc_instants(conn, trip_id=trip_id)
+    except BaseException:
+        conn.rollback()
+        raise
+
+    conn.commit()
+    return {"trip_id": trip_id, "days": len(day_ids), "items": items}
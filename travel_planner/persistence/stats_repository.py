@@ -0,0 +1,132 @@
+'''
+Purpose: Grouped spend and schedule aggregates computed inside SQLite (no per-item Python).
+'''
+
+from __future__ import annotations
+
+from typing import Iterator
+
+# What an item costs for statistics: the actual cost once known, else the estimate.
+_COST = "COALESCE(i.actual_cost, i.estimated_cost)"
+
+
+def _scope(trip_id: int | None) -> tuple[str, tuple]:
+    if trip_id is None:
+        return "", ()
+    return "AND d.trip_id = ?", (trip_id,)
+
+
+def get_change_mark(conn) -> int:
+    """
+    Highest change_log seq ever issued; grows on every trip/day/item write and survives compaction.
+    """
+    cursor = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'change_log';")
+    return int(cursor.fetchone()[0])
+
+
+def iter_day_stats(conn, *, trip_id: int | None = None) -> Iterator[dict]:
+    """
+    Yield per-day item counts and schedule minutes, ordered by (trip_id, date).
+
+    busy_min is the union of scheduled intervals (overlaps counted once);
+    idle_min is the gap time between the first start and the last end.
+    A running MAX(end_min) window gives each interval the part not already
+    covered by earlier ones.
+    """
+    scope, params = _scope(trip_id)
+    cursor = conn.execute(
+        f"""
+        WITH sched AS (
+            SELECT
+                i.day_id, i.start_min, i.end_min,
+                MAX(i.end_min) OVER (
+                    PARTITION BY i.day_id
+                    ORDER BY i.start_min, i.end_min
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                ) AS covered_to
+            FROM days AS d
+            JOIN items AS i ON i.day_id = d.id
+            WHERE i.start_min IS NOT NULL {scope}
+        ),
+        sched_day AS (
+            SELECT
+                day_id,
+                COUNT(*) AS scheduled,
+                SUM(end_min - start_min) AS scheduled_min,
+                SUM(MAX(0, end_min - MAX(start_min, COALESCE(covered_to, start_min)))) AS busy_min,
+                MAX(end_min) - MIN(start_min) AS span_min
+            FROM sched
+            GROUP BY day_id
+        )
+        SELECT
+            d.id, d.trip_id, d.date,
+            (SELECT COUNT(*) FROM items WHERE day_id = d.id),
+            COALESCE(s.scheduled, 0),
+            COALESCE(s.scheduled_min, 0),
+            COALESCE(s.busy_min, 0),
+            COALESCE(s.span_min - s.busy_min, 0)
+        FROM days AS d
+        LEFT JOIN sched_day AS s ON s.day_id = d.id
+        WHERE 1 = 1 {scope}
+        ORDER BY d.trip_id ASC, d.date ASC;
+        """,
+        params + params,
+    )
+    for row in cursor:
+        yield {
+            "day_id": row[0],
+            "trip_id": row[1],
+            "date": row[2],
+            "items": row[3],
+            "scheduled": row[4],
+            "scheduled_min": row[5],
+            "busy_min": row[6],
+            "idle_min": row[7],
+        }
+
+
+def list_day_spend(conn, *, trip_id: int | None = None) -> list[dict]:
+    """
+    Spend per (day, currency), for days with at least one costed item.
+    """
+    scope, params = _scope(trip_id)
+    cursor = conn.execute(
+        f"""
+        SELECT i.day_id, i.currency, SUM({_COST})
+        FROM days AS d
+        JOIN items AS i ON i.day_id = d.id
+        WHERE {_COST} IS NOT NULL {scope}
+        GROUP BY i.day_id, i.currency;
+        """,
+        params,
+    )
+    return [{"day_id": r[0], "currency": r[1], "amount": r[2]} for r in cursor.fetchall()]
+
+
+def list_category_stats(conn, *, trip_id: int | None = None) -> list[dict]:
+    """
+    Item counts, scheduled minutes and spend per (category, currency), ordered by category.
+
+    currency is None for the group of items without one (including uncosted items).
+    """
+    scope, params = _scope(trip_id)
+    cursor = conn.execute(
+        f"""
+        SELECT
+            i.category,
+            i.currency,
+            COUNT(*),
+            COALESCE(SUM(i.end_min - i.start_min), 0),
+            SUM({_COST})
+        FROM days AS d
+        JOIN items AS i ON i.day_id = d.id
+        WHERE 1 = 1 {scope}
+        GROUP BY i.category, i.currency
+        ORDER BY i.category ASC;
+        """,
+        params,
+    )
+    return [
+        {"category": r[0], "currency": r[1], "items": r[2], "scheduled_min": r[3], "amount": r[4]}
+        for r in cursor.fetchall()
+    ]
@@ -0,0 +1,189 @@
+'''
+Purpose: Route each tenant (account) to its own SQLite file.
+
+Every tenant lives in <directory>/<tenant_id>.db, so writers for different
+tenants take different file locks and never wait on each other. The router
+keeps a ConnectionPool per recently used tenant in an LRU bounded by
+max_open; the least recently used pool is closed when the bound is exceeded,
+and pools idle for longer than idle_timeout are closed on the next access.
+Connections checked out of an evicted pool stay usable and are closed when
+released.
+'''
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from travel_planner.persistence.db import ConnectionPool, connect
+from travel_planner.persistence.schema import init_schema
+
+TENANT_DB_SUFFIX = ".db"
+
+_TENANT_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def is_valid_tenant_id(tenant_id: object) -> bool:
+    # Tenant ids become file names; keep them to a safe, path-free alphabet.
+    return isinstance(tenant_id, str) and _TENANT_ID_RE.match(tenant_id) is not None
+
+
+class _Entry:
+    __slots__ = ("pool", "last_used")
+
+    def __init__(self, pool: ConnectionPool, last_used: float) -> None:
+        self.pool = pool
+        self.last_used = last_used
+
+
+class TenantRouter:
+    """
+    Map tenant ids to per-tenant database files and pooled connections.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_open: int = 32,
+        idle_timeout: float = 300.0,
+        pool_size: int = 1,
+        create_missing: bool = True,
+        on_connect: Callable[[sqlite3.Connection], None] | None = None,
+    ) -> None:
+        if max_open <= 0:
+            raise ValueError("max_open must be positive.")
+
+        self.directory = directory
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self.pool_size = pool_size
+        self.create_missing = create_missing
+        self.on_connect = on_connect
+
+        self._pools: OrderedDict[str, _Entry] = OrderedDict()
+        self._initialized: set[str] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def db_path(self, tenant_id: str) -> str:
+        if not is_valid_tenant_id(tenant_id):
+            raise ValueError(f"invalid tenant id: {tenant_id!r}")
+        return os.path.join(self.directory, tenant_id + TENANT_DB_SUFFIX)
+
+    def exists(self, tenant_id: str) -> bool:
+        return os.path.exists(self.db_path(tenant_id))
+
+    def list_tenants(self) -> list[str]:
+        """
+        Tenant ids with a database file in the directory, sorted.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        tenants = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(TENANT_DB_SUFFIX):
+                continue
+            tenant_id = name[: -len(TENANT_DB_SUFFIX)]
+            # Skips archive files (<tenant>.archive.db) along with anything else not named like a tenant.
+            if is_valid_tenant_id(tenant_id):
+                tenants.append(tenant_id)
+        return sorted(tenants)
+
+    def open_tenants(self) -> list[str]:
+        """
+        Tenants with an open pool, least recently used first.
+        """
+        with self._lock:
+            return list(self._pools)
+
+    def pool(self, tenant_id: str) -> ConnectionPool:
+        if self._closed:
+            raise RuntimeError("tenant router is closed.")
+        path = self.db_path(tenant_id)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._pools.get(tenant_id)
+            if entry is not None:
+                entry.last_used = now
+                self._pools.move_to_end(tenant_id)
+                evicted = self._evict_locked(now)
+        if entry is not None:
+            self._close_pools(evicted)
+            return entry.pool
+
+        # Opening a new tenant (and creating its schema) happens outside the
+        # lock, so it never holds up requests for tenants that are already open.
+        if tenant_id not in self._initialized:
+            if not self.create_missing and not os.path.exists(path):
+                raise LookupError(f"tenant {tenant_id!r} does not exist.")
+            self._init_tenant(path)
+            self._initialized.add(tenant_id)
+
+        pool = ConnectionPool(path, max_size=self.pool_size, on_connect=self.on_connect)
+        with self._lock:
+            entry = self._pools.get(tenant_id)
+            if entry is None:
+                entry = self._pools[tenant_id] = _Entry(pool, now)
+            else:
+                # Another thread opened the same tenant first; use its pool.
+                # (Ours is discarded unused: pools open connections lazily.)
+                entry.last_used = now
+                self._pools.move_to_end(tenant_id)
+            evicted = self._evict_locked(now)
+        self._close_pools(evicted)
+        return entry.pool
+
+    @contextmanager
+    def connection(self, tenant_id: str) -> Iterator[sqlite3.Connection]:
+        with self.pool(tenant_id).connection() as conn:
+            yield conn
+
+    def evict_idle(self) -> int:
+        """
+        Close pools idle for longer than idle_timeout; returns how many were closed.
+        """
+        with self._lock:
+            evicted = self._evict_locked(time.monotonic())
+        self._close_pools(evicted)
+        return len(evicted)
+
+    def close(self) -> None:
+        self._closed = True
+        with self._lock:
+            pools = [entry.pool for entry in self._pools.values()]
+            self._pools.clear()
+        self._close_pools(pools)
+
+    def _evict_locked(self, now: float) -> list[ConnectionPool]:
+        # The OrderedDict is kept in last-use order, so both the over-capacity
+        # and the idle entries are at the front.
+        evicted = []
+        while self._pools:
+            tenant_id, entry = next(iter(self._pools.items()))
+            if len(self._pools) <= self.max_open and now - entry.last_used <= self.idle_timeout:
+                break
+            del self._pools[tenant_id]
+            evicted.append(entry.pool)
+        return evicted
+
+    @staticmethod
+    def _close_pools(pools: list[ConnectionPool]) -> None:
+        for pool in pools:
+            pool.close()
+
+    @staticmethod
+    def _init_tenant(path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = connect(path)
+        try:
+            init_schema(conn)
+        finally:
+            conn.close()
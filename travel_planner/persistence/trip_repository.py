@@ -1,3 +1,8 @@
+from datetime import datetime, timezone
+
+from travel_planner.persistence import item_repository, row_cache
+
+
 def create_trip(conn, name: str) -> int:
     cursor = conn.execute(
         "INSERT INTO trips (name) VALUES (?);",
@@ -7,6 +12,12 @@ def create_trip(conn, name: str) -> int:
     return cursor.lastrowid
 
 def get_trip(conn, trip_id: int) -> dict | None:
+    cache = row_cache.get_cache(conn)
+    if cache is not None:
+        cached = cache.get(("trip", trip_id))
+        if cached is not None:
+            return cached
+
     cursor = conn.execute(
         "SELECT id, name FROM trips WHERE id = ?;",
         (trip_id,),
@@ -16,10 +27,13 @@ def get_trip(conn, trip_id: int) -> dict | None:
     if row is None:
         return None
 
-    return {
+    trip = {
         "id": row[0],
         "name": row[1],
     }
+    if cache is not None:
+        cache.put(("trip", trip_id), trip)
+    return trip
 
 
 def list_trips(conn) -> list[dict]:
@@ -35,6 +49,8 @@ def list_trips(conn) -> list[dict]:
 
 
 def delete_trip(conn, trip_id: int) -> None:
+    # Must run before the DELETE: it looks up the trip's days to drop cascaded items.
+    row_cache.invalidate_trip(conn, trip_id, cascade=True)
     conn.execute(
         "DELETE FROM trips WHERE id = ?;",
         (trip_id,),
@@ -47,4 +63,86 @@ def rename_trip(conn, trip_id: int, name: str) -> None:
         "UPDATE trips SET name = ? WHERE id = ?;",
         (name, trip_id),
     )
-    conn.commit()
\ No newline at end of file
+    row_cache.invalidate_trip(conn, trip_id)
+    conn.commit()
+
+
+# Columns a clone gets fresh values for instead of copying.
+_CLONE_ITEM_SKIP = ("id", "day_id", "created_at", "updated_at")
+# UTC instants (minutes), moved by the clone's date shift.
+_SHIFTED_ITEM_COLUMNS = ("start_utc", "end_utc")
+
+
+def clone_trip(conn, trip_id: int, name: str, shift_days: int) -> dict[str, int]:
+    """
+    Copy a trip with all its days and items in one transaction, moving every date by shift_days.
+
+    Rows are copied with INSERT ... SELECT; new items find their new day by
+    (new trip, shifted date), which days' UNIQUE (trip_id, date) makes exact.
+    Recurring rules and their skips are copied the same way.
+    Returns the new trip id and row counts.
+    """
+    item_cols = [r[1] for r in conn.execute("PRAGMA table_info(items);") if r[1] not in _CLONE_ITEM_SKIP]
+    shift = f"{int(shift_days):+d} days"
+    # Instants move with the dates; only zoned items whose UTC offset differs
+    # on the new dates (DST) are left for refresh_utc_instants to correct.
+    item_exprs = [
+        f"i.{c} + {int(shift_days) * 1440}" if c in _SHIFTED_ITEM_COLUMNS else f"i.{c}" for c in item_cols
+    ]
+    now = datetime.now(timezone.utc).isoformat()
+
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        new_trip_id = conn.execute("INSERT INTO trips (name) VALUES (?);", (name,)).lastrowid
+        days = conn.execute(
+            """
+            INSERT INTO days (trip_id, date)
+            SELECT ?, date(date, ?) FROM days WHERE trip_id = ?;
+            """,
+            (new_trip_id, shift, trip_id),
+        ).rowcount
+        items = conn.execute(
+            f"""
+            INSERT INTO items (day_id, {", ".join(item_cols)}, created_at, updated_at)
+            SELECT nd.id, {", ".join(item_exprs)}, ?, ?
+            FROM days AS od
+            JOIN items AS i ON i.day_id = od.id
+            JOIN days AS nd ON nd.trip_id = ? AND nd.date = date(od.date, ?)
+            WHERE od.trip_id = ?;
+            """,
+            (now, now, new_trip_id, shift, trip_id),
+        ).rowcount
+        # Rules are few per trip; copy them one at a time to map each skip to its new rule.
+        rule_ids = [r[0] for r in conn.execute("SELECT id FROM recurring_items WHERE trip_id = ?;", (trip_id,))]
+        for rule_id in rule_ids:
+            new_rule_id = conn.execute(
+                """
+                INSERT INTO recurring_items (
+                    trip_id, title, category, start_min, end_min, pinned,
+                    interval_days, from_date, until_date, created_at, updated_at
+                )
+                SELECT ?, title, category, start_min, end_min, pinned,
+                    interval_days, date(from_date, ?), date(until_date, ?), ?, ?
+                FROM recurring_items
+                WHERE id = ?;
+                """,
+                (new_trip_id, shift, shift, now, now, rule_id),
+            ).lastrowid
+            conn.execute(
+                """
+                INSERT INTO recurring_skips (rule_id, day_id)
+                SELECT ?, nd.id
+                FROM recurring_skips AS s
+                JOIN days AS od ON od.id = s.day_id
+                JOIN days AS nd ON nd.trip_id = ? AND nd.date = date(od.date, ?)
+                WHERE s.rule_id = ?;
+                """,
+                (new_rule_id, new_trip_id, shift, rule_id),
+            )
+        item_repository.refresh_utc_instants(conn, trip_id=new_trip_id)
+    except BaseException:
+        conn.rollback()
+        raise
+
+    conn.commit()
+    return {"trip_id": new_trip_id, "days": days, "items": items}
@@ -0,0 +1,189 @@
+'''
+Purpose: Single-writer group commit for many concurrent writing threads.
+
+Threads that each write through their own connection take turns on SQLite's
+write lock and pay one journal sync per commit. A WriteQueue funnels their
+repository writes through one writer thread instead, which runs whatever has
+queued up as a single transaction: one lock acquisition and one sync for the
+whole batch.
+'''
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, TypeVar
+
+from travel_planner.observability import metrics
+from travel_planner.persistence import row_cache
+from travel_planner.persistence.db import MeteredConnection, connect
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class GroupCommitConnection(MeteredConnection):
+    """
+    The writer's connection. While an operation runs inside a batch, its own
+    BEGIN / commit() / rollback() act on that operation's savepoint rather
+    than on the batch transaction.
+    """
+
+    in_operation = False
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        if self.in_operation and sql.lstrip()[:5].upper() == "BEGIN":
+            # The batch already holds the write lock (BEGIN IMMEDIATE).
+            return self.cursor()
+        return super().execute(sql, parameters)
+
+    def commit(self) -> None:
+        if not self.in_operation:
+            super().commit()
+
+    def rollback(self) -> None:
+        if self.in_operation:
+            super().execute("ROLLBACK TO write_op;")
+            return
+        super().rollback()
+
+
+class WriteQueue:
+    """
+    Run repository writes submitted from any thread on one writer connection, committed in batches.
+
+    submit(fn, *args, **kwargs) queues fn(conn, *args, **kwargs) and returns a
+    Future. The writer takes the first queued operation, then keeps collecting
+    until it has max_batch of them or max_delay seconds have passed, and runs
+    the batch in one transaction. Each operation runs in its own savepoint: one
+    that raises is rolled back alone and its exception is set on its own
+    Future, while the rest of the batch still commits. Futures resolve only
+    once the batch is committed; if the commit itself fails, every operation
+    in the batch gets that error.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        max_batch: int = 64,
+        max_delay: float = 0.002,
+        on_connect: Callable[[sqlite3.Connection], None] | None = None,
+    ) -> None:
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive.")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative.")
+
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        # Opened here so connection errors reach the caller; used only by the writer thread.
+        self._conn = connect(db_path, check_same_thread=False, factory=GroupCommitConnection)
+        if on_connect is not None:
+            on_connect(self._conn)
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._writer.start()
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        future: Future[T] = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("write queue is closed.")
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def close(self) -> None:
+        """
+        Stop accepting writes, let the writer finish everything already queued, and close its connection.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+        row_cache.disable_cache(self._conn)
+        self._conn.close()
+
+    def __enter__(self) -> "WriteQueue":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            op = self._queue.get()
+            if op is _STOP:
+                return
+            batch = [op]
+            stopping = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    op = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if op is _STOP:
+                    stopping = True
+                    break
+                batch.append(op)
+
+            self._run_batch(batch)
+            if stopping:
+                return
+
+    def _run_batch(self, batch: list[tuple]) -> None:
+        conn = self._conn
+        batch = [op for op in batch if op[0].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            for future, fn, args, kwargs in batch:
+                conn.execute("SAVEPOINT write_op;")
+                conn.in_operation = True
+                try:
+                    value = fn(conn, *args, **kwargs)
+                except BaseException as e:
+                    conn.in_operation = False
+                    conn.execute("ROLLBACK TO write_op;")
+                    conn.execute("RELEASE write_op;")
+                    # The operation may have cached rows it wrote before failing.
+                    row_cache.invalidate_all(conn)
+                    outcomes.append((future, None, e))
+                else:
+                    conn.in_operation = False
+                    conn.execute("RELEASE write_op;")
+                    outcomes.append((future, value, None))
+            conn.commit()
+        except BaseException as e:
+            conn.in_operation = False
+            if conn.in_transaction:
+                conn.rollback()
+            row_cache.invalidate_all(conn)
+            metrics.inc(metrics.WRITE_QUEUE_OPS, len(batch), outcome="batch_error")
+            for future, _fn, _args, _kwargs in batch:
+                future.set_exception(e)
+            return
+
+        metrics.inc(metrics.WRITE_QUEUE_BATCHES)
+        for future, value, error in outcomes:
+            if error is None:
+                metrics.inc(metrics.WRITE_QUEUE_OPS, outcome="ok")
+                future.set_result(value)
+            else:
+                metrics.inc(metrics.WRITE_QUEUE_OPS, outcome="error")
+                future.set_exception(error)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from sqlite3 import Connection
+from typing import Iterator
+
+from travel_planner.domain.validators import ValidationError, validate_date_string
+from travel_planner.observability.profiler import profiled
+from travel_planner.persistence import agenda_repository
+from travel_planner.persistence.agenda_repository import AgendaKey
+
+MAX_PAGE_SIZE = 1000
+
+
+def _validate_range(from_date: str, to_date: str) -> None:
+    validate_date_string(from_date)
+    validate_date_string(to_date)
+    if from_date > to_date:
+        raise ValidationError("from date must not be after to date.")
+
+
+def encode_cursor(key: AgendaKey) -> str:
+    return ":".join(str(part) for part in key)
+
+
+def decode_cursor(token: str) -> AgendaKey:
+    parts = token.split(":")
+    try:
+        day_num, unscheduled, start, item_id = (int(p) for p in parts)
+    except ValueError:
+        raise ValidationError("invalid agenda cursor.") from None
+    if unscheduled not in (0, 1):
+        raise ValidationError("invalid agenda cursor.")
+    return (day_num, unscheduled, start, item_id)
+
+
+def iter_agenda(conn: Connection, from_date: str, to_date: str) -> Iterator[dict]:
+    """
+    Stream every item dated from_date..to_date across all trips, ordered by (date, UTC start).
+
+    Validation happens on the call, before the first row is read.
+    """
+    _validate_range(from_date, to_date)
+    return agenda_repository.iter_agenda(conn, from_date, to_date)
+
+
+@profiled
+def page_agenda(
+    conn: Connection,
+    from_date: str,
+    to_date: str,
+    *,
+    after: str | None = None,
+    limit: int = 100,
+) -> tuple[list[dict], str | None]:
+    """
+    One page of the agenda after the cursor token `after`.
+
+    Returns (rows, next_cursor); next_cursor is None once the range is exhausted.
+    """
+    _validate_range(from_date, to_date)
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValidationError(f"limit must be between 1 and {MAX_PAGE_SIZE}.")
+    key = decode_cursor(after) if after is not None else None
+
+    # Fetch one extra row to learn whether another page exists.
+    rows = list(agenda_repository.iter_agenda(conn, from_date, to_date, after=key, limit=limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(agenda_repository.agenda_key(rows[-1]))
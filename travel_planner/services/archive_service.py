@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+from sqlite3 import Connection
+
+from travel_planner.domain.validators import ValidationError, validate_date_string
+from travel_planner.persistence import archive_repository
+from travel_planner.observability.profiler import profiled
+from travel_planner.services import export_service
+
+
+def default_archive_path(db_path: str) -> str:
+    """
+    trips.db -> trips.archive.db, next to the hot database.
+    """
+    root, _ = os.path.splitext(db_path)
+    return f"{root}.archive.db"
+
+
+@profiled
+def archive_trips(conn: Connection, archive_path: str, *, before: str) -> dict[str, int]:
+    """
+    Move trips whose last day falls before `before` into the archive database.
+
+    Returns moved row counts per table.
+    """
+    validate_date_string(before)
+    archive_repository.attach_archive(conn, archive_path)
+    return archive_repository.archive_trips_before(conn, before)
+
+
+@profiled
+def unarchive_trip(conn: Connection, archive_path: str, trip_id: int) -> dict[str, int]:
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+
+    archive_repository.attach_archive(conn, archive_path)
+    counts = archive_repository.unarchive_trip(conn, trip_id)
+    if counts["trips"] == 0:
+        raise ValidationError("trip not found in the archive.")
+    return counts
+
+
+@profiled
+def list_archived_trips(conn: Connection, archive_path: str) -> list[dict]:
+    archive_repository.attach_archive(conn, archive_path)
+    return archive_repository.list_archived_trips(conn)
+
+
+@profiled
+def list_archived_days(conn: Connection, archive_path: str, trip_id: int) -> list[dict]:
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+
+    archive_repository.attach_archive(conn, archive_path)
+    return export_service.list_days_for_trip(conn, trip_id, schema=archive_repository.ARCHIVE_SCHEMA)
+
+
+@profiled
+def list_archived_items(conn: Connection, archive_path: str, day_id: int) -> list[dict]:
+    """
+    An archived day's items (recurring occurrences merged in), in export order.
+    """
+    if not isinstance(day_id, int) or day_id <= 0:
+        raise ValidationError("day_id must be a positive integer.")
+
+    archive_repository.attach_archive(conn, archive_path)
+    return export_service.list_items_for_day(conn, day_id, schema=archive_repository.ARCHIVE_SCHEMA)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from sqlite3 import Connection
+from typing import Callable
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.observability.profiler import profiled
+
+DEFAULT_PAGES_PER_STEP = 256
+DEFAULT_STEP_SLEEP = 0.01
+
+# (remaining pages, total pages)
+ProgressFn = Callable[[int, int], None]
+
+_COPY_CHUNK = 1 << 20
+
+
+def _main_db_path(conn: Connection) -> str:
+    for row in conn.execute("PRAGMA database_list;"):
+        if row[1] == "main":
+            return row[2] or ""
+    return ""
+
+
+def _required_bytes(conn: Connection, *, compress: bool) -> int:
+    page_count = conn.execute("PRAGMA page_count;").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size;").fetchone()[0]
+    size = page_count * page_size
+    # The gzip file is written while the uncompressed copy still exists, and
+    # can be (slightly) larger than it for incompressible pages.
+    return size * 2 if compress else size
+
+
+@profiled
+def backup_database(
+    conn: Connection,
+    out_path: str,
+    *,
+    pages: int = DEFAULT_PAGES_PER_STEP,
+    sleep: float = DEFAULT_STEP_SLEEP,
+    compress: bool = False,
+    verify: bool = True,
+    progress: ProgressFn | None = None,
+) -> dict:
+    """
+    Copy the live database to out_path with the SQLite online backup API.
+
+    The copy runs `pages` pages at a time and sleeps `sleep` seconds between
+    steps, releasing the source lock so other writers can commit in between
+    (SQLite restarts the copy if another connection changed pages already
+    copied). The copy is made into a temporary file next to out_path, checked
+    with PRAGMA integrity_check, optionally gzip-compressed as a stream, and
+    only then renamed into place, so out_path never holds a partial backup.
+
+    The backup API writes to a database file, not a stream, so compress=True
+    still needs the full uncompressed copy on disk while the gzip file is
+    written. Free space next to out_path is checked against that before the
+    copy starts.
+
+    Returns {"pages", "bytes", "integrity", "seconds", "written"}; written is
+    False (and out_path untouched) when the integrity check fails.
+    """
+    if not isinstance(pages, int) or pages <= 0:
+        raise ValidationError("pages must be a positive integer.")
+    if not isinstance(sleep, (int, float)) or sleep < 0:
+        raise ValidationError("sleep must be a number >= 0.")
+    if not out_path:
+        raise ValidationError("out path is required.")
+    source = _main_db_path(conn)
+    if source and os.path.abspath(out_path) == os.path.abspath(source):
+        raise ValidationError("out path must differ from the database being backed up.")
+
+    t0 = time.perf_counter()
+    directory = os.path.dirname(os.path.abspath(out_path))
+    required = _required_bytes(conn, compress=compress)
+    free = shutil.disk_usage(directory).free
+    if free < required:
+        raise ValidationError(
+            f"not enough free space in {directory} for the backup: "
+            f"needs about {required >> 20} MiB, {free >> 20} MiB free."
+        )
+    fd, copy_path = tempfile.mkstemp(dir=directory, prefix=".backup-", suffix=".db")
+    os.close(fd)
+    packed_path: str | None = None
+    total_pages = 0
+
+    def on_step(status: int, remaining: int, total: int) -> None:
+        nonlocal total_pages
+        total_pages = total
+        if progress is not None:
+            progress(remaining, total)
+
+    try:
+        target = sqlite3.connect(copy_path)
+        try:
+            conn.backup(target, pages=pages, progress=on_step, sleep=sleep)
+            integrity = "ok"
+            if verify:
+                problems = [r[0] for r in target.execute("PRAGMA integrity_check;").fetchall()]
+                integrity = "ok" if problems == ["ok"] else "; ".join(problems)
+        finally:
+            target.close()
+
+        result = {"pages": total_pages, "integrity": integrity, "written": False}
+        if integrity == "ok":
+            final_path = copy_path
+            if compress:
+                fd, packed_path = tempfile.mkstemp(dir=directory, prefix=".backup-", suffix=".gz")
+                with open(copy_path, "rb") as src, os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                    filename=os.path.basename(out_path).removesuffix(".gz"), mode="wb", fileobj=raw
+                ) as dst:
+                    shutil.copyfileobj(src, dst, _COPY_CHUNK)
+                final_path = packed_path
+            if source:
+                # mkstemp files are owner-only; give the backup the live database's mode.
+                os.chmod(final_path, os.stat(source).st_mode & 0o777)
+            os.replace(final_path, out_path)
+            result["written"] = True
+            result["bytes"] = os.path.getsize(out_path)
+    finally:
+        # Whatever was renamed into place no longer exists under its temp name.
+        for leftover in (copy_path, packed_path):
+            if leftover is not None and os.path.exists(leftover):
+                os.unlink(leftover)
+
+    result.setdefault("bytes", 0)
+    result["seconds"] = time.perf_counter() - t0
+    return result
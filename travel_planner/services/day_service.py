@@ -4,9 +4,13 @@ import sqlite3
 from sqlite3 import Connection
 
 from travel_planner.domain.validators import ValidationError, validate_date_string
-from travel_planner.persistence import day_repository
+from travel_planner.persistence import day_repository, trip_repository
+from travel_planner.observability.profiler import profiled
+from travel_planner.persistence.db import retry_on_busy
 
 
+@profiled
+@retry_on_busy
 def create_day(conn: Connection, trip_id: int, date_str: str) -> int:
     if not isinstance(trip_id, int) or trip_id <= 0:
         raise ValidationError("trip_id must be a positive integer.")
@@ -20,6 +24,8 @@ def create_day(conn: Connection, trip_id: int, date_str: str) -> int:
         raise ValidationError("could not create day (possible duplicate date for this trip).") from e
     
 
+@profiled
+@retry_on_busy
 def set_day_date(conn, day_id: int, date_str: str) -> None:
     if day_id <= 0:
         raise ValidationError("day_id must be positive.")
@@ -33,4 +39,57 @@ def set_day_date(conn, day_id: int, date_str: str) -> None:
     try:
         day_repository.update_day_date(conn, day_id, date_str)
     except sqlite3.IntegrityError:
-        raise ValidationError("duplicate date for this trip.")
\ No newline at end of file
+        raise ValidationError("duplicate date for this trip.")
+
+@profiled
+@retry_on_busy
+def delete_day(conn: Connection, day_id: int) -> None:
+    """
+    Delete a day with its items.
+    """
+    if not isinstance(day_id, int) or day_id <= 0:
+        raise ValidationError("day_id must be a positive integer.")
+
+    day_repository.delete_day(conn, day_id)
+
+@profiled
+@retry_on_busy
+def shift_trip_days(conn: Connection, trip_id: int, shift_days: int) -> int:
+    """
+    Re-date every day of a trip by shift_days atomically; returns the number of days moved.
+    """
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+    if isinstance(shift_days, bool) or not isinstance(shift_days, int):
+        raise ValidationError("days must be an integer.")
+    if trip_repository.get_trip(conn, trip_id) is None:
+        raise ValidationError("trip not found.")
+    if shift_days == 0:
+        return 0
+
+    try:
+        return day_repository.shift_trip_days(conn, trip_id, shift_days)
+    except sqlite3.IntegrityError as e:
+        # date() yields NULL past year 9999 / before year 0.
+        raise ValidationError("shift moves a day outside the supported date range.") from e
+
+
+@profiled
+def list_days_in_range(
+    conn: Connection,
+    from_date: str,
+    to_date: str,
+    *,
+    trip_id: int | None = None,
+) -> list[dict]:
+    """
+    Days dated from_date..to_date inclusive (YYYY-MM-DD), across every trip or within one.
+    """
+    validate_date_string(from_date)
+    validate_date_string(to_date)
+    if from_date > to_date:
+        raise ValidationError("from date must not be after to date.")
+    if trip_id is not None and (not isinstance(trip_id, int) or trip_id <= 0):
+        raise ValidationError("trip_id must be a positive integer.")
+
+    return day_repository.list_days_in_range(conn, from_date, to_date, trip_id=trip_id)
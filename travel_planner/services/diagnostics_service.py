@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+from sqlite3 import Connection
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.persistence import diagnostics_repository
+from travel_planner.observability.profiler import profiled
+from travel_planner.services.item_service import (
+    check_overlaps_for_day,
+    check_tight_connections_for_day,
+)
+
+
+@profiled
+def check_days(
+    conn: Connection,
+    *,
+    trip_id: int | None = None,
+    buffer_min: int = 15,
+) -> tuple[list[dict], dict]:
+    """
+    Run overlap and tight-connection checks for every day of a trip (or every day in the database).
+
+    Results are persisted per (day, buffer_min) together with the day's change
+    stamp, so only days whose items changed since the last run are recomputed.
+
+    Returns (per-day results, cache stats).
+    """
+    if trip_id is not None and (not isinstance(trip_id, int) or trip_id <= 0):
+        raise ValidationError("trip_id must be a positive integer.")
+    if not isinstance(buffer_min, int) or buffer_min < 0:
+        raise ValidationError("buffer_min must be an integer >= 0.")
+
+    # Stamps are read before the items: if a writer slips in between, the saved
+    # stamp is older than the results and the day is simply recomputed next time.
+    days = diagnostics_repository.list_day_stamps(conn, buffer_min, trip_id=trip_id)
+
+    results: list[dict] = []
+    fresh: list[tuple[int, int, str, str]] = []
+    hits = 0
+
+    for d in days:
+        if d["cached_stamp"] is not None and d["cached_stamp"] == d["stamp"]:
+            hits += 1
+            overlaps = json.loads(d["overlaps_json"])
+            tight = json.loads(d["tight_json"])
+        else:
+            overlaps = check_overlaps_for_day(conn, d["day_id"])
+            tight = check_tight_connections_for_day(conn, d["day_id"], buffer_min=buffer_min)
+            fresh.append((d["day_id"], d["stamp"], json.dumps(overlaps), json.dumps(tight)))
+
+        results.append(
+            {
+                "day_id": d["day_id"],
+                "trip_id": d["trip_id"],
+                "date": d["date"],
+                "overlaps": overlaps,
+                "tight_connections": tight,
+            }
+        )
+
+    diagnostics_repository.save_day_diagnostics(conn, buffer_min, fresh)
+
+    total = len(days)
+    stats = {
+        "days": total,
+        "hits": hits,
+        "misses": total - hits,
+        "hit_rate": (hits / total) if total else 0.0,
+    }
+    return results, stats
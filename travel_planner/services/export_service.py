@@ -1,6 +1,20 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import heapq
+import json
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from travel_planner.domain.validators import ValidationError, validate_date_string
+from travel_planner.persistence import archive_repository, change_log_repository, recurring_repository
+from travel_planner.observability.profiler import profiled
+
+
+_SCHEMAS = ("main", archive_repository.ARCHIVE_SCHEMA)
+
+
+def _check_schema(schema: str) -> None:
+    if schema not in _SCHEMAS:
+        raise ValidationError(f"unknown schema: {schema!r}.")
 
 
 def _row_to_dict(cursor, row) -> Dict[str, Any]:
@@ -12,11 +26,13 @@ def _row_to_dict(cursor, row) -> Dict[str, Any]:
     return dict(zip(cols, row))
 
 
-def get_trip(conn, trip_id: int) -> Dict[str, Any]:
+@profiled
+def get_trip(conn, trip_id: int, *, schema: str = "main") -> Dict[str, Any]:
+    _check_schema(schema)
     cur = conn.execute(
-        """
-        SELECT id, name, created_at, updated_at
-        FROM trips
+        f"""
+        SELECT id, name
+        FROM {schema}.trips
         WHERE id = ?
         """,
         (trip_id,),
@@ -27,11 +43,13 @@ def get_trip(conn, trip_id: int) -> Dict[str, Any]:
     return _row_to_dict(cur, row)
 
 
-def list_days_for_trip(conn, trip_id: int) -> List[Dict[str, Any]]:
+@profiled
+def list_days_for_trip(conn, trip_id: int, *, schema: str = "main") -> List[Dict[str, Any]]:
+    _check_schema(schema)
     cur = conn.execute(
-        """
-        SELECT id, trip_id, date, notes
-        FROM days
+        f"""
+        SELECT id, trip_id, date
+        FROM {schema}.days
         WHERE trip_id = ?
         ORDER BY date ASC, id ASC
         """,
@@ -40,12 +58,15 @@ def list_days_for_trip(conn, trip_id: int) -> List[Dict[str, Any]]:
     return [_row_to_dict(cur, r) for r in cur.fetchall()]
 
 
-def list_items_for_day(conn, day_id: int) -> List[Dict[str, Any]]:
+@profiled
+def list_items_for_day(conn, day_id: int, *, schema: str = "main") -> List[Dict[str, Any]]:
     # Deterministic ordering:
     # 1) scheduled items (start_min not null) by time, then id
-    # 2) unscheduled items (start_min null) by pinned desc, title asc, id asc
+    # 2) unscheduled items (start_min null) by manual position, then id
+    # Recurring occurrences of the day are merged in by time.
+    _check_schema(schema)
     cur = conn.execute(
-        """
+        f"""
         SELECT
             id,
             day_id,
@@ -53,21 +74,114 @@ def list_items_for_day(conn, day_id: int) -> List[Dict[str, Any]]:
             category,
             start_min,
             end_min,
+            span_end_min,
+            timezone,
+            start_utc,
+            end_utc,
             estimated_cost,
-            location,
+            actual_cost,
+            currency,
+            location_name,
+            location_address,
             tags,
             notes,
             pinned
-        FROM items
+        FROM {schema}.items
         WHERE day_id = ?
         ORDER BY
             CASE WHEN start_min IS NULL THEN 1 ELSE 0 END ASC,
             start_min ASC,
             end_min ASC,
+            position ASC,
             id ASC,
             pinned DESC,
             title ASC
         """,
         (day_id,),
     )
-    return [_row_to_dict(cur, r) for r in cur.fetchall()]
\ No newline at end of file
+    fields = [d[0] for d in cur.description]
+    rows = (_row_to_dict(cur, r) for r in cur.fetchall())
+    occurrences = recurring_repository.list_occurrences_for_day(conn, day_id, schema=schema)
+    return list(recurring_repository.merge_occurrences(rows, occurrences, key=_export_order_key, fields=fields))
+
+
+def _export_order_key(it: Dict[str, Any]) -> tuple:
+    # The ORDER BY above down to end_min; recurring occurrences (marked by
+    # recurring_id) follow the items they tie with.
+    start = it["start_min"]
+    return (start is None, start or 0, it["end_min"] or 0, it.get("recurring_id") or 0)
+
+
+@profiled
+def export_trip(conn, trip_id: int, *, schema: str = "main") -> Dict[str, Any]:
+    """
+    Build a nested trip -> days -> items document for a full trip export.
+
+    schema="archive" reads a trip from the attached archive database.
+    """
+    trip = get_trip(conn, trip_id, schema=schema)
+    days = list_days_for_trip(conn, trip_id, schema=schema)
+    for day in days:
+        day["items"] = list_items_for_day(conn, day["id"], schema=schema)
+    trip["days"] = days
+    return trip
+
+
+def iter_changes_since(conn, since_seq: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yield changed trips, days and items after since_seq in seq order.
+
+    Runs inside one read transaction so the three entity streams see the same
+    snapshot; cost is proportional to the number of changes, not the database size.
+    """
+    if not isinstance(since_seq, int) or since_seq < 0:
+        raise ValidationError("since must be an integer >= 0.")
+
+    own_txn = not conn.in_transaction
+    if own_txn:
+        conn.execute("BEGIN;")
+    try:
+        through_seq = change_log_repository.get_max_seq(conn)
+        streams = [
+            change_log_repository.iter_changed_rows(conn, entity, since_seq, through_seq)
+            for entity in ("trip", "day", "item")
+        ]
+        yield from heapq.merge(*streams, key=lambda rec: rec["seq"])
+    finally:
+        if own_txn:
+            conn.rollback()
+
+
+@profiled
+def write_changes_ndjson(conn, since_seq: int, out: TextIO) -> tuple[int, int]:
+    """
+    Write changes after since_seq to out as NDJSON. Returns (records written, last seq written).
+    """
+    count = 0
+    last_seq = since_seq
+    for rec in iter_changes_since(conn, since_seq):
+        out.write(json.dumps(rec, separators=(",", ":")))
+        out.write("\n")
+        count += 1
+        last_seq = rec["seq"]
+    return count, last_seq
+
+
+@profiled
+def compact_change_log(
+    conn,
+    *,
+    through_seq: int | None = None,
+    before: str | None = None,
+) -> int:
+    """
+    Drop change log entries the downstream feed has already consumed.
+    """
+    if through_seq is None and before is None:
+        raise ValidationError("compaction needs through_seq and/or before.")
+    if through_seq is not None and (not isinstance(through_seq, int) or through_seq < 0):
+        raise ValidationError("through_seq must be an integer >= 0.")
+    if before is not None:
+        validate_date_string(before)
+
+    return change_log_repository.compact(conn, through_seq=through_seq, before=before)
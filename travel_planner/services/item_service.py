@@ -1,15 +1,20 @@
 # travel_planner/services/item_service.py
 from __future__ import annotations
 
+import heapq
 from sqlite3 import Connection
 
+from travel_planner.domain.exceptions import ConflictError
+from travel_planner.domain.timezones import validate_timezone
 from travel_planner.domain.validators import ValidationError, validate_time_range
 from travel_planner.persistence.item_repository import (
     create_item_min as repo_create_item_min,
     create_item_scheduled as repo_create_item_scheduled,
-    list_items_for_day,
 )
-from travel_planner.persistence import item_repository
+from travel_planner.persistence import item_repository, recurring_repository
+from travel_planner.observability import metrics
+from travel_planner.observability.profiler import profiled
+from travel_planner.persistence.db import retry_on_busy
 
 def _validate_basic_fields(title: str, category: str) -> tuple[str, str]:
     if not isinstance(title, str):
@@ -33,6 +38,52 @@ def _overlaps(a_start: int, a_end: int, b_start: int, b_end: int) -> bool:
     return a_start < b_end and b_start < a_end
 
 
+def _day_span(start_min: int, end_min: int, end_days: int) -> tuple[int, int | None]:
+    """
+    Validate a range ending end_days after its start day; return (end_min, span_end_min) to store.
+
+    The stored end_min stays within the start day (1440 once the item runs
+    past midnight); span_end_min carries the real end, in minutes from the
+    start day's midnight, only when that is beyond 1440.
+    """
+    if end_days == 0:
+        validate_time_range(start_min, end_min)
+        return end_min, None
+    if not isinstance(end_days, int) or end_days < 0:
+        raise ValidationError("end_days must be an integer >= 0.")
+
+    # Starts on the day: the same rules as a range ending at midnight.
+    validate_time_range(start_min, 1440)
+    if not isinstance(end_min, int) or not (0 <= end_min <= 1440):
+        raise ValidationError("end_min must be between 0 and 1440.")
+
+    span = end_days * 1440 + end_min
+    return min(span, 1440), (span if span > 1440 else None)
+
+
+def _reject_overlaps(
+    conn: Connection,
+    day_id: int,
+    start_min: int,
+    end_min: int,
+    *,
+    timezone: str | None,
+    operation: str,
+    exclude_item_id: int | None = None,
+) -> None:
+    other = item_repository.find_overlapping_item(
+        conn, day_id, start_min, end_min, tz=timezone, exclude_item_id=exclude_item_id
+    )
+    if other is not None:
+        metrics.inc(metrics.OVERLAP_REJECTIONS, operation=operation)
+        raise ValidationError(
+            f"scheduled item overlaps existing item id={other['id']} "
+            f"({other['start_min']}–{other['end_min']})."
+        )
+
+
+@profiled
+@retry_on_busy
 def create_item_min(conn: Connection, day_id: int, title: str, category: str) -> int:
     """
     Create an unscheduled item (start/end NULL).
@@ -44,6 +95,8 @@ def create_item_min(conn: Connection, day_id: int, title: str, category: str) ->
     return int(repo_create_item_min(conn, day_id, t, c))
 
 
+@profiled
+@retry_on_busy
 def create_item_scheduled(
     conn: Connection,
     day_id: int,
@@ -52,33 +105,39 @@ def create_item_scheduled(
     start_min: int,
     end_min: int,
     *,
+    end_days: int = 0,
+    timezone: str | None = None,
     reject_overlaps: bool = True,
 ) -> int:
     """
-    Create a scheduled item. Optionally rejects overlaps with existing scheduled items in the same day.
+    Create a scheduled item. Optionally rejects overlaps with existing scheduled items.
+
+    With end_days > 0 the item ends at end_min that many days after its
+    start day (hotel stays, overnight travel). Times are local to timezone
+    (an IANA name; floating local time when None). Overlaps are checked by
+    UTC instant against every day the item touches, and against items of
+    earlier days that reach into this one.
     """
     if not isinstance(day_id, int) or day_id <= 0:
         raise ValidationError("day_id must be a positive integer.")
 
     t, c = _validate_basic_fields(title, category)
-    validate_time_range(start_min, end_min)
+    day_end_min, span_end_min = _day_span(start_min, end_min, end_days)
+    validate_timezone(timezone)
 
     if reject_overlaps:
-        existing = [
-            it
-            for it in list_items_for_day(conn, day_id)
-            if it.get("start_min") is not None and it.get("end_min") is not None
-        ]
-        for it in existing:
-            if _overlaps(start_min, end_min, it["start_min"], it["end_min"]):
-                raise ValidationError(
-                    f"scheduled item overlaps existing item id={it['id']} "
-                    f"({it['start_min']}–{it['end_min']})."
-                )
-
-    return int(repo_create_item_scheduled(conn, day_id, t, c, start_min, end_min))
+        _reject_overlaps(
+            conn, day_id, start_min, span_end_min or day_end_min, timezone=timezone, operation="create"
+        )
+
+    return int(
+        repo_create_item_scheduled(
+            conn, day_id, t, c, start_min, day_end_min, span_end_min=span_end_min, tz=timezone
+        )
+    )
 
 
+@profiled
 def check_overlaps_for_day(conn: Connection, day_id: int) -> list[dict]:
     """
     Return a list of overlap records for scheduled items in a day.
@@ -86,20 +145,17 @@ def check_overlaps_for_day(conn: Connection, day_id: int) -> list[dict]:
     if not isinstance(day_id, int) or day_id <= 0:
         raise ValidationError("day_id must be a positive integer.")
 
-    scheduled = [
-        it
-        for it in list_items_for_day(conn, day_id)
-        if it.get("start_min") is not None and it.get("end_min") is not None
-    ]
+    scheduled = item_repository.list_scheduled_for_day(conn, day_id)
 
+    # Compared by UTC instant: items of one day may be in different timezones.
     overlaps: list[dict] = []
     for i in range(len(scheduled)):
         a = scheduled[i]
         for j in range(i + 1, len(scheduled)):
             b = scheduled[j]
-            if _overlaps(a["start_min"], a["end_min"], b["start_min"], b["end_min"]):
-                overlap_start = max(a["start_min"], b["start_min"])
-                overlap_end = min(a["end_min"], b["end_min"])
+            if _overlaps(a["start_utc"], a["end_utc"], b["start_utc"], b["end_utc"]):
+                overlap_start = max(a["start_utc"], b["start_utc"])
+                overlap_end = min(a["end_utc"], b["end_utc"])
                 overlaps.append(
                     {
                         "item_a_id": a["id"],
@@ -111,6 +167,7 @@ def check_overlaps_for_day(conn: Connection, day_id: int) -> list[dict]:
     return overlaps
 
 
+@profiled
 def check_tight_connections_for_day(
     conn: Connection,
     day_id: int,
@@ -126,17 +183,14 @@ def check_tight_connections_for_day(
         raise ValidationError("buffer_min must be an integer >= 0.")
 
     scheduled = sorted(
-        (
-            it
-            for it in list_items_for_day(conn, day_id)
-            if it.get("start_min") is not None and it.get("end_min") is not None
-        ),
-        key=lambda it: (it["start_min"], it["end_min"], it["id"]),
+        item_repository.list_scheduled_for_day(conn, day_id),
+        # Occurrence ids are strings ("r<rule id>"); order them after items at a tie.
+        key=lambda it: (it["start_utc"], it["end_utc"], "recurring_id" in it, it.get("recurring_id", it["id"])),
     )
 
     warnings: list[dict] = []
     for prev, nxt in zip(scheduled, scheduled[1:]):
-        gap = nxt["start_min"] - prev["end_min"]
+        gap = nxt["start_utc"] - prev["end_utc"]
         if gap < buffer_min:
             warnings.append(
                 {
@@ -149,7 +203,88 @@ def check_tight_connections_for_day(
 
     return warnings
 
-def update_item_fields(
+@profiled
+def check_trip_timeline(
+    conn: Connection,
+    trip_id: int,
+    *,
+    buffer_min: int = 15,
+) -> dict:
+    """
+    Overlaps and tight connections across a whole trip, multi-day items included.
+
+    One pass over the trip's scheduled items (and recurring occurrences) in
+    UTC order, so timezones are taken into account. A min-heap holds the end times of the items still
+    running, so each item is compared only with those it can overlap.
+    Records have the shape of check_overlaps_for_day and
+    check_tight_connections_for_day.
+    """
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+    if not isinstance(buffer_min, int) or buffer_min < 0:
+        raise ValidationError("buffer_min must be an integer >= 0.")
+
+    # Items arrive in (start, id) order; occurrences follow the items they tie with.
+    occurrences = sorted(recurring_repository.list_trip_occurrences(conn, trip_id), key=lambda o: (o["start"], o["id"]))
+    timeline = heapq.merge(
+        ((it["start"], 0, n, it) for n, it in enumerate(item_repository.iter_trip_timeline(conn, trip_id))),
+        ((occ["start"], 1, n, occ) for n, occ in enumerate(occurrences)),
+    )
+
+    overlaps: list[dict] = []
+    warnings: list[dict] = []
+    active: list[tuple[int, int, dict]] = []
+    prev = None
+    for seq, (start, _, _, it) in enumerate(timeline):
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, _, other in sorted(active, key=lambda a: a[1]):
+            overlaps.append(
+                {
+                    "item_a_id": other["id"],
+                    "item_b_id": it["id"],
+                    "overlap_min": min(other["end"], it["end"]) - start,
+                }
+            )
+        heapq.heappush(active, (it["end"], seq, it))
+
+        if prev is not None:
+            gap = start - prev["end"]
+            if gap < buffer_min:
+                warnings.append(
+                    {
+                        "prev_item_id": prev["id"],
+                        "next_item_id": it["id"],
+                        "gap_min": gap,
+                        "buffer_min": buffer_min,
+                    }
+                )
+        prev = it
+
+    return {"overlaps": overlaps, "tight_connections": warnings}
+
+
+def _check_version(item: dict, expected_updated_at: str | None) -> None:
+    if expected_updated_at is not None and item["updated_at"] != expected_updated_at:
+        raise ConflictError(
+            f"item {item['id']} was changed since it was read "
+            f"(updated_at {item['updated_at']}, expected {expected_updated_at})."
+        )
+
+
+def _written(conn, item_id: int, updated_at: str | None, expected_updated_at: str | None) -> str:
+    # The conditional UPDATE matched no row: another writer changed (or deleted)
+    # the item between our read and our write.
+    if updated_at is not None:
+        return updated_at
+    current = item_repository.get_item(conn, item_id)
+    if current is None:
+        raise ValidationError("item not found.")
+    _check_version(current, expected_updated_at)
+    return current["updated_at"]
+
+
+def _update_item(
     conn,
     item_id: int,
     *,
@@ -158,39 +293,168 @@ def update_item_fields(
     notes: str | None = None,
     tags: str | None = None,
     pinned: bool | None = None,
-) -> None:
+    start_min: int | None = None,
+    end_min: int | None = None,
+    clear_time: bool = False,
+    timezone: str | None = None,
+    clear_timezone: bool = False,
+    reject_overlaps: bool = True,
+    expected_updated_at: str | None = None,
+) -> str:
     if item_id <= 0:
         raise ValidationError("item_id must be positive.")
 
-    item = item_repository.get_item(conn, item_id)
-    if item is None:
-        raise ValidationError("item not found.")
-
+    set_time = start_min is not None or end_min is not None
+    if clear_time and set_time:
+        raise ValidationError("clear_time cannot be combined with start_min/end_min.")
+    if set_time:
+        if start_min is None or end_min is None:
+            raise ValidationError("start_min and end_min must both be provided.")
+        validate_time_range(start_min, end_min)
+    if clear_timezone and timezone is not None:
+        raise ValidationError("clear_timezone cannot be combined with timezone.")
+    validate_timezone(timezone)
+
+    changes: dict[str, object] = {}
     if title is not None:
         title = title.strip()
         if not title:
             raise ValidationError("title must not be blank.")
+        changes["title"] = title
 
     if category is not None:
         category = category.strip()
         if not category:
             raise ValidationError("category must not be blank.")
+        changes["category"] = category
 
-    pinned_int = None
+    if notes is not None:
+        changes["notes"] = notes
+    if tags is not None:
+        changes["tags"] = tags
     if pinned is not None:
-        pinned_int = 1 if pinned else 0
+        changes["pinned"] = 1 if pinned else 0
+
+    item = item_repository.get_item(conn, item_id)
+    if item is None:
+        raise ValidationError("item not found.")
+    _check_version(item, expected_updated_at)
+
+    tz = item["timezone"]
+    if timezone is not None or clear_timezone:
+        tz = timezone
+        changes["timezone"] = timezone
+
+    # New times are local to the new timezone; a timezone change alone moves
+    # the item's existing times.
+    if set_time:
+        changes.update(start_min=start_min, end_min=end_min, span_end_min=None)
+        if reject_overlaps:
+            _reject_overlaps(
+                conn,
+                item["day_id"],
+                start_min,
+                end_min,
+                timezone=tz,
+                operation="set_time",
+                exclude_item_id=item_id,
+            )
+    elif clear_time:
+        changes.update(start_min=None, end_min=None, span_end_min=None)
+    elif "timezone" in changes and reject_overlaps and item["start_min"] is not None:
+        _reject_overlaps(
+            conn,
+            item["day_id"],
+            item["start_min"],
+            item["span_end_min"] or item["end_min"],
+            timezone=tz,
+            operation="set_timezone",
+            exclude_item_id=item_id,
+        )
+
+    if not changes:
+        return item["updated_at"]
+
+    updated_at = item_repository.update_item(conn, item_id, changes, expected_updated_at=expected_updated_at)
+    return _written(conn, item_id, updated_at, expected_updated_at)
+
+
+@profiled
+@retry_on_busy
+def update_item(
+    conn,
+    item_id: int,
+    *,
+    title: str | None = None,
+    category: str | None = None,
+    notes: str | None = None,
+    tags: str | None = None,
+    pinned: bool | None = None,
+    start_min: int | None = None,
+    end_min: int | None = None,
+    clear_time: bool = False,
+    timezone: str | None = None,
+    clear_timezone: bool = False,
+    reject_overlaps: bool = True,
+    expected_updated_at: str | None = None,
+) -> str:
+    """
+    Patch any mix of fields, time and timezone in one write; returns the item's updated_at afterwards.
 
-    item_repository.update_item_fields(
+    Every change is validated, and the new schedule checked for overlaps,
+    before anything is written; the changes then land in a single UPDATE.
+    A rejected call leaves the item exactly as it was. With
+    expected_updated_at (the updated_at the caller read) the write is
+    refused with ConflictError if the item has changed since.
+    """
+    return _update_item(
         conn,
         item_id,
         title=title,
         category=category,
         notes=notes,
         tags=tags,
-        pinned=pinned_int,
+        pinned=pinned,
+        start_min=start_min,
+        end_min=end_min,
+        clear_time=clear_time,
+        timezone=timezone,
+        clear_timezone=clear_timezone,
+        reject_overlaps=reject_overlaps,
+        expected_updated_at=expected_updated_at,
     )
 
 
+@profiled
+@retry_on_busy
+def update_item_fields(
+    conn,
+    item_id: int,
+    *,
+    title: str | None = None,
+    category: str | None = None,
+    notes: str | None = None,
+    tags: str | None = None,
+    pinned: bool | None = None,
+    expected_updated_at: str | None = None,
+) -> str:
+    """
+    Patch the given fields and return the item's updated_at afterwards.
+    """
+    return _update_item(
+        conn,
+        item_id,
+        title=title,
+        category=category,
+        notes=notes,
+        tags=tags,
+        pinned=pinned,
+        expected_updated_at=expected_updated_at,
+    )
+
+
+@profiled
+@retry_on_busy
 def set_item_time(
     conn,
     item_id: int,
@@ -198,44 +462,95 @@ def set_item_time(
     end_min: int,
     *,
     reject_overlaps: bool = True,
-) -> None:
-    if item_id <= 0:
-        raise ValidationError("item_id must be positive.")
-
+    expected_updated_at: str | None = None,
+) -> str:
     validate_time_range(start_min, end_min)
+    return _update_item(
+        conn,
+        item_id,
+        start_min=start_min,
+        end_min=end_min,
+        reject_overlaps=reject_overlaps,
+        expected_updated_at=expected_updated_at,
+    )
 
-    item = item_repository.get_item(conn, item_id)
-    if item is None:
-        raise ValidationError("item not found.")
 
-    day_id = item["day_id"]
+@profiled
+@retry_on_busy
+def set_item_timezone(
+    conn,
+    item_id: int,
+    timezone: str | None,
+    *,
+    reject_overlaps: bool = True,
+    expected_updated_at: str | None = None,
+) -> str:
+    """
+    Set the timezone an item's times are local to (None: floating local time).
 
-    if reject_overlaps:
-        existing = item_repository.list_items_for_day(conn, day_id)
-        for other in existing:
-            if other["id"] == item_id:
-                continue
+    The local times stay as they are; the item's UTC instants move.
+    """
+    return _update_item(
+        conn,
+        item_id,
+        timezone=timezone,
+        clear_timezone=timezone is None,
+        reject_overlaps=reject_overlaps,
+        expected_updated_at=expected_updated_at,
+    )
 
-            o_start = other.get("start_min")
-            o_end = other.get("end_min")
 
-            if o_start is None or o_end is None:
-                continue
+@profiled
+@retry_on_busy
+def clear_item_time(conn, item_id: int, *, expected_updated_at: str | None = None) -> str:
+    return _update_item(conn, item_id, clear_time=True, expected_updated_at=expected_updated_at)
 
-            if start_min < o_end and o_start < end_min:
-                raise ValidationError(
-                    f"overlaps with item {other['id']}."
-                )
+@profiled
+@retry_on_busy
+def delete_item(conn: Connection, item_id: int) -> None:
+    if not isinstance(item_id, int) or item_id <= 0:
+        raise ValidationError("item_id must be a positive integer.")
 
-    item_repository.update_item_time(conn, item_id, start_min, end_min)
+    item_repository.delete_item(conn, item_id)
 
 
-def clear_item_time(conn, item_id: int) -> None:
-    if item_id <= 0:
-        raise ValidationError("item_id must be positive.")
+@profiled
+@retry_on_busy
+def move_item(
+    conn,
+    item_id: int,
+    *,
+    before_id: int | None = None,
+    after_id: int | None = None,
+) -> int:
+    """
+    Place an unscheduled item directly before or after another item of the same day.
+
+    Usually a single-row update to the midpoint between the anchor and its
+    neighbour; the day is respaced only when that gap is used up, in the same
+    transaction as the move. Returns the new position.
+    """
+    if (before_id is None) == (after_id is None):
+        raise ValidationError("give exactly one of before_id / after_id.")
+    anchor_id = before_id if before_id is not None else after_id
+    direction = "before" if before_id is not None else "after"
+
+    if not isinstance(item_id, int) or item_id <= 0:
+        raise ValidationError("item_id must be a positive integer.")
+    if not isinstance(anchor_id, int) or anchor_id <= 0:
+        raise ValidationError("anchor item id must be a positive integer.")
+    if anchor_id == item_id:
+        raise ValidationError("cannot move an item relative to itself.")
 
     item = item_repository.get_item(conn, item_id)
-    if item is None:
+    anchor = item_repository.get_item(conn, anchor_id)
+    if item is None or anchor is None:
         raise ValidationError("item not found.")
-
-    item_repository.clear_item_time(conn, item_id)
\ No newline at end of file
+    if item["day_id"] != anchor["day_id"]:
+        raise ValidationError("items must belong to the same day.")
+    if item["start_min"] is not None or anchor["start_min"] is not None:
+        raise ValidationError("scheduled items are ordered by time; clear the time before moving.")
+    if item["pinned"] != anchor["pinned"]:
+        raise ValidationError("pinned items are listed first; move within the pinned or unpinned group.")
+
+    return item_repository.move_item_position(conn, item_id, anchor_id, direction=direction)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from sqlite3 import Connection
+
+from travel_planner.domain.validators import ValidationError, validate_date_string, validate_time_range
+from travel_planner.observability.profiler import profiled
+from travel_planner.persistence.db import retry_on_busy
+from travel_planner.persistence import day_repository, recurring_repository, trip_repository
+
+
+@profiled
+@retry_on_busy
+def add_recurring_item(
+    conn: Connection,
+    trip_id: int,
+    title: str,
+    category: str,
+    *,
+    start_min: int | None = None,
+    end_min: int | None = None,
+    every_days: int = 1,
+    from_date: str | None = None,
+    until_date: str | None = None,
+    pinned: bool = False,
+) -> int:
+    """
+    Store an item that repeats every every_days days of a trip, optionally within from_date..until_date.
+
+    The rule is stored once; its occurrences appear in day listings, checks
+    and exports without being materialized.
+    """
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+    if not isinstance(title, str) or not title.strip():
+        raise ValidationError("title must not be blank.")
+    if not isinstance(category, str) or not category.strip():
+        raise ValidationError("category must not be blank.")
+    validate_time_range(start_min, end_min)
+    if isinstance(every_days, bool) or not isinstance(every_days, int) or every_days < 1:
+        raise ValidationError("every_days must be a positive integer.")
+    for value in (from_date, until_date):
+        if value is not None:
+            validate_date_string(value)
+    if every_days > 1 and from_date is None:
+        raise ValidationError("a rule repeating every few days needs a from date to count from.")
+    if from_date is not None and until_date is not None and from_date > until_date:
+        raise ValidationError("from date must not be after until date.")
+    if trip_repository.get_trip(conn, trip_id) is None:
+        raise ValidationError("trip not found.")
+
+    return recurring_repository.create_rule(
+        conn,
+        trip_id,
+        title.strip(),
+        category.strip(),
+        start_min=start_min,
+        end_min=end_min,
+        pinned=1 if pinned else 0,
+        interval_days=every_days,
+        from_date=from_date,
+        until_date=until_date,
+    )
+
+
+def _require_rule(conn: Connection, rule_id: int) -> dict:
+    if not isinstance(rule_id, int) or rule_id <= 0:
+        raise ValidationError("rule_id must be a positive integer.")
+    rule = recurring_repository.get_rule(conn, rule_id)
+    if rule is None:
+        raise ValidationError("recurring item not found.")
+    return rule
+
+
+@profiled
+def list_recurring_items(conn: Connection, trip_id: int) -> list[dict]:
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+    return recurring_repository.list_rules_for_trip(conn, trip_id)
+
+
+@profiled
+@retry_on_busy
+def delete_recurring_item(conn: Connection, rule_id: int) -> None:
+    _require_rule(conn, rule_id)
+    recurring_repository.delete_rule(conn, rule_id)
+
+
+@profiled
+@retry_on_busy
+def set_occurrence_skipped(conn: Connection, rule_id: int, day_id: int, *, skipped: bool = True) -> None:
+    """
+    Drop (or restore) one day's occurrence of a recurring item.
+    """
+    rule = _require_rule(conn, rule_id)
+    if not isinstance(day_id, int) or day_id <= 0:
+        raise ValidationError("day_id must be a positive integer.")
+    day = day_repository.get_day(conn, day_id)
+    if day is None or day["trip_id"] != rule["trip_id"]:
+        raise ValidationError("day not found in the recurring item's trip.")
+
+    if skipped:
+        recurring_repository.add_skip(conn, rule_id, day_id)
+    else:
+        recurring_repository.remove_skip(conn, rule_id, day_id)
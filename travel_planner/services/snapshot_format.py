@@ -0,0 +1,324 @@
+'''
+Purpose: Binary trip snapshot format (read and write, streaming).
+
+Layout (all integers little-endian):
+
+    header   "TPSNAP" | u16 format version | u16 flags (bit 0: body is zlib-compressed)
+    body     records: u8 tag | u32 payload length | payload
+
+    T  trip       u32 len + UTF-8 trip name
+    C  table      u8 table id | u16 column count | per column: u8 kind ('i', 'f', 's') | u16 len + name
+    S  strings    u32 count | per string: u32 len + UTF-8; appended to the string table
+    R  rows       u8 table id | u32 row count | one block per declared column
+    E  end        u32 days | u32 items (row counts, checked by the reader)
+
+Tables: 0 days, 1 items, 2 recurring rules, 3 rule skips (rule and day
+ordinals). Rules and skips are written before the items so a reader has them
+before the item rows start streaming; snapshots from before they existed
+simply have none.
+
+A column block is a u8 null mode (0: no NULLs, 1: NULL bitmap follows,
+2: all NULL, nothing follows) then the values packed as one array: i64 for
+'i', f64 for 'f', and u32 string-table indexes for 's'. Every text value is
+stored once in the string table, so repeated categories, currencies and tags
+cost four bytes per row. String records are written just before the first
+rows block that needs them, which keeps both ends streaming.
+
+Readers skip records with unknown tags, so optional records can be added
+without a version bump; FORMAT_VERSION changes only for incompatible layouts.
+'''
+
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, BinaryIO, Iterator, Sequence
+
+MAGIC = b"TPSNAP"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x1
+
+TABLE_DAYS = 0
+TABLE_ITEMS = 1
+TABLE_RULES = 2
+TABLE_SKIPS = 3
+
+KIND_INT = "i"
+KIND_REAL = "f"
+KIND_TEXT = "s"
+
+TAG_TRIP = ord("T")
+TAG_TABLE = ord("C")
+TAG_STRINGS = ord("S")
+TAG_ROWS = ord("R")
+TAG_END = ord("E")
+
+_HEADER = struct.Struct("<6sHH")
+_RECORD = struct.Struct("<BI")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_ROWS_HEAD = struct.Struct("<BI")
+_END = struct.Struct("<II")
+
+_NULLS_NONE = 0
+_NULLS_BITMAP = 1
+_NULLS_ALL = 2
+
+_INDEX_CODE = next(code for code in "IL" if array(code).itemsize == 4)
+_ARRAY_CODES = {KIND_INT: "q", KIND_REAL: "d", KIND_TEXT: _INDEX_CODE}
+_SWAP = sys.byteorder == "big"
+
+_READ_CHUNK = 1 << 16
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a snapshot is truncated, corrupt or of an unsupported version."""
+
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _U32.pack(len(data)) + data
+
+
+def _to_bytes(values: array) -> bytes:
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class SnapshotWriter:
+    """
+    Write a snapshot record by record: write_trip, declare_table, write_rows (any number of times), close.
+    """
+
+    def __init__(self, out: BinaryIO, *, compress: bool = False, level: int = 6) -> None:
+        self._out = out
+        self._zip = zlib.compressobj(level) if compress else None
+        self._strings: dict[str, int] = {}
+        self._tables: dict[int, list[tuple[str, str]]] = {}
+        self.row_counts = {TABLE_DAYS: 0, TABLE_ITEMS: 0}
+        out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_ZLIB if compress else 0))
+
+    def _emit(self, tag: int, payload: bytes) -> None:
+        data = _RECORD.pack(tag, len(payload)) + payload
+        if self._zip is not None:
+            data = self._zip.compress(data)
+        if data:
+            self._out.write(data)
+
+    def write_trip(self, name: str) -> None:
+        self._emit(TAG_TRIP, _pack_str(name))
+
+    def declare_table(self, table: int, columns: Sequence[tuple[str, str]]) -> None:
+        parts = [_U8.pack(table), _U16.pack(len(columns))]
+        for name, kind in columns:
+            if kind not in _ARRAY_CODES:
+                raise ValueError(f"unknown column kind {kind!r} for {name}.")
+            encoded = name.encode("utf-8")
+            parts.append(_U8.pack(ord(kind)) + _U16.pack(len(encoded)) + encoded)
+        self._tables[table] = list(columns)
+        self._emit(TAG_TABLE, b"".join(parts))
+
+    def write_rows(self, table: int, rows: Sequence[Sequence[Any]]) -> None:
+        if not rows:
+            return
+        columns = self._tables[table]
+        new_strings: list[str] = []
+        blocks = [_ROWS_HEAD.pack(table, len(rows))]
+
+        for col, (name, kind) in enumerate(columns):
+            values = array(_ARRAY_CODES[kind])
+            bitmap = bytearray((len(rows) + 7) // 8)
+            nulls = 0
+            for i, row in enumerate(rows):
+                value = row[col]
+                if value is None:
+                    bitmap[i >> 3] |= 1 << (i & 7)
+                    nulls += 1
+                    values.append(0)
+                elif kind == KIND_TEXT:
+                    if not isinstance(value, str):
+                        raise ValueError(f"{name} holds a non-text value: {value!r}.")
+                    index = self._strings.get(value)
+                    if index is None:
+                        index = self._strings[value] = len(self._strings)
+                        new_strings.append(value)
+                    values.append(index)
+                else:
+                    try:
+                        values.append(value)
+                    except TypeError:
+                        raise ValueError(f"{name} holds a value of the wrong type: {value!r}.") from None
+
+            if nulls == len(rows):
+                blocks.append(_U8.pack(_NULLS_ALL))
+            elif nulls:
+                blocks.append(_U8.pack(_NULLS_BITMAP) + bytes(bitmap) + _to_bytes(values))
+            else:
+                blocks.append(_U8.pack(_NULLS_NONE) + _to_bytes(values))
+
+        if new_strings:
+            self._emit(TAG_STRINGS, _U32.pack(len(new_strings)) + b"".join(_pack_str(s) for s in new_strings))
+        self._emit(TAG_ROWS, b"".join(blocks))
+        self.row_counts[table] = self.row_counts.get(table, 0) + len(rows)
+
+    def close(self) -> None:
+        """
+        Write the end record and flush the compressor; does not close the underlying file.
+        """
+        self._emit(TAG_END, _END.pack(self.row_counts[TABLE_DAYS], self.row_counts[TABLE_ITEMS]))
+        if self._zip is not None:
+            self._out.write(self._zip.flush())
+        self._out.flush()
+
+
+class SnapshotReader:
+    """
+    Read a snapshot as a stream of records; memory use is bounded by the largest record.
+
+    records() yields ("trip", name), ("table", table id, columns),
+    ("rows", table id, list of row tuples) and finally ("end", row counts).
+    """
+
+    def __init__(self, src: BinaryIO) -> None:
+        self._src = src
+        head = src.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            raise SnapshotFormatError("not a trip snapshot (file too short).")
+        magic, version, flags = _HEADER.unpack(head)
+        if magic != MAGIC:
+            raise SnapshotFormatError("not a trip snapshot (bad magic).")
+        if version > FORMAT_VERSION:
+            raise SnapshotFormatError(
+                f"snapshot format version {version} is newer than this code supports ({FORMAT_VERSION})."
+            )
+        self.version = version
+        self._unzip = zlib.decompressobj() if flags & FLAG_ZLIB else None
+        self._buf = bytearray()
+        self._pos = 0
+        self._eof = False
+        self.strings: list[str] = []
+        self.tables: dict[int, list[tuple[str, str]]] = {}
+
+    def _fill(self, n: int) -> None:
+        while len(self._buf) - self._pos < n and not self._eof:
+            chunk = self._src.read(_READ_CHUNK)
+            if self._pos:
+                del self._buf[: self._pos]
+                self._pos = 0
+            if not chunk:
+                self._eof = True
+                if self._unzip is not None:
+                    self._buf += self._unzip.flush()
+            elif self._unzip is not None:
+                try:
+                    self._buf += self._unzip.decompress(chunk)
+                except zlib.error as e:
+                    raise SnapshotFormatError(f"corrupt snapshot: {e}") from None
+            else:
+                self._buf += chunk
+
+    def _take(self, n: int) -> memoryview:
+        self._fill(n)
+        if len(self._buf) - self._pos < n:
+            raise SnapshotFormatError("truncated snapshot.")
+        view = memoryview(bytes(self._buf[self._pos : self._pos + n]))
+        self._pos += n
+        return view
+
+    def records(self) -> Iterator[tuple]:
+        rows_seen = {TABLE_DAYS: 0, TABLE_ITEMS: 0}
+        while True:
+            tag, length = _RECORD.unpack(self._take(_RECORD.size))
+            payload = self._take(length)
+            try:
+                if tag == TAG_TRIP:
+                    yield ("trip", _Cursor(payload).text())
+                elif tag == TAG_TABLE:
+                    table, columns = self._parse_table(payload)
+                    self.tables[table] = columns
+                    yield ("table", table, columns)
+                elif tag == TAG_STRINGS:
+                    cur = _Cursor(payload)
+                    self.strings.extend(cur.text() for _ in range(cur.u32()))
+                elif tag == TAG_ROWS:
+                    table, rows = self._parse_rows(payload)
+                    rows_seen[table] = rows_seen.get(table, 0) + len(rows)
+                    yield ("rows", table, rows)
+                elif tag == TAG_END:
+                    days, items = _END.unpack(payload)
+                    if (days, items) != (rows_seen[TABLE_DAYS], rows_seen[TABLE_ITEMS]):
+                        raise SnapshotFormatError("snapshot row counts do not match its end record.")
+                    yield ("end", {"days": days, "items": items})
+                    return
+            except (struct.error, IndexError, KeyError, UnicodeDecodeError) as e:
+                raise SnapshotFormatError(f"corrupt snapshot record {chr(tag)!r}: {e}") from None
+
+    @staticmethod
+    def _parse_table(payload: memoryview) -> tuple[int, list[tuple[str, str]]]:
+        cur = _Cursor(payload)
+        table = cur.u8()
+        columns = []
+        for _ in range(cur.u16()):
+            kind = chr(cur.u8())
+            if kind not in _ARRAY_CODES:
+                raise SnapshotFormatError(f"unknown column kind {kind!r}.")
+            columns.append((cur.text(width=_U16), kind))
+        return table, columns
+
+    def _parse_rows(self, payload: memoryview) -> tuple[int, list[tuple]]:
+        cur = _Cursor(payload)
+        table, count = _ROWS_HEAD.unpack(cur.take(_ROWS_HEAD.size))
+        columns_out: list[list[Any]] = []
+        for _name, kind in self.tables[table]:
+            mode = cur.u8()
+            if mode == _NULLS_ALL:
+                columns_out.append([None] * count)
+                continue
+            bitmap = cur.take((count + 7) // 8) if mode == _NULLS_BITMAP else None
+            values = array(_ARRAY_CODES[kind])
+            values.frombytes(cur.take(count * values.itemsize))
+            if _SWAP:
+                values.byteswap()
+            column: list[Any] = values.tolist()
+            if bitmap is not None:
+                for i in range(count):
+                    if bitmap[i >> 3] & (1 << (i & 7)):
+                        column[i] = None
+            if kind == KIND_TEXT:
+                strings = self.strings
+                column = [None if i is None else strings[i] for i in column]
+            columns_out.append(column)
+        return table, list(zip(*columns_out))
+
+
+class _Cursor:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: memoryview) -> None:
+        self.data = data
+        self.pos = 0
+
+    def take(self, n: int) -> memoryview:
+        if self.pos + n > len(self.data):
+            raise SnapshotFormatError("record is shorter than its contents.")
+        view = self.data[self.pos : self.pos + n]
+        self.pos += n
+        return view
+
+    def u8(self) -> int:
+        return _U8.unpack(self.take(1))[0]
+
+    def u16(self) -> int:
+        return _U16.unpack(self.take(2))[0]
+
+    def u32(self) -> int:
+        return _U32.unpack(self.take(4))[0]
+
+    def text(self, *, width: struct.Struct = _U32) -> str:
+        (n,) = width.unpack(self.take(width.size))
+        return str(self.take(n), "utf-8")
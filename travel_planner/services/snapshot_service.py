@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from sqlite3 import Connection
+from typing import BinaryIO, Iterator
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.observability.profiler import profiled
+from travel_planner.persistence import day_repository, snapshot_repository, trip_repository
+from travel_planner.services.snapshot_format import (
+    TABLE_DAYS,
+    TABLE_ITEMS,
+    TABLE_RULES,
+    TABLE_SKIPS,
+    KIND_INT,
+    KIND_TEXT,
+    SnapshotFormatError,
+    SnapshotReader,
+    SnapshotWriter,
+)
+
+SNAPSHOT_BATCH_ROWS = 1024
+
+
+def _check_ordinals(values: list[int], count: int, what: str) -> None:
+    if values and (min(values) < 0 or max(values) >= count):
+        raise SnapshotFormatError(f"{what} out of range.")
+
+
+@profiled
+def snapshot_trip(conn: Connection, trip_id: int, out: BinaryIO, *, compress: bool = False) -> dict[str, int]:
+    """
+    Write a trip with its days, recurring rules and items to out in the binary snapshot format.
+
+    Reads run in one transaction, so the snapshot is consistent even while
+    other connections write. Returns row counts.
+    """
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+
+    own_txn = not conn.in_transaction
+    if own_txn:
+        conn.execute("BEGIN;")
+    try:
+        trip = trip_repository.get_trip(conn, trip_id)
+        if trip is None:
+            raise ValidationError("trip not found.")
+        days = day_repository.list_days_for_trip(conn, trip_id)
+        columns = snapshot_repository.get_item_columns(conn)
+
+        writer = SnapshotWriter(out, compress=compress)
+        writer.write_trip(trip["name"])
+        writer.declare_table(TABLE_DAYS, [("date", KIND_TEXT)])
+        writer.write_rows(TABLE_DAYS, [(d["date"],) for d in days])
+
+        rule_columns = snapshot_repository.get_rule_columns(conn)
+        rules = snapshot_repository.list_rule_rows(conn, trip_id, [name for name, _ in rule_columns])
+        rule_index = {row[0]: i for i, row in enumerate(rules)}
+        day_index = {d["id"]: i for i, d in enumerate(days)}
+        writer.declare_table(TABLE_RULES, rule_columns)
+        writer.write_rows(TABLE_RULES, [row[1:] for row in rules])
+        writer.declare_table(TABLE_SKIPS, [("rule_index", KIND_INT), ("day_index", KIND_INT)])
+        writer.write_rows(
+            TABLE_SKIPS,
+            [(rule_index[rule], day_index[day]) for rule, day in snapshot_repository.list_skip_rows(conn, trip_id)],
+        )
+
+        writer.declare_table(TABLE_ITEMS, [("day_index", KIND_INT), *columns])
+        for batch in snapshot_repository.iter_item_rows_for_days(
+            conn,
+            [d["id"] for d in days],
+            [name for name, _ in columns],
+            batch_rows=SNAPSHOT_BATCH_ROWS,
+        ):
+            writer.write_rows(TABLE_ITEMS, batch)
+        writer.close()
+    finally:
+        if own_txn:
+            conn.rollback()
+
+    return {"days": writer.row_counts[TABLE_DAYS], "items": writer.row_counts[TABLE_ITEMS]}
+
+
+@profiled
+def restore_trip(conn: Connection, src: BinaryIO, *, name: str | None = None) -> dict[str, int]:
+    """
+    Load a snapshot as a new trip (new ids) in one transaction; name overrides the stored trip name.
+
+    Returns {"trip_id", "days", "items"}.
+    """
+    if name is not None and not name.strip():
+        raise ValidationError("trip name must not be blank.")
+
+    try:
+        reader = SnapshotReader(src)
+        records = reader.records()
+
+        trip_name = None
+        dates: list[str] = []
+        rule_columns: list[str] = []
+        rules: list[tuple] = []
+        skips: list[tuple] = []
+        item_columns: list[str] | None = None
+        for record in records:
+            if record[0] == "trip":
+                trip_name = record[1]
+            elif record[0] == "rows" and record[1] == TABLE_DAYS:
+                dates.extend(row[0] for row in record[2])
+            elif record[0] == "table" and record[1] == TABLE_RULES:
+                rule_columns = [col for col, _ in record[2]]
+            elif record[0] == "rows" and record[1] == TABLE_RULES:
+                rules.extend(record[2])
+            elif record[0] == "rows" and record[1] == TABLE_SKIPS:
+                skips.extend(record[2])
+            elif record[0] == "table" and record[1] == TABLE_ITEMS:
+                item_columns = [col for col, _ in record[2]]
+                break
+            elif record[0] == "end":
+                break
+        if trip_name is None:
+            raise SnapshotFormatError("snapshot has no trip record.")
+        if item_columns is None or item_columns[:1] != ["day_index"]:
+            raise SnapshotFormatError("snapshot has no items table.")
+        _check_ordinals([rule for rule, _ in skips], len(rules), "skip rule index")
+        _check_ordinals([day for _, day in skips], len(dates), "skip day index")
+
+        def item_batches() -> Iterator[list[tuple]]:
+            for record in records:
+                if record[0] == "rows" and record[1] == TABLE_ITEMS:
+                    _check_ordinals([row[0] for row in record[2]], len(dates), "item day index")
+                    yield record[2]
+
+        return snapshot_repository.insert_trip_rows(
+            conn,
+            name.strip() if name is not None else trip_name,
+            dates,
+            item_columns[1:],
+            item_batches(),
+            rule_columns=rule_columns,
+            rules=rules,
+            skips=skips,
+        )
+    except SnapshotFormatError as e:
+        raise ValidationError(f"cannot restore snapshot: {e}") from None
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from sqlite3 import Connection
+from typing import Any, Callable
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.observability.profiler import profiled
+from travel_planner.persistence import stats_repository, trip_repository
+
+CACHE_FORMAT = 1
+
+_TOTAL_FIELDS = ("items", "scheduled", "scheduled_min", "busy_min", "idle_min")
+
+
+def _add_spend(spend: dict[str, float], currency: str | None, amount: float | None) -> None:
+    if amount is not None:
+        key = currency or ""
+        spend[key] = spend.get(key, 0.0) + amount
+
+
+def _categories(rows: list[dict]) -> list[dict]:
+    # Rows arrive ordered by category with one row per currency; fold them.
+    out: list[dict] = []
+    for r in rows:
+        if not out or out[-1]["category"] != r["category"]:
+            out.append({"category": r["category"], "items": 0, "scheduled_min": 0, "spend": {}})
+        cat = out[-1]
+        cat["items"] += r["items"]
+        cat["scheduled_min"] += r["scheduled_min"]
+        _add_spend(cat["spend"], r["currency"], r["amount"])
+    return out
+
+
+def _new_totals(**fields: Any) -> dict:
+    return {**fields, "days": 0, **{f: 0 for f in _TOTAL_FIELDS}, "spend": {}}
+
+
+def _accumulate(totals: dict, day: dict) -> None:
+    totals["days"] += 1
+    for f in _TOTAL_FIELDS:
+        totals[f] += day[f]
+    for currency, amount in day["spend"].items():
+        _add_spend(totals["spend"], currency, amount)
+
+
+def _compute_trip(conn: Connection, trip_id: int) -> dict:
+    trip = trip_repository.get_trip(conn, trip_id)
+    if trip is None:
+        raise ValidationError("trip not found.")
+
+    spend_by_day: dict[int, dict[str, float]] = {}
+    for r in stats_repository.list_day_spend(conn, trip_id=trip_id):
+        _add_spend(spend_by_day.setdefault(r["day_id"], {}), r["currency"], r["amount"])
+
+    totals = _new_totals(trip_id=trip_id, name=trip["name"])
+    days = []
+    for day in stats_repository.iter_day_stats(conn, trip_id=trip_id):
+        day["spend"] = spend_by_day.get(day["day_id"], {})
+        _accumulate(totals, day)
+        days.append(day)
+
+    return {
+        "trip": totals,
+        "days": days,
+        "categories": _categories(stats_repository.list_category_stats(conn, trip_id=trip_id)),
+    }
+
+
+def _compute_db(conn: Connection) -> dict:
+    spend_by_day: dict[int, dict[str, float]] = {}
+    for r in stats_repository.list_day_spend(conn):
+        _add_spend(spend_by_day.setdefault(r["day_id"], {}), r["currency"], r["amount"])
+
+    totals = _new_totals()
+    trips = {t["id"]: _new_totals(trip_id=t["id"], name=t["name"]) for t in trip_repository.list_trips(conn)}
+    for day in stats_repository.iter_day_stats(conn):
+        day["spend"] = spend_by_day.get(day["day_id"], {})
+        _accumulate(trips[day["trip_id"]], day)
+        _accumulate(totals, day)
+    totals["trips"] = len(trips)
+
+    return {
+        "totals": totals,
+        "trips": list(trips.values()),
+        "categories": _categories(stats_repository.list_category_stats(conn)),
+    }
+
+
+def _read_cache(path: str, scope: str, mark: int) -> dict | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("format") != CACHE_FORMAT
+        or cached.get("scope") != scope
+        or cached.get("mark") != mark
+    ):
+        return None
+    return cached.get("stats")
+
+
+def _write_cache(path: str, scope: str, mark: int, stats: dict) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".stats-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "scope": scope, "mark": mark, "stats": stats}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _cached(conn: Connection, scope: str, cache_path: str | None, compute: Callable[[], dict]) -> dict:
+    # A cache file is only valid for the database file it was computed from.
+    main_file = next((r[2] for r in conn.execute("PRAGMA database_list;") if r[1] == "main"), "")
+    scope = f"{main_file}|{scope}"
+    # One read transaction: the change mark and the stats describe the same state.
+    own_txn = not conn.in_transaction
+    if own_txn:
+        conn.execute("BEGIN;")
+    try:
+        mark = stats_repository.get_change_mark(conn)
+        if cache_path is not None:
+            stats = _read_cache(cache_path, scope, mark)
+            if stats is not None:
+                stats["cached"] = True
+                return stats
+        stats = compute()
+    finally:
+        if own_txn:
+            conn.rollback()
+
+    if cache_path is not None:
+        _write_cache(cache_path, scope, mark, stats)
+    stats["cached"] = False
+    return stats
+
+
+@profiled
+def trip_stats(conn: Connection, trip_id: int, *, cache_path: str | None = None) -> dict:
+    """
+    Spend, item counts and schedule utilization for one trip: totals, per day and per category.
+
+    Spend maps currency ("" when unset) to the sum of actual cost, falling
+    back to the estimate. With cache_path, results are reused until any
+    trip, day or item changes.
+    """
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+    return _cached(conn, f"trip:{trip_id}", cache_path, lambda: _compute_trip(conn, trip_id))
+
+
+@profiled
+def db_stats(conn: Connection, *, cache_path: str | None = None) -> dict:
+    """
+    The same statistics across the whole database: totals, per trip and per category.
+    """
+    return _cached(conn, "db", cache_path, lambda: _compute_db(conn))
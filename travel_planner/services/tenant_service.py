@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from sqlite3 import Connection
+from typing import Iterator
+
+from travel_planner.domain.validators import ValidationError
+from travel_planner.observability.profiler import profiled
+from travel_planner.persistence.tenants import TenantRouter, is_valid_tenant_id
+
+
+def validate_tenant_id(tenant_id: object) -> None:
+    if not is_valid_tenant_id(tenant_id):
+        raise ValidationError(
+            "tenant id must be 1-64 letters, digits, '-' or '_' and start with a letter or digit."
+        )
+
+
+@contextmanager
+def tenant_connection(router: TenantRouter, tenant_id: str) -> Iterator[Connection]:
+    """
+    Check out a connection to one tenant's database; every service call made with it stays in that tenant.
+    """
+    validate_tenant_id(tenant_id)
+    with router.connection(tenant_id) as conn:
+        yield conn
+
+
+def maintain_tenant(conn: Connection) -> dict:
+    """
+    Routine upkeep for one tenant database: a quick integrity check and PRAGMA optimize.
+    """
+    problems = [r[0] for r in conn.execute("PRAGMA quick_check;").fetchall()]
+    conn.execute("PRAGMA optimize;")
+    return {"integrity": "ok" if problems == ["ok"] else "; ".join(problems)}
+
+
+@profiled
+def maintain_tenants(
+    router: TenantRouter,
+    *,
+    tenants: list[str] | None = None,
+    workers: int = 4,
+) -> list[dict]:
+    """
+    Run maintain_tenant() for every tenant (or the given ones), `workers` databases at a time.
+
+    Tenants are independent files, so they are processed in parallel; a
+    failure in one tenant is reported in its result instead of stopping the rest.
+    """
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValidationError("workers must be a positive integer.")
+    if tenants is None:
+        tenants = router.list_tenants()
+    for tenant_id in tenants:
+        validate_tenant_id(tenant_id)
+
+    def run(tenant_id: str) -> dict:
+        t0 = time.perf_counter()
+        try:
+            with router.connection(tenant_id) as conn:
+                outcome = maintain_tenant(conn)
+            result = {"tenant": tenant_id, "ok": outcome["integrity"] == "ok", **outcome}
+        except Exception as e:
+            result = {"tenant": tenant_id, "ok": False, "error": str(e)}
+        result["seconds"] = time.perf_counter() - t0
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, tenants))
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
 from sqlite3 import Connection
 
-from travel_planner.domain.validators import ValidationError
-from travel_planner.persistence import trip_repository
+from travel_planner.domain.validators import ValidationError, validate_date_string
+from travel_planner.persistence import day_repository, recurring_repository, trip_repository
+from travel_planner.observability.profiler import profiled
+from travel_planner.persistence.db import retry_on_busy
 
 
+@profiled
+@retry_on_busy
 def create_trip(conn: Connection, name: str) -> int:
     if not isinstance(name, str):
         raise ValidationError("trip name must be a string.")
@@ -15,6 +20,8 @@ def create_trip(conn: Connection, name: str) -> int:
 
     return int(trip_repository.create_trip(conn, cleaned))
 
+@profiled
+@retry_on_busy
 def rename_trip(conn, trip_id: int, name: str) -> None:
     if trip_id <= 0:
         raise ValidationError("trip_id must be positive.")
@@ -27,4 +34,66 @@ def rename_trip(conn, trip_id: int, name: str) -> None:
     if trip is None:
         raise ValidationError("trip not found.")
 
-    trip_repository.rename_trip(conn, trip_id, name)
\ No newline at end of file
+    trip_repository.rename_trip(conn, trip_id, name)
+
+@profiled
+@retry_on_busy
+def delete_trip(conn: Connection, trip_id: int) -> None:
+    """
+    Delete a trip with its days and items.
+    """
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+
+    trip_repository.delete_trip(conn, trip_id)
+
+@profiled
+@retry_on_busy
+def clone_trip(
+    conn: Connection,
+    trip_id: int,
+    name: str,
+    *,
+    shift_days: int | None = None,
+    start_date: str | None = None,
+) -> dict[str, int]:
+    """
+    Copy a trip as a new trip, moving its dates by shift_days or so its first day lands on start_date.
+
+    Returns {"trip_id", "days", "items", "shift_days"}.
+    """
+    if not isinstance(trip_id, int) or trip_id <= 0:
+        raise ValidationError("trip_id must be a positive integer.")
+    if not isinstance(name, str) or not name.strip():
+        raise ValidationError("trip name must not be blank.")
+    if shift_days is not None and start_date is not None:
+        raise ValidationError("give shift_days or start_date, not both.")
+    if shift_days is not None and (isinstance(shift_days, bool) or not isinstance(shift_days, int)):
+        raise ValidationError("shift_days must be an integer.")
+
+    if trip_repository.get_trip(conn, trip_id) is None:
+        raise ValidationError("trip not found.")
+
+    days = day_repository.list_days_for_trip(conn, trip_id)
+    shift = shift_days or 0
+    if start_date is not None:
+        validate_date_string(start_date)
+        if not days:
+            raise ValidationError("trip has no days to align with start_date.")
+        shift = (date.fromisoformat(start_date) - date.fromisoformat(days[0]["date"])).days
+
+    # Checked up front: SQLite's date() turns an out-of-range date into NULL,
+    # which fails on days.date but would silently open a rule's date window.
+    dates = [d["date"] for d in days]
+    for rule in recurring_repository.list_rules_for_trip(conn, trip_id):
+        dates.extend(d for d in (rule["from_date"], rule["until_date"]) if d is not None)
+    if dates and shift:
+        try:
+            date.fromisoformat(min(dates)) + timedelta(days=shift)
+            date.fromisoformat(max(dates)) + timedelta(days=shift)
+        except OverflowError:
+            raise ValidationError("shift moves a date outside the supported date range.") from None
+
+    result = trip_repository.clone_trip(conn, trip_id, name.strip(), shift)
+    result["shift_days"] = shift
+    return result